@@ -0,0 +1,187 @@
+## benchmark of the LCOE calculator: scalar, object, lookup, batch and Monte Carlo paths
+## every case uses fixed seeds and only local data, so it runs offline
+## usage:
+##   python benchmark.py                     run the cases and compare them with benchmark_baseline.json
+##   python benchmark.py --save-baseline     run the cases and store the results as the new baseline
+##   python benchmark.py --quick             smaller sizes, for a fast check
+##   python benchmark.py --import-only       only the import time check
+## the exit status is 1 when a case is slower than the baseline by more than the threshold
+## or when the cold import of the package takes more than IMPORT_TIME_LIMIT
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(PACKAGE_DIRECTORY, "benchmark_baseline.json")
+IMPORT_TIME_LIMIT = 0.05 # [s] cold "import lcoe"
+
+## usefull function:
+
+# import the package lcoe of this directory with all its modules
+def load_program():
+    sys.path.insert(0, PACKAGE_DIRECTORY)
+    import lcoe
+    lcoe.warm_up(data = False)
+    return lcoe
+
+# @return best time [s] of @input repeats cold imports of the package, each one in a new interpreter
+def import_time(repeats = 5):
+    command = f"import sys, time; sys.path.insert(0, {PACKAGE_DIRECTORY!r}); start = time.perf_counter(); import lcoe; print(time.perf_counter() - start)"
+    return min(float(subprocess.run([sys.executable, "-c", command], check = True, capture_output = True, text = True).stdout) for _ in range(repeats))
+
+# run @input function (that returns the number of rows it processed) @input repeats times
+# @return dictionary with rows, best time [s], rows per second and peak memory [MiB] traced during the first run
+def measure(function, repeats):
+    tracemalloc.start()
+    rows = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return {"rows": rows, "seconds": best, "rows_per_second": rows / best, "peak_memory_MiB": peak / 2**20}
+
+# @return dictionary {name: array} of @input size random reactor configurations (same seed -> same configurations)
+def random_parameters(size, seed):
+    rng = np.random.default_rng(seed)
+    return {"capacity": np.full(size, 1000.0), "lifetime": rng.integers(30, 81, size).astype(np.float64), "utilization_hours": rng.uniform(6000, 8500, size),
+            "construction_time": rng.integers(3, 12, size).astype(np.float64), "discount_rate": rng.uniform(0, 0.12, size), "escalation_rate": rng.uniform(-0.02, 0.05, size),
+            "overnight_costs": rng.uniform(2000, 9000, size), "fuel_cycle_costs": rng.uniform(5, 15, size), "FOM_costs": rng.uniform(80, 150, size), "VOM_costs": rng.uniform(1, 4, size)}
+
+## benchmark cases:
+
+# @return dictionary {case name: function without arguments returning the number of rows} for @input program and @input scale
+def benchmark_cases(program, scale = 1.0):
+    size = lambda rows: max(1, int(rows * scale))
+    scalar_rows = [dict(zip(program.PARAMETER_NAMES, row)) for row in zip(*[values.tolist() for values in random_parameters(size(20000), seed = 1).values()])]
+    batch = random_parameters(size(1000000), seed = 2)
+    designs = program.design_registry().names()
+    store = program.region_LCOE_store()
+    regions = list(store.index) + [("Multi-Scenario", "Multi-Region", "Multi-Year"), ("Net Zero by 2050", "Multi-Region", "Multi-Year")]
+    reactor = program.Reactor()
+
+    def scalar_LCOE_calculator():
+        program.clear_financial_cache()
+        for row in scalar_rows:
+            program.LCOE_calculator(**row, quiet = True)
+        return len(scalar_rows)
+
+    def reactor_construction():
+        for _ in range(size(5000)):
+            program.Reactor()
+        return size(5000)
+
+    def reactor_deepcopy():
+        for _ in range(size(5000)):
+            copy.deepcopy(reactor)
+        return size(5000)
+
+    def design_lookup():
+        for _ in range(size(200)):
+            for name in designs:
+                repr(program.Reactor_Design(design_name = name))
+        return size(200) * len(designs)
+
+    def region_lookup():
+        for _ in range(size(50)):
+            for scenario, region, year in regions:
+                repr(program.Reactor_Region_LCOE(scenario_name = scenario, region_name = region, year_name = year))
+        return size(50) * len(regions)
+
+    def batch_calculator():
+        program.LCOE_batch_calculator(**batch)
+        return len(batch["capacity"])
+
+    def sweep():
+        result = program.LCOE_sweep(discount_rate = np.linspace(0.0, 0.12, 121), overnight_costs = np.linspace(2000, 9000, 141), lifetime = np.arange(30, 81))
+        return len(result["LCOE"])
+
+    def monte_carlo():
+        distributions = {"overnight_costs": ("triangular", 3500, 4000, 6000), "discount_rate": ("uniform", 0.05, 0.09), "capacity_factor": ("beta", 8, 2, 0.6, 0.95)}
+        program.monte_carlo_LCOE(distributions, samples = size(1000000), workers = 1, seed = 3)
+        return size(1000000)
+
+    def break_even():
+        program.break_even(batch, "discount_rate", 70.0)
+        return len(batch["capacity"])
+
+    def discounted_cash_flow():
+        rows = {name: values[:size(100000)] for name, values in batch.items()}
+        program.DCF_calculator(rows, fuel_cycle_costs = program.escalation_path(rows["fuel_cycle_costs"], 0.02, 80))
+        return len(rows["capacity"])
+
+    return {"scalar_LCOE_calculator": scalar_LCOE_calculator, "reactor_construction": reactor_construction, "reactor_deepcopy": reactor_deepcopy,
+            "design_lookup": design_lookup, "region_lookup": region_lookup, "batch_calculator": batch_calculator, "sweep": sweep,
+            "monte_carlo": monte_carlo, "break_even": break_even, "discounted_cash_flow": discounted_cash_flow}
+
+# @return dictionary {"import_seconds", "cases": {name: measure()}} and print one line for every case
+def run_benchmarks(cases = None, scale = 1.0, repeats = 5, import_only = False):
+    results = {"import_seconds": import_time(), "cases": {}}
+    print(f"import: {results['import_seconds']*1000:.1f} ms")
+    if(import_only):
+        return results
+    program = load_program()
+    for name, function in benchmark_cases(program, scale).items():
+        if(cases and name not in cases):
+            continue
+        results["cases"][name] = measure(function, repeats)
+        print(f"{name}: {results['cases'][name]['rows_per_second']:,.0f} rows/s, peak memory {results['cases'][name]['peak_memory_MiB']:.1f} MiB")
+    return results
+
+# @return list of strings, one for every case slower than the @input baseline by more than @input threshold (e.g. 0.25 -> 25%)
+def regressions(results, baseline, threshold):
+    found = []
+    if(results["import_seconds"] > baseline["import_seconds"] * (1 + threshold)):
+        found.append(f"import: {results['import_seconds']*1000:.1f} ms, baseline {baseline['import_seconds']*1000:.1f} ms")
+    for name, result in results["cases"].items():
+        if(name in baseline["cases"] and result["rows_per_second"] < baseline["cases"][name]["rows_per_second"] * (1 - threshold)):
+            found.append(f"{name}: {result['rows_per_second']:,.0f} rows/s, baseline {baseline['cases'][name]['rows_per_second']:,.0f} rows/s")
+    return found
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description = "Benchmark of the LCOE calculator")
+    parser.add_argument("cases", nargs = "*", help = "cases to run [default = all]")
+    parser.add_argument("--baseline", default = BASELINE_FILE, help = "baseline file [default = benchmark_baseline.json]")
+    parser.add_argument("--save-baseline", action = "store_true", help = "store the results as the new baseline")
+    parser.add_argument("--threshold", type = float, default = 0.3, help = "allowed slowdown before failing [default = 0.3 -> 30%%]")
+    parser.add_argument("--repeats", type = int, default = 5, help = "timed runs of every case, the best one is kept [default = 5]")
+    parser.add_argument("--quick", action = "store_true", help = "run the cases with a tenth of the rows (not comparable with the baseline)")
+    parser.add_argument("--import-only", action = "store_true", help = f"only check that the cold import takes less than {IMPORT_TIME_LIMIT*1000:.0f} ms")
+    parser.add_argument("-o", "--output", help = "write the results as json in this file")
+    arguments = parser.parse_args(argv)
+
+    scale = 0.1 if arguments.quick else 1.0
+    results = run_benchmarks(arguments.cases, scale = scale, repeats = arguments.repeats, import_only = arguments.import_only)
+    if(arguments.output):
+        with open(arguments.output, "w") as file:
+            json.dump(results, file, indent = 1)
+    if(arguments.save_baseline):
+        with open(arguments.baseline, "w") as file:
+            json.dump(results, file, indent = 1)
+        print(f"Baseline saved in {arguments.baseline}")
+        return 0
+    found = []
+    if(results["import_seconds"] > IMPORT_TIME_LIMIT):
+        found.append(f"import: {results['import_seconds']*1000:.1f} ms, limit {IMPORT_TIME_LIMIT*1000:.0f} ms")
+    if(not arguments.quick and not arguments.import_only and os.path.exists(arguments.baseline)):
+        with open(arguments.baseline) as file:
+            found += regressions(results, json.load(file), arguments.threshold)
+    if(found):
+        print(f"\nRegressions (threshold {arguments.threshold*100:g} %):")
+        [print(f"  {line}") for line in found]
+        return 1
+    print(f"\nNo regressions (threshold {arguments.threshold*100:g} %)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
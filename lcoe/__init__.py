@@ -0,0 +1,91 @@
+## this is a tool to calculate LCOE of a nuclear power reactor (large and commercial)
+## there are various options: default parameters, customized parameters, defualt design, default scenario/region/year
+
+## sources:
+##   [1] IEA projected costs of generation electricity 2020: https://www.iea.org/reports/projected-costs-of-generating-electricity-2020    
+##   [2] IAEA Economic Evaluation of Alternative Nuclear Energy Systems (2014): https://www.iaea.org/publications/15192/economic-evaluation-of-alternative-nuclear-energy-systems
+##   [3] IEA World Energy Outlook 2022: https://iea.blob.core.windows.net/assets/830fe099-5530-48f2-a7c1-11f35d510983/WorldEnergyOutlook2022.pdf#page=469
+##   [4] IEA Net Zero by 2050, A Roadmap for the Global Energy Sector (2021): https://iea.blob.core.windows.net/assets/deebef5d-0c34-4539-9d0c-10b13d840027/NetZeroby2050-ARoadmapfortheGlobalEnergySector_CORR.pdf#page=202
+##   [5] Capital cost estimation for advanced nuclear power plants (2022): https://www.sciencedirect.com/science/article/pii/S1364032121011473 
+## for learning curve:
+##   [6] OECD NEA Unlocking Reductions in the Construction Costs of Nuclear (2020): https://doi.org/10.1787/33ba86e1-en
+##   [7] Lucid Catalyst con Energy Technology Institute: Nuclear Cost Divers Project (2020): https://www.lucidcatalyst.com/eti-nuclear-cost-drivers-full
+
+## to be added: 
+##   1. controls on inputs
+##   2. MWh input
+##   3. possibility to come back
+##   4. Reactor() class formatting and possibility to edit for regional default parameters
+##   5. other technology
+
+
+## package layout:
+## the calculator is split in modules that are imported only when one of their names is used for the first time:
+##   core             Parameter, Reactor, LCOE_calculator(), the financial factors and the dependency graph of the formula (standard library only)
+##   table            columnar tables with group by and pivot
+##   batch            vectorized LCOE_batch_calculator() and sweeps
+##   designs, regions design catalog and IEA World Energy Outlook 2022 data (the data files are read at the first use)
+##   fleet            Reactor_Fleet, reactors stored as columns
+##   compact          narrower storage types for very large sweeps and fleets, with a check of the LCOE deviation
+##   sensitivity, inverse, learning, lto, cashflow, montecarlo   analyses on many reactors
+##   portfolio        design mix per region under capacity targets, capital budget and regional limits
+##   sobol            global sensitivity analysis: Sobol sequence, Saltelli sampling and Sobol indices
+##   aggregate        mergeable streaming summaries (quantile sketch, histograms, moments), percentile tables and text charts
+##   columns, cache   columnar binary files and persistent result cache
+##   instrumentation, cli, service, interactive   metrics, batch command, HTTP service and interactive calculator
+## "import lcoe" only imports this file, numpy is imported with the first module that needs it
+## example: import lcoe; lcoe.Reactor().LCOE_calculator()
+## run: python -m lcoe [batch|serve] or python "LCOE program.py" [batch|serve]
+
+import importlib
+
+# module of every public name of the package
+EXPORTS = {
+    "core": ("yes_no_input", "print_list", "format_table", "parse_number", "PARAMETER_NAMES", "LCOE_COMPONENTS", "LCOE_COMPONENT_NAMES", "LCOE_Result", "FINANCIAL_CACHE_SIZE", "recovery_factor", "investment_factor", "decommissioning_factor", "FINANCIAL_FACTORS", "financial_cache_info", "clear_financial_cache", "compute_LCOE", "LCOE_DEPENDENCIES", "LCOE_NODE_FUNCTIONS", "dependent_nodes", "same_value", "LCOE_calculator", "Parameter", "Reactor"),
+    "table": ("group_rows", "Table"),
+    "batch": ("geometric_mean_factor", "round_cents", "recovery_factor_batch", "investment_factor_batch", "decommissioning_factor_batch", "factorised_lookup", "LCOE_batch_calculator", "LCOE_NODE_FUNCTIONS_BATCH", "LCOE_sweep"),
+    "designs": ("DESIGN_DATA_FILE", "DESIGN_FIELDS", "Design_Registry", "design_registry", "compare_designs", "Reactor_Design"),
+    "regions": ("REGION_DATA_FILE", "REGION_FIELDS", "REGION_FIELD_NAMES", "Region_Record", "Region_LCOE_Store", "region_LCOE_store", "Reactor_Region_LCOE", "region_LCOE_cube"),
+    "fleet": ("Column_Schema", "parameter_schema", "Reactor_Fleet"),
+    "compact": ("COMPACT_DTYPES", "COMPACT_ERROR_LIMIT", "compact_array", "compact_columns", "Precision_Check", "precision_check", "compact_LCOE_sweep"),
+    "sensitivity": ("parameter_arrays", "geometric_mean_log_derivatives", "LCOE_gradient_batch", "Sensitivity_Result", "sensitivity_analysis"),
+    "inverse": ("LINEAR_PARAMETERS", "ITERATIVE_PARAMETERS", "INVERSE_BOUNDS", "Inverse_Result", "break_even", "break_even_closed_form", "break_even_iterative"),
+    "learning": ("learning_curve_costs", "check_schedule", "build_out_reactor", "Fleet_Build_Out", "fleet_build_out", "learning_sweep"),
+    "lto": ("LTO_PERIOD_FIELDS", "LTO_Result", "LTO_LCOE"),
+    "cashflow": ("DCF_MEMORY_BUDGET", "DCF_TIME_VARYING", "DCF_TEMPORARY_ARRAYS", "escalation_path", "ramp_up", "DCF_calculator"),
+    "montecarlo": ("MONTE_CARLO_DISTRIBUTIONS", "sample_distribution", "check_distributions", "monte_carlo_chunk", "monte_carlo_summary_chunk", "sampled_parameters", "store_chunks", "Monte_Carlo_Result", "monte_carlo_LCOE"),
+    "portfolio": ("portfolio_cost_table", "evaluate_portfolios", "region_dynamic_programming", "Portfolio_Result", "optimize_portfolio"),
+    "sobol": ("SOBOL_DIRECTIONS", "SOBOL_MAX_DIMENSIONS", "SOBOL_BITS", "sobol_direction_numbers", "sobol_points", "normal_quantile_table", "beta_quantile_table", "distribution_quantiles", "default_distributions", "saltelli_chunk", "sobol_indices", "Sobol_Result", "sobol_analysis"),
+    "aggregate": ("Quantile_Sketch", "Histogram", "Running_Moments", "Stream_Summary", "ascii_histogram", "Result_Aggregator", "aggregate_chunks", "LCOE_sweep_summary"),
+    "columns": ("COLUMN_HEADER_FILE", "COLUMN_FORMAT_VERSION", "column_schema", "Column_Writer", "Column_Reader", "streaming_percentiles", "write_columns"),
+    "cache": ("RESULT_CACHE_FILE", "RESULT_CACHE_MAX_ENTRIES", "MODEL_FUNCTIONS", "RESULT_CACHE_FORMAT", "model_version", "canonical_parameters", "parameter_keys", "Result_Cache", "cached_LCOE"),
+    "instrumentation": ("INSTRUMENTED_STAGES", "METRICS_BINS_PER_DECADE", "METRICS_MIN_LATENCY", "METRICS_BINS", "Timed_Copy", "Metrics", "timed", "package_modules", "replace_attribute", "enable_instrumentation", "disable_instrumentation", "metrics_snapshot"),
+    "cli": ("BATCH_OUTPUT_COLUMNS", "Invalid_Record", "read_records", "chunked", "fill_column", "PARAMETER_CHECKS", "check_parameters", "evaluate_records", "output_columns", "write_records", "batch_main"),
+    "service": ("SERVICE_HOST", "SERVICE_PORT", "SERVICE_MAX_BODY", "HTTP_REASONS", "NUMERIC_COLUMNS", "record_problem", "evaluate_each", "LCOE_Service", "LCOE_Client", "serve_main"),
+    "interactive": ("main",),
+}
+MODULE_OF = {name: module for module, names in EXPORTS.items() for name in names}
+__all__ = sorted(MODULE_OF)
+
+# lazy import of the public names: the module is imported at the first use of one of its names
+def __getattr__(name):
+    if(name not in MODULE_OF):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{MODULE_OF[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(MODULE_OF))
+
+# import every module and load the design and region data in this process
+# call it before starting worker processes with fork: the workers inherit the modules and the data already loaded
+# (copy on write) instead of importing and parsing them again
+# @return list of the imported modules
+def warm_up(data = True):
+    modules = [importlib.import_module(f".{module}", __name__) for module in EXPORTS]
+    if(data):
+        __getattr__("design_registry")()
+        __getattr__("region_LCOE_store")()
+        __getattr__("parameter_schema")()
+    return modules
@@ -0,0 +1,17 @@
+import sys
+
+# without arguments the interactive calculator starts, "batch" starts the headless calculator and "serve" the HTTP service
+# @input argv: command line arguments without the program name
+def run(argv):
+    if(len(argv) > 0 and argv[0] == "batch"):
+        from .cli import batch_main
+        return batch_main(argv[1:])
+    if(len(argv) > 0 and argv[0] == "serve"):
+        from .service import serve_main
+        return serve_main(argv[1:])
+    from .interactive import main
+    main()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
@@ -0,0 +1,347 @@
+import math
+import numpy as np
+from .core import LCOE_COMPONENTS
+from .table import Table, group_rows
+from .batch import LCOE_sweep
+
+## streaming aggregation:
+
+# summaries of result streams too large to be kept in memory (Monte Carlo runs, large sweeps):
+# the chunks are consumed one after the other with update() and the memory does not depend on the number of values,
+# summaries built by different processes are combined with merge() (the result does not depend on how the stream was split,
+# apart from the small random error of the quantile sketch)
+
+# mergeable quantile sketch (KLL): a stack of compactors, the values of level h have weight 2**h
+# when a level has more values than its capacity they are sorted and one every two (random offset) goes to the next level
+# the capacities decrease by 2/3 from the top level, so the memory is about 3 * @var size values whatever the stream length
+# the rank error is about 1.7 / @var size of the number of values (0.2 % with the default size), until the first
+# compaction (less than @var size values) the percentiles are exact
+class Quantile_Sketch:
+    def __init__(self, size = 1000, seed = None):
+        self.size = size
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    # maximum number of values of the compactor @input level
+    def capacity(self, level):
+        return max(2, int(math.ceil(self.size * (2 / 3) ** (len(self.levels) - level - 1))))
+
+    # add the values of the array @input values
+    def update(self, values):
+        values = np.asarray(values, dtype = np.float64).ravel()
+        if(len(values) == 0):
+            return self
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self.compress()
+        return self
+
+    def compress(self):
+        level = 0
+        while(level < len(self.levels)):
+            if(len(self.levels[level]) > self.capacity(level)):
+                if(level + 1 == len(self.levels)):
+                    self.levels.append(np.empty(0))
+                values = np.sort(self.levels[level])
+                kept = values[len(values) - len(values) % 2:] # with an odd number of values the largest one stays in the level
+                promoted = values[int(self.rng.integers(2)):len(values) - len(values) % 2:2]
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+                self.levels[level] = kept
+            level += 1
+
+    # add the values of the sketch @input other, built with the same size
+    def merge(self, other):
+        if(other.size != self.size):
+            raise ValueError(f"Sketches of different size ({self.size} and {other.size}) can not be merged")
+        while(len(self.levels) < len(other.levels)):
+            self.levels.append(np.empty(0))
+        for level, values in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], values))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    # @return (values, weights) sorted by value, the weights sum to the number of values of the stream
+    def weighted_values(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_values), 2.0**level) for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values, kind = "stable")
+        return values[order], weights[order]
+
+    # @return array with the percentiles @input q (exact, numpy "linear" method, as long as nothing has been compacted)
+    def percentiles(self, q = (10, 50, 90)):
+        if(self.count == 0):
+            raise ValueError("Percentiles of an empty sketch")
+        q = np.asarray(q, dtype = np.float64)
+        if(len(self.levels) == 1):
+            return np.percentile(self.levels[0], q)
+        values, weights = self.weighted_values()
+        cumulative = np.cumsum(weights)
+        index = np.minimum(np.searchsorted(cumulative, q / 100 * self.count, side = "left"), len(values) - 1)
+        return np.where(q <= 0, self.min, np.where(q >= 100, self.max, values[index]))
+
+    # estimated histogram of the stream with @input bins between @input low and @input high [default = min and max]
+    # @return (counts, edges)
+    def histogram(self, bins = 20, low = None, high = None):
+        values, weights = self.weighted_values()
+        counts, edges = np.histogram(values, bins = bins, weights = weights, range = (self.min if low is None else low, self.max if high is None else high))
+        return np.rint(counts).astype(np.int64), edges
+
+# histogram with fixed bins between @var low and @var high, the values outside are counted in @var underflow and @var overflow
+# counts are exact, histograms are merged only if they have the same bins
+class Histogram:
+    def __init__(self, low, high, bins = 50):
+        if(not high > low):
+            raise ValueError(f"The histogram range has to be low < high, it is [{low}, {high}]")
+        self.low = float(low)
+        self.high = float(high)
+        self.counts = np.zeros(bins, dtype = np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def __len__(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    @property
+    def edges(self):
+        return np.linspace(self.low, self.high, len(self.counts) + 1)
+
+    def update(self, values):
+        values = np.asarray(values, dtype = np.float64).ravel()
+        inside = (values >= self.low) & (values <= self.high)
+        self.underflow += int(np.count_nonzero(values < self.low))
+        self.overflow += int(np.count_nonzero(values > self.high))
+        index = np.minimum(((values[inside] - self.low) / (self.high - self.low) * len(self.counts)).astype(np.int64), len(self.counts) - 1)
+        self.counts += np.bincount(index, minlength = len(self.counts))
+        return self
+
+    def merge(self, other):
+        if((self.low, self.high, len(self.counts)) != (other.low, other.high, len(other.counts))):
+            raise ValueError(f"Histograms with different bins can not be merged: [{self.low}, {self.high}] x {len(self.counts)} and [{other.low}, {other.high}] x {len(other.counts)}")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    # @return (counts, edges)
+    def histogram(self):
+        return self.counts.copy(), self.edges
+
+# count, mean, variance, minimum and maximum of a stream
+# chunks are combined with the pairwise formulas of Chan et al., stable also for long streams with a large mean
+class Running_Moments:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.sum_squares = 0.0 # sum of the squared deviations from the mean
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self):
+        return self.count
+
+    # combine (count, mean, sum of squares, min, max) of another part of the stream
+    def combine(self, count, mean, sum_squares, minimum, maximum):
+        if(count == 0):
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.sum_squares += sum_squares + delta**2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, minimum)
+        self.max = max(self.max, maximum)
+        return self
+
+    def update(self, values):
+        values = np.asarray(values, dtype = np.float64).ravel()
+        if(len(values) == 0):
+            return self
+        mean = float(values.mean())
+        return self.combine(len(values), mean, float(np.sum((values - mean)**2)), float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        return self.combine(other.count, other.mean, other.sum_squares, other.min, other.max)
+
+    # sample variance (n - 1)
+    @property
+    def variance(self):
+        return self.sum_squares / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+# moments, quantile sketch and, if a range is given, fixed bins histogram of one component
+class Stream_Summary:
+    def __init__(self, sketch_size = 1000, histogram_range = None, bins = 50, seed = None):
+        self.moments = Running_Moments()
+        self.sketch = Quantile_Sketch(sketch_size, seed)
+        self.fixed_histogram = Histogram(*histogram_range, bins = bins) if histogram_range is not None else None
+
+    def __len__(self):
+        return self.moments.count
+
+    def update(self, values):
+        self.moments.update(values)
+        self.sketch.update(values)
+        if(self.fixed_histogram is not None):
+            self.fixed_histogram.update(values)
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        if(self.fixed_histogram is not None and other.fixed_histogram is not None):
+            self.fixed_histogram.merge(other.fixed_histogram)
+        return self
+
+    def percentiles(self, q = (10, 50, 90)):
+        return self.sketch.percentiles(q)
+
+    # @return (counts, edges), from the fixed bins if there are, else estimated from the sketch with @input bins
+    def histogram(self, bins = 20):
+        if(self.fixed_histogram is not None):
+            return self.fixed_histogram.histogram()
+        return self.sketch.histogram(bins)
+
+# chart of a histogram as text, one line per bin: "low - high | ##### count"
+# @input width: number of characters of the longest bar
+def ascii_histogram(counts, edges, width = 50, unit = "$/MWh"):
+    counts = np.asarray(counts)
+    largest = max(int(counts.max()), 1) if len(counts) else 1
+    labels = [f"{low:.2f} - {high:.2f}" for low, high in zip(edges[:-1], edges[1:])]
+    label_width = max([len(label) for label in labels] + [len(f"[{unit}]")])
+    count_width = max(len(f"{int(count):,}") for count in counts) if len(counts) else 1
+    lines = [f"{'[' + unit + ']':>{label_width}} |"]
+    for label, count in zip(labels, counts.tolist()):
+        bar = "#" * int(round(count / largest * width))
+        lines.append(f"{label:>{label_width}} | {bar.ljust(width)} {int(count):>{count_width},}")
+    return "\n".join(lines) + "\n"
+
+# streaming summary of the cost components of many LCOE results, optionally grouped (e.g. by design or region)
+# @input components: keys of the chunks to summarize [default = LCOE_COMPONENTS]
+# @input by: column name (or list) of the chunks used to group the rows [default = None, the group is given to update()]
+# @input histogram_ranges: {component: (low, high)} for exact histograms with @input bins fixed bins [default = from the sketch]
+# @input seed: seed (or numpy SeedSequence) of the random offsets of the quantile sketches
+# @var groups dictionary {group: {component: Stream_Summary}}
+class Result_Aggregator:
+    def __init__(self, components = LCOE_COMPONENTS, by = None, sketch_size = 1000, histogram_ranges = None, bins = 50, seed = None):
+        self.components = tuple(components)
+        self.by = None if by is None else ([by] if isinstance(by, str) else list(by))
+        self.sketch_size = sketch_size
+        self.histogram_ranges = histogram_ranges or {}
+        self.bins = bins
+        self.seed = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        self.groups = {}
+
+    def __len__(self):
+        return sum(len(summaries[self.components[0]]) for summaries in self.groups.values())
+
+    # @return the summaries of @input group, created at the first use
+    def summaries(self, group = None):
+        if(group not in self.groups):
+            self.groups[group] = {component: Stream_Summary(self.sketch_size, self.histogram_ranges.get(component), self.bins, self.seed.spawn(1)[0]) for component in self.components}
+        return self.groups[group]
+
+    # add the rows of @input chunk, a dictionary {name: array} like the result of LCOE_batch_calculator()
+    # the rows are grouped by the columns @var by, or all of them go to @input group
+    def update(self, chunk, group = None):
+        if(self.by is None):
+            for component, summary in self.summaries(group).items():
+                summary.update(chunk[component])
+            return self
+        keys = [np.asarray(chunk[name]) for name in self.by]
+        first, index = group_rows(keys)
+        order = np.argsort(index, kind = "stable")
+        starts = np.append(np.searchsorted(index[order], np.arange(len(first))), len(order))
+        names = list(zip(*[key[first].tolist() for key in keys]))
+        for number, name in enumerate(names):
+            rows = order[starts[number]:starts[number + 1]]
+            for component, summary in self.summaries(name[0] if len(name) == 1 else name).items():
+                summary.update(np.asarray(chunk[component])[rows])
+        return self
+
+    # add the summaries of @input other (e.g. built by a worker process), its summaries are reused and should not be updated any more
+    def merge(self, other):
+        if(other.components != self.components):
+            raise ValueError(f"Aggregators of different components can not be merged: {self.components} and {other.components}")
+        for group, summaries in other.groups.items():
+            if(group not in self.groups):
+                self.groups[group] = summaries
+            else:
+                for component, summary in summaries.items():
+                    self.groups[group][component].merge(summary)
+        return self
+
+    # @return dictionary {component: array of percentiles} of @input group
+    def percentiles(self, q = (10, 50, 90), group = None):
+        return {component: summary.percentiles(q) for component, summary in self.groups[group].items()}
+
+    # @return Table with one row for every group and component: count, mean, standard deviation, min, percentiles @input q and max
+    def percentile_table(self, q = (5, 50, 95), components = None):
+        components = components or self.components
+        group_names = self.by or ["group"]
+        columns = {name: [] for name in group_names if self.groups.keys() != {None}}
+        columns.update({"component": [], "count": [], "mean": [], "std": [], "min": []})
+        columns.update({f"P{p:g}": [] for p in q})
+        columns["max"] = []
+        for group, summaries in self.groups.items():
+            for component in components:
+                summary = summaries[component]
+                for name, value in zip(group_names, group if len(group_names) > 1 else [group]):
+                    if(name in columns):
+                        columns[name].append(value)
+                moments = summary.moments
+                columns["component"].append(component)
+                columns["count"].append(moments.count)
+                columns["mean"].append(round(moments.mean, 2))
+                columns["std"].append(round(moments.std, 2))
+                columns["min"].append(round(moments.min, 2))
+                for p, value in zip(q, summary.percentiles(q).tolist()):
+                    columns[f"P{p:g}"].append(round(value, 2))
+                columns["max"].append(round(moments.max, 2))
+        return Table(columns)
+
+    # @return (counts, edges) of @input component of @input group
+    def histogram(self, component = "LCOE", group = None, bins = 20):
+        return self.groups[group][component].histogram(bins)
+
+    # @return string with the chart of the histogram of @input component of @input group, see ascii_histogram()
+    def ascii_histogram(self, component = "LCOE", group = None, bins = 20, width = 50):
+        return ascii_histogram(*self.histogram(component, group, bins), width = width)
+
+    def __repr__(self):
+        return repr(self.percentile_table())
+
+# @return Result_Aggregator of the chunks (dictionaries {name: array}) of the iterable @input chunks
+# the @input options are the arguments of Result_Aggregator()
+def aggregate_chunks(chunks, **options):
+    aggregator = Result_Aggregator(**options)
+    for chunk in chunks:
+        aggregator.update(chunk)
+    return aggregator
+
+# summary of LCOE_sweep() without keeping the full grid in memory: the first parameter of @input grid is
+# swept in slices of @input slice_size values, every slice is computed and summarized before the next one
+# @input by: parameters of the grid used to group the results [default = None, one group]
+# @return Result_Aggregator
+def LCOE_sweep_summary(reactor = None, by = None, slice_size = 16, sketch_size = 1000, seed = None, **grid):
+    if(not grid):
+        raise ValueError("Give at least one parameter to sweep")
+    aggregator = Result_Aggregator(by = by, sketch_size = sketch_size, seed = seed)
+    first, *_ = grid
+    values = np.asarray(grid[first], dtype = np.float64).ravel()
+    for start in range(0, len(values), slice_size):
+        aggregator.update(LCOE_sweep(reactor, **{**grid, first: values[start:start + slice_size]}))
+    return aggregator
@@ -0,0 +1,164 @@
+import numpy as np
+from .core import FINANCIAL_CACHE_SIZE, LCOE_COMPONENTS, PARAMETER_NAMES, Reactor, decommissioning_factor, investment_factor, recovery_factor
+
+## batch engine:
+
+# closed form of the mean of the geometric series (1+rate)^t for t = 1...periods
+# it is 1 for rate = 0 (limit of the formula)
+def geometric_mean_factor(rate, periods):
+    rate = np.asarray(rate, dtype = np.float64)
+    periods = np.asarray(periods, dtype = np.float64)
+    zero_rate = (rate == 0)
+    safe_rate = np.where(zero_rate, 1.0, rate)
+    factor = (1 + rate) * np.expm1(periods * np.log1p(rate)) / (safe_rate * periods)
+    return np.where(zero_rate, 1.0, factor)
+
+# capital recovery factor r(1+r)^L / ((1+r)^L - 1), it is 1/L for r = 0
+def recovery_factor_batch(discount_rate, lifetime):
+    discount_rate = np.asarray(discount_rate, dtype = np.float64)
+    lifetime = np.asarray(lifetime, dtype = np.float64)
+    zero_rate = (discount_rate == 0)
+    growth = np.exp(lifetime * np.log1p(discount_rate))
+    factor = discount_rate * growth / np.where(zero_rate, 1.0, growth - 1)
+    return np.where(zero_rate, 1 / lifetime, factor)
+
+# investment cost at the start of operation for 1 $/kW of overnight costs
+# escalated_cost and investment_cost of LCOE_calculator() with the sums written as geometric series:
+#   escalated_cost  = overnight_costs * (1+e)^-0.5 * mean((1+e)^t)
+#   investment_cost = escalated_cost * mean((1+r)^t)
+def investment_factor_batch(discount_rate, escalation_rate, construction_time):
+    escalation_rate = np.asarray(escalation_rate, dtype = np.float64)
+    return np.power(1 + escalation_rate, -0.5) * geometric_mean_factor(escalation_rate, construction_time) * geometric_mean_factor(discount_rate, construction_time)
+
+# yearly deposit of the decommissioning sinking fund for 1 $/kW of overnight costs
+# decommissioning costs are 15% of the overnight costs and the fund interest is 0.01
+def decommissioning_factor_batch(lifetime):
+    return 0.15 * 0.01 / np.expm1(np.asarray(lifetime, dtype = np.float64) * np.log(1.01))
+
+# vectorized round(value, 2) of python: the exact value of the float is rounded to the cent (half to even)
+# np.round(values, 2) rounds values * 100, that is already rounded, so e.g. 3.325 (a bit more than 3.325 as a float)
+# gives 3.32 instead of the 3.33 of compute_LCOE()
+# k + 0.5 is a float, so values * 100 is at a tie only if its exact value is within half an ulp of the tie: only these
+# rows can be rounded differently and for them the error of values * 100 is computed exactly (Dekker's product)
+def round_cents(values):
+    values = np.asarray(values, dtype = np.float64)
+    flat = values.reshape(-1)
+    scaled = flat * 100
+    rounded = np.rint(scaled)
+    with np.errstate(invalid = "ignore"): # inf and nan stay as they are
+        scaled -= rounded
+        ties = np.flatnonzero(np.abs(scaled, out = scaled) == 0.5)
+    if(ties.size):
+        tied = flat[ties]
+        split = tied * 134217729.0 # 2^27 + 1
+        high = split - (split - tied)
+        product = tied * 100
+        error = (high * 100 - product) + (tied - high) * 100 # tied * 100 = product + error exactly
+        rounded[ties] = np.where(error > 0, np.ceil(product), np.where(error < 0, np.floor(product), rounded[ties]))
+    rounded /= 100
+    return rounded.reshape(values.shape)[()]
+
+# evaluate a cached financial factor only once for every distinct combination of its @input keys (arrays)
+# axes along which all the keys are broadcast (like in a grid) are not expanded
+# if there are more combinations than the cache size the closed form @input batch_function is used on them
+def factorised_lookup(cached_function, batch_function, *keys):
+    keys = np.broadcast_arrays(*keys)
+    shape = keys[0].shape
+    repeated_axes = tuple(axis for axis in range(len(shape)) if all(key.strides[axis] == 0 for key in keys))
+    keys = [key[tuple(slice(0, 1) if axis in repeated_axes else slice(None) for axis in range(len(shape)))].ravel() for key in keys]
+    codes = np.zeros(len(keys[0]), dtype = np.int64)
+    for key in keys:
+        values, inverse = np.unique(key, return_inverse = True)
+        codes = codes * len(values) + inverse.reshape(-1)
+    codes, first, inverse = np.unique(codes, return_index = True, return_inverse = True)
+    unique = np.stack([key[first] for key in keys], axis = -1)
+    if(len(unique) <= FINANCIAL_CACHE_SIZE):
+        values = np.array([cached_function(*key) for key in unique.tolist()], dtype = np.float64)
+    else:
+        values = batch_function(*unique.T)
+    compact_shape = tuple(1 if axis in repeated_axes else length for axis, length in enumerate(shape))
+    return np.broadcast_to(values[inverse.reshape(-1)].reshape(compact_shape), shape)
+
+# vectorized version of LCOE_calculator() for sweeps over many reactor configurations
+# @input the ten parameters of LCOE_calculator() as arrays (or scalars) that are broadcast together
+#        or a structured array with fields named as PARAMETER_NAMES as first argument
+# @input rounded: round every component to the cent like LCOE_calculator() [default = True]
+# @input factorise: compute the financial factors once per distinct combination with the cached scalar factors,
+#                   faster for grids where many rows share the same rates and times [default = False]
+# @output dictionary {component: array} with the keys of LCOE_COMPONENTS
+# lifetime and construction time are rounded to integer years as in Reactor.LCOE_calculator()
+def LCOE_batch_calculator(capacity, lifetime = None, utilization_hours = None, construction_time = None, discount_rate = None, escalation_rate = None, overnight_costs = None, fuel_cycle_costs = None, FOM_costs = None, VOM_costs = None, rounded = True, factorise = False):
+    if(lifetime is None and getattr(getattr(capacity, "dtype", None), "names", None) is not None):
+        capacity, lifetime, utilization_hours, construction_time, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs = [capacity[name] for name in PARAMETER_NAMES]
+    lifetime = np.rint(np.asarray(lifetime, dtype = np.float64))
+    construction_time = np.rint(np.asarray(construction_time, dtype = np.float64))
+    capacity, utilization_hours, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs = [np.asarray(value) for value in
+        (capacity, utilization_hours, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs)]
+    # every component is computed on the broadcast shape of its own parameters (e.g. in a grid FOM only varies with
+    # FOM_costs and utilization_hours) and it is expanded to the shape of all the parameters at the end
+    shape = np.broadcast_shapes(*[value.shape for value in (capacity, lifetime, utilization_hours, construction_time, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs)])
+
+    # useful costants
+    kW_MW = 1000 # convertion kW <-> MW
+
+    if(factorise):
+        investment = factorised_lookup(investment_factor, investment_factor_batch, discount_rate, escalation_rate, construction_time)
+        recovery = factorised_lookup(recovery_factor, recovery_factor_batch, discount_rate, lifetime)
+        decommissioning = factorised_lookup(decommissioning_factor, decommissioning_factor_batch, lifetime)
+    else:
+        investment = investment_factor_batch(discount_rate, escalation_rate, construction_time)
+        recovery = recovery_factor_batch(discount_rate, lifetime)
+        decommissioning = decommissioning_factor_batch(lifetime)
+
+    components = {}
+    # same order of the operations of compute_LCOE(): X * 1000 / h is not always equal to X * (1000 / h)
+    # in the last bit, and that is enough to round a component to a different cent
+    components["CAPITAL"] = overnight_costs * investment * kW_MW * recovery / utilization_hours
+    components["FOM"] = FOM_costs * kW_MW / utilization_hours
+    components["VOM"] = VOM_costs * kW_MW / utilization_hours
+    components["FUEL"] = fuel_cycle_costs * kW_MW / utilization_hours
+    components["DECOMMISSIONING"] = overnight_costs * decommissioning * kW_MW / utilization_hours
+    if(rounded):
+        for component in LCOE_COMPONENTS[:-1]:
+            components[component] = round_cents(components[component])
+    components["LCOE"] = components["CAPITAL"] + components["FOM"] + components["VOM"] + components["FUEL"] + components["DECOMMISSIONING"]
+    if(rounded):
+        components["LCOE"] = round_cents(components["LCOE"])
+    return {component: value if np.shape(value) == shape else np.broadcast_to(value, shape).copy() for component, value in components.items()}
+
+# vectorized functions of the nodes of LCOE_DEPENDENCIES with the same operations of LCOE_batch_calculator() with rounded = True
+# used by Reactor_Fleet.edit() to recompute only the nodes that depend on the edited parameters
+LCOE_NODE_FUNCTIONS_BATCH = {
+    "investment_factor": lambda discount_rate, escalation_rate, construction_time: investment_factor_batch(discount_rate, escalation_rate, np.rint(np.asarray(construction_time, dtype = np.float64))),
+    "recovery_factor": lambda discount_rate, lifetime: recovery_factor_batch(discount_rate, np.rint(np.asarray(lifetime, dtype = np.float64))),
+    "decommissioning_factor": lambda lifetime: decommissioning_factor_batch(np.rint(np.asarray(lifetime, dtype = np.float64))),
+    "CAPITAL": lambda overnight_costs, investment, recovery, utilization_hours: round_cents(overnight_costs * investment * 1000 * recovery / utilization_hours),
+    "FOM": lambda FOM_costs, utilization_hours: round_cents(FOM_costs * 1000 / utilization_hours),
+    "VOM": lambda VOM_costs, utilization_hours: round_cents(VOM_costs * 1000 / utilization_hours),
+    "FUEL": lambda fuel_cycle_costs, utilization_hours: round_cents(fuel_cycle_costs * 1000 / utilization_hours),
+    "DECOMMISSIONING": lambda overnight_costs, decommissioning, utilization_hours: round_cents(overnight_costs * decommissioning * 1000 / utilization_hours),
+    "LCOE": lambda CAPITAL, FOM, VOM, FUEL, DECOMMISSIONING: round_cents(CAPITAL + FOM + VOM + FUEL + DECOMMISSIONING),
+}
+
+
+# multiple option calculator: LCOE of every combination of the values given for some parameters
+# the other parameters are the ones of @input reactor [default = Reactor()]
+# @input grid: {name: list of values} for parameters in PARAMETER_NAMES, e.g. discount_rate = [0.03, 0.07, 0.1]
+# @input compact: store the grid and the results with narrower types, see compact_LCOE_sweep() [default = False]
+# @return dictionary {name: array} with the parameters of the grid and the keys of LCOE_COMPONENTS
+def LCOE_sweep(reactor = None, compact = False, **grid):
+    if(compact):
+        from .compact import compact_LCOE_sweep
+        return compact_LCOE_sweep(reactor, **grid)
+    for name in grid:
+        if(name not in PARAMETER_NAMES):
+            raise ValueError(f"Unknown parameter {name!r}, it has to be one of {PARAMETER_NAMES}")
+    values = (reactor if reactor is not None else Reactor()).parameter_values()
+    # open grid: every parameter varies along its own axis, the full grid is only built by broadcasting
+    for axis, name in enumerate(grid):
+        values[name] = np.asarray(grid[name], dtype = np.float64).reshape([-1 if i == axis else 1 for i in range(len(grid))])
+    components = LCOE_batch_calculator(**values, factorise = True)
+    shape = components["LCOE"].shape
+    result = {name: np.broadcast_to(values[name], shape).ravel() for name in grid}
+    result.update({component: np.broadcast_to(value, shape).ravel() for component, value in components.items()})
+    return result
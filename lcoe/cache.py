@@ -0,0 +1,170 @@
+import os
+import time
+import hashlib
+import inspect
+import importlib
+import sqlite3
+from functools import lru_cache
+import numpy as np
+from .core import LCOE_COMPONENTS, PARAMETER_NAMES
+from .batch import LCOE_batch_calculator
+from .sensitivity import parameter_arrays
+
+## result cache:
+
+# persistent cache of the LCOE breakdown in a SQLite file, shared between sessions
+# the key of a configuration is a 64 bit hash of its ten parameters (PARAMETER_NAMES) written as float64 in a canonical way:
+# lifetime and construction time rounded to integer years like LCOE_calculator() uses them and -0.0 written as 0.0
+# every entry also stores the canonical parameters: a lookup whose parameters differ from the stored ones (a collision
+# of the hash) is a miss, so a wrong LCOE is never returned
+# the file stores the model version, a hash of the source of the LCOE formulas: when the formulas change the cache is
+# emptied when it is opened, so the old results are never returned
+# when there are more than max_entries entries the least recently used ones are deleted
+RESULT_CACHE_FILE = os.environ.get("LCOE_RESULT_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "LCOE-calculator", "results.sqlite"))
+RESULT_CACHE_MAX_ENTRIES = 1000000
+RESULT_CACHE_FORMAT = "2" # layout of the results table, a file with another layout is emptied when it is opened
+MODEL_FUNCTIONS = (("core", "compute_LCOE"), ("core", "recovery_factor"), ("core", "investment_factor"), ("core", "decommissioning_factor"),
+                   ("batch", "LCOE_batch_calculator"), ("batch", "geometric_mean_factor"), ("batch", "recovery_factor_batch"),
+                   ("batch", "investment_factor_batch"), ("batch", "decommissioning_factor_batch"), ("batch", "round_cents"))
+
+# @return string with the hash of the source of the LCOE formulas (MODEL_FUNCTIONS)
+@lru_cache(maxsize = None)
+def model_version():
+    digest = hashlib.blake2b(digest_size = 8)
+    for module, name in MODEL_FUNCTIONS:
+        function = inspect.unwrap(getattr(importlib.import_module(f".{module}", __package__), name))
+        try:
+            digest.update(inspect.getsource(function).encode())
+        except (OSError, TypeError): # source not available, the bytecode changes with the formula too
+            digest.update(function.__code__.co_code + repr(function.__code__.co_consts).encode())
+    return digest.hexdigest()
+
+# @return (configurations x 10) float64 array with the canonical parameters of the dictionary {name: array} @input parameters
+def canonical_parameters(parameters):
+    matrix = np.stack(np.broadcast_arrays(*[np.asarray(parameters[name], dtype = np.float64).ravel() for name in PARAMETER_NAMES]), axis = 1)
+    matrix[:, 1] = np.rint(matrix[:, 1]) # lifetime
+    matrix[:, 3] = np.rint(matrix[:, 3]) # construction time
+    return np.ascontiguousarray(matrix + 0.0) # -0.0 -> 0.0
+
+# @return int64 array with the key of every row of canonical_parameters(): the bits of the ten float64 are mixed
+# column by column with multiply and xor-shift steps (the finalizer of splitmix64), all the rows at once
+def parameter_keys(matrix):
+    words = matrix.view(np.uint64)
+    keys = np.full(len(matrix), 0x9E3779B97F4A7C15, dtype = np.uint64)
+    for column in range(words.shape[1]):
+        keys = (keys ^ words[:, column]) * np.uint64(0xBF58476D1CE4E5B9)
+        keys ^= keys >> np.uint64(31)
+        keys = keys * np.uint64(0x94D049BB133111EB)
+        keys ^= keys >> np.uint64(29)
+    return keys.view(np.int64)
+
+class Result_Cache:
+    def __init__(self, path = RESULT_CACHE_FILE, max_entries = RESULT_CACHE_MAX_ENTRIES):
+        if(path != ":memory:"):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+        self.path = path
+        self.max_entries = max_entries
+        self.version = model_version()
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, check_same_thread = False) # used by one thread at a time, e.g. the LCOE_Service worker
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT)")
+            stored = dict(self.connection.execute("SELECT name, value FROM metadata WHERE name IN ('model_version', 'format')").fetchall())
+            if(stored.get("format") != RESULT_CACHE_FORMAT):
+                self.connection.execute("DROP TABLE IF EXISTS results")
+            self.connection.execute(f"CREATE TABLE IF NOT EXISTS results (key INTEGER PRIMARY KEY, parameters BLOB, {', '.join(f'{component} REAL' for component in LCOE_COMPONENTS)}, last_used REAL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+            if(stored.get("model_version") != self.version):
+                self.connection.execute("DELETE FROM results")
+            self.connection.executemany("INSERT OR REPLACE INTO metadata VALUES (?, ?)", (("model_version", self.version), ("format", RESULT_CACHE_FORMAT)))
+            self.connection.execute("CREATE TEMP TABLE lookup (key INTEGER PRIMARY KEY)")
+        # number of entries, counted once here and then updated by store() and clear()
+        self.entries = self.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    def __len__(self):
+        return self.entries
+    
+    # write @input keys in the temporary table lookup, used to select many keys with one query
+    def fill_lookup(self, keys):
+        self.connection.execute("DELETE FROM lookup")
+        self.connection.executemany("INSERT INTO lookup VALUES (?)", zip(keys.tolist()))
+    
+    # bulk lookup of @input keys (distinct parameter_keys()) of the rows of @input matrix (canonical_parameters())
+    # an entry is found only if its stored parameters are the same of the row
+    # @return (boolean array of the keys found, (keys x components) array with the LCOE breakdown, NaN if not found)
+    def lookup(self, keys, matrix):
+        found = np.zeros(len(keys), dtype = bool)
+        values = np.full((len(keys), len(LCOE_COMPONENTS)), np.nan)
+        with self.connection:
+            self.fill_lookup(keys)
+            rows = self.connection.execute(f"SELECT key, parameters, {', '.join(LCOE_COMPONENTS)} FROM results WHERE key IN (SELECT key FROM lookup)").fetchall()
+            self.connection.execute("UPDATE results SET last_used = ? WHERE key IN (SELECT key FROM lookup)", (time.time(),))
+        if(rows):
+            order = np.argsort(keys)
+            positions = order[np.searchsorted(keys[order], np.array([row[0] for row in rows], dtype = np.int64))]
+            same = np.array([row[1] == matrix[position].tobytes() for row, position in zip(rows, positions.tolist())], dtype = bool)
+            found[positions[same]] = True
+            values[positions[same]] = np.array([row[2:] for row in rows], dtype = np.float64).reshape(len(rows), -1)[same]
+        self.hits += int(found.sum())
+        self.misses += len(keys) - int(found.sum())
+        return found, values
+    
+    # write the (keys x components) array @input values of @input keys (rows of @input matrix) in one transaction,
+    # then evict the least recently used entries
+    # the keys already in the file (collisions of the hash) are replaced, they are counted to keep the number of entries
+    def store(self, keys, matrix, values):
+        stamp = time.time()
+        with self.connection:
+            self.fill_lookup(keys)
+            replaced = self.connection.execute("SELECT COUNT(*) FROM results WHERE key IN (SELECT key FROM lookup)").fetchone()[0]
+            self.connection.executemany(f"INSERT OR REPLACE INTO results VALUES (?, ?, {', '.join('?' * len(LCOE_COMPONENTS))}, ?)",
+                                        ((key, parameters.tobytes(), *row, stamp) for key, parameters, row in zip(keys.tolist(), matrix, values.tolist())))
+            self.entries += len(keys) - replaced
+            excess = self.entries - self.max_entries
+            if(excess > 0):
+                self.connection.execute("DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,))
+                self.entries -= excess
+    
+    # LCOE breakdown of many configurations: the cache is checked in bulk, only the misses are calculated with LCOE_batch_calculator()
+    # and written back, a configuration repeated in @input parameters is calculated once
+    # @input parameters: dictionary {name: array} with the keys of PARAMETER_NAMES (arrays broadcast together)
+    # @return dictionary {component: array} with the keys of LCOE_COMPONENTS, like LCOE_batch_calculator()
+    def LCOE(self, parameters):
+        matrix = canonical_parameters(parameters)
+        keys, first, inverse = np.unique(parameter_keys(matrix), return_index = True, return_inverse = True)
+        found, values = self.lookup(keys, matrix[first])
+        if(not found.all()):
+            missing = np.flatnonzero(~found)
+            components = LCOE_batch_calculator(**dict(zip(PARAMETER_NAMES, matrix[first[missing]].T)))
+            values[missing] = np.stack([components[component] for component in LCOE_COMPONENTS], axis = 1)
+            self.store(keys[missing], matrix[first[missing]], values[missing])
+        values = values[inverse.reshape(-1)]
+        return {component: values[:, i].copy() for i, component in enumerate(LCOE_COMPONENTS)}
+    
+    # @return dictionary with entries, hits, misses and hit rate of this session
+    def info(self):
+        return {"entries": len(self), "max_entries": self.max_entries, "version": self.version, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0}
+    
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM results")
+        self.entries = 0
+    
+    def close(self):
+        self.connection.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exception):
+        self.close()
+
+# LCOE breakdown of @input reactors (see parameter_arrays()) through the persistent Result_Cache @input cache [default = RESULT_CACHE_FILE]
+# @return dictionary {component: array} with the keys of LCOE_COMPONENTS
+def cached_LCOE(reactors, cache = None):
+    if(cache is not None):
+        return cache.LCOE(parameter_arrays(reactors))
+    with Result_Cache() as cache:
+        return cache.LCOE(parameter_arrays(reactors))
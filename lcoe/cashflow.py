@@ -0,0 +1,101 @@
+import numpy as np
+from .core import LCOE_COMPONENTS, investment_factor
+from .batch import LCOE_batch_calculator, decommissioning_factor_batch, factorised_lookup, investment_factor_batch, round_cents
+from .sensitivity import parameter_arrays
+
+## discounted cash flow:
+
+# year-by-year version of LCOE_calculator(): LCOE = discounted costs / discounted energy
+# every plant is a row of (plants x years) arrays, so utilization hours and FOM, VOM and fuel costs can change every year
+# (capacity factor ramp-up, fuel price escalation, O&M trajectories)
+# the investment cost at the start of operation is the one of LCOE_calculator() (escalated_cost and investment_cost),
+# operating year t is discounted by (1+r)^-t and the decommissioning fund deposit is paid every operating year
+# with flat yearly values it gives the annuity result of LCOE_calculator(): sum((1+r)^-t) over the lifetime is 1/recovery_factor()
+# the discounted sums are not computed in the same order of the annuity formula, so with flat utilization hours the
+# components that are flat (CAPITAL, DECOMMISSIONING and the flat costs) are computed with LCOE_batch_calculator():
+# flat inputs give its result to the cent
+# the plants are processed in chunks so the temporary (chunk x years) arrays stay inside the memory budget
+DCF_MEMORY_BUDGET = 256 * 2**20 # [bytes]
+DCF_TIME_VARYING = ("utilization_hours", "fuel_cycle_costs", "FOM_costs", "VOM_costs")
+DCF_TEMPORARY_ARRAYS = 8 # (chunk x years) float64 arrays alive at the same time
+DCF_COSTS = (("FOM", "FOM_costs"), ("VOM", "VOM_costs"), ("FUEL", "fuel_cycle_costs")) # (component, yearly costs)
+
+# @return (..., @input years) array of @input values escalated by @input rate every year, the first year has @input values
+def escalation_path(values, rate, years):
+    values = np.asarray(values, dtype = np.float64)[..., None]
+    return values * np.power(1 + np.asarray(rate, dtype = np.float64)[..., None], np.arange(years))
+
+# @return (..., @input years) array growing linearly from @input initial_fraction * @input values to @input values in @input ramp_years
+# example: ramp_up(8000, 0.5, 3, 60) -> 4000, 5333, 6667, 8000, 8000, ...
+def ramp_up(values, initial_fraction, ramp_years, years):
+    values = np.asarray(values, dtype = np.float64)[..., None]
+    ramp_years = np.asarray(ramp_years, dtype = np.float64)[..., None]
+    fraction = np.minimum(1, initial_fraction + (1 - initial_fraction) * np.arange(years) / np.maximum(ramp_years, 1))
+    return values * fraction
+
+# @input reactors: a Reactor, a list of Reactor, a Reactor_Fleet or a dictionary {name: array}, see parameter_arrays()
+# @input utilization_hours, fuel_cycle_costs, FOM_costs, VOM_costs: yearly values that replace the flat ones of the reactors,
+#        arrays broadcast to (plants x years), e.g. (years,) for the same trajectory for every plant or (plants, years);
+#        the years axis has to cover the longest lifetime (longer arrays are cut)
+# @input memory_budget: maximum memory of the temporary arrays [bytes, default = DCF_MEMORY_BUDGET]
+# @input rounded: round every component to the cent like LCOE_calculator() [default = True]
+# @return dictionary {component: array} with the keys of LCOE_COMPONENTS
+# lifetime and construction time are rounded to integer years as in Reactor.LCOE_calculator()
+def DCF_calculator(reactors, utilization_hours = None, fuel_cycle_costs = None, FOM_costs = None, VOM_costs = None, memory_budget = DCF_MEMORY_BUDGET, rounded = True):
+    parameters = parameter_arrays(reactors)
+    parameters["lifetime"] = np.rint(parameters["lifetime"])
+    parameters["construction_time"] = np.rint(parameters["construction_time"])
+    plants = len(parameters["capacity"])
+    years = int(parameters["lifetime"].max())
+    yearly = {}
+    for name, values in zip(DCF_TIME_VARYING, (utilization_hours, fuel_cycle_costs, FOM_costs, VOM_costs)):
+        if(values is None):
+            values = parameters[name][:, None]
+        values = np.asarray(values, dtype = np.float64)
+        if(values.ndim == 0):
+            values = values[None, None]
+        elif(values.ndim == 1):
+            values = values[None, :]
+        if(values.shape[-1] != 1 and values.shape[-1] < years):
+            raise ValueError(f"The yearly values of {name} cover {values.shape[-1]} years, the longest lifetime is {years} years")
+        if(values.shape[-1] != 1 and (values[:, :years] == values[:, :1]).all()):
+            values = values[:, :1] # the same value every year, e.g. escalation_path() with a rate of 0
+        yearly[name] = np.broadcast_to(values[:, :years], (plants, years if values.shape[-1] != 1 else 1))
+    chunk_size = max(1, memory_budget // (DCF_TEMPORARY_ARRAYS * years * 8))
+    t = np.arange(1, years + 1, dtype = np.float64)
+
+    # useful costants
+    kW_MW = 1000 # convertion kW <-> MW
+
+    flat = [name for name in DCF_TIME_VARYING if yearly[name].shape[1] == 1]
+    components = {component: np.empty(plants) for component in LCOE_COMPONENTS[:-1]}
+    for start in range(0, plants, chunk_size):
+        rows = slice(start, min(start + chunk_size, plants))
+        p = {name: values[rows] for name, values in parameters.items()}
+        if("utilization_hours" in flat):
+            annuity_components = LCOE_batch_calculator(**dict(p, **{name: yearly[name][rows][:, 0] for name in flat}), rounded = False)
+            for component in ("CAPITAL", "DECOMMISSIONING") + tuple(component for component, name in DCF_COSTS if name in flat):
+                components[component][rows] = annuity_components[component]
+            if(len(flat) == len(DCF_TIME_VARYING)):
+                continue
+        discount = np.exp(-t * np.log1p(p["discount_rate"])[:, None])
+        discount[t > p["lifetime"][:, None]] = 0
+        annuity = discount.sum(axis = 1)
+        energy = np.broadcast_to(yearly["utilization_hours"][rows], discount.shape)
+        energy = np.einsum("ij,ij->i", energy, discount) / kW_MW # [MWh/kW]
+        for component, name in DCF_COSTS:
+            if(name not in flat):
+                components[component][rows] = np.einsum("ij,ij->i", yearly[name][rows], discount) / energy
+            elif("utilization_hours" not in flat):
+                components[component][rows] = yearly[name][rows][:, 0] * annuity / energy
+        if("utilization_hours" not in flat):
+            investment = factorised_lookup(investment_factor, investment_factor_batch, p["discount_rate"], p["escalation_rate"], p["construction_time"])
+            components["CAPITAL"][rows] = p["overnight_costs"] * investment / energy
+            components["DECOMMISSIONING"][rows] = p["overnight_costs"] * decommissioning_factor_batch(p["lifetime"]) * annuity / energy
+    if(rounded):
+        for component in LCOE_COMPONENTS[:-1]:
+            components[component] = round_cents(components[component])
+    components["LCOE"] = components["CAPITAL"] + components["FOM"] + components["VOM"] + components["FUEL"] + components["DECOMMISSIONING"]
+    if(rounded):
+        components["LCOE"] = round_cents(components["LCOE"])
+    return components
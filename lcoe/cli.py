@@ -0,0 +1,218 @@
+import csv
+import json
+import sys
+import argparse
+import itertools
+import numpy as np
+from .core import LCOE_COMPONENTS, PARAMETER_NAMES
+from .batch import LCOE_batch_calculator
+from .designs import design_registry
+from .regions import region_LCOE_store
+from .fleet import parameter_schema
+from .cache import RESULT_CACHE_FILE, Result_Cache
+from .instrumentation import disable_instrumentation, enable_instrumentation
+
+## batch command line:
+
+# every input row can be:
+#   - raw parameters: columns named as PARAMETER_NAMES (and capacity_factor), the missing ones are the Reactor() defaults
+#   - a design: column "design" with a name of design_registry(), the parameter columns given replace the design values
+#   - a scenario/region/year: columns "scenario", "region", "year", the LCOE is the one calculated by IEA in [3]
+# the output has the input columns, LCOE_COMPONENTS (empty if not available) and "error"
+# a row with an error (a value that is not a number, a parameter out of its physical range, a line that is not json...)
+# gets the message in "error" and no results, the other rows are calculated normally
+BATCH_OUTPUT_COLUMNS = LCOE_COMPONENTS + ("error",)
+
+# record of an input line that can not be read, it has no parameters and @var error is written in the output
+class Invalid_Record(dict):
+    def __init__(self, error, **fields):
+        super().__init__(fields)
+        self.error = error
+
+# @return Invalid_Record for the json lines that are not valid json or not an object, the record otherwise
+def parse_json_record(line, number):
+    try:
+        record = json.loads(line)
+    except ValueError as error:
+        return Invalid_Record(f"invalid json: {error}", line = number)
+    if(not isinstance(record, dict)):
+        return Invalid_Record(f"invalid record: a json object is needed, not {type(record).__name__}", line = number)
+    return record
+
+# @return generator of dictionaries, one for each row of the csv or json lines @input file
+def read_records(file, format):
+    if(format == "jsonl"):
+        return (parse_json_record(line, number) for number, line in enumerate(file, start = 1) if line.strip())
+    return csv.DictReader(file)
+
+# @return generator of lists with at most @input size elements of @input iterable
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while(True):
+        chunk = list(itertools.islice(iterator, size))
+        if(not chunk):
+            return
+        yield chunk
+
+# fill the array @input target with the values of the @input records for the key @input name where they are given
+# @input errors: list of error messages of the records, the rows that can not be converted get a message
+def fill_column(target, records, name, errors):
+    given = [(i, record[name]) for i, record in enumerate(records) if record.get(name) not in (None, "")]
+    if(not given):
+        return np.zeros(len(records), dtype = bool)
+    mask = np.zeros(len(records), dtype = bool)
+    try:
+        indexes, values = zip(*given)
+        target[list(indexes)] = np.array(values, dtype = np.float64)
+        mask[list(indexes)] = True
+    except (TypeError, ValueError):
+        for i, value in given:
+            try:
+                target[i] = float(value)
+                mask[i] = True
+            except (TypeError, ValueError):
+                errors[i] = errors[i] or f"invalid {name}: {value!r}"
+    return mask
+
+# physical range of the parameters: (name, condition on the array of values, message)
+# lifetime and construction time are rounded to integer years by the formula, so they have to be at least 0.5
+PARAMETER_CHECKS = (("lifetime", lambda values: values >= 0.5, "has to be at least 1 year"),
+                    ("construction_time", lambda values: values >= 0.5, "has to be at least 1 year"),
+                    ("utilization_hours", lambda values: values > 0, "has to be positive"),
+                    ("discount_rate", lambda values: values > -1, "has to be greater than -1"),
+                    ("escalation_rate", lambda values: values > -1, "has to be greater than -1"),
+                    ("overnight_costs", lambda values: values >= 0, "can not be negative"),
+                    ("fuel_cycle_costs", lambda values: values >= 0, "can not be negative"),
+                    ("FOM_costs", lambda values: values >= 0, "can not be negative"),
+                    ("VOM_costs", lambda values: values >= 0, "can not be negative"))
+
+# write an error for the rows of @input values ({name: array}) with parameters that are not finite or out of PARAMETER_CHECKS
+def check_parameters(values, errors):
+    for name, condition, message in PARAMETER_CHECKS:
+        for i in np.flatnonzero(~condition(values[name])).tolist():
+            errors[i] = errors[i] or f"invalid {name}: {values[name][i]:g} {message}"
+    for name in PARAMETER_NAMES:
+        for i in np.flatnonzero(~np.isfinite(values[name])).tolist():
+            errors[i] = errors[i] or f"invalid {name}: {values[name][i]:g}"
+
+# @return the text value of the column @input name of @input record ("" if not given), non text values get an error
+def text_value(record, name, errors, i):
+    value = record.get(name)
+    if(value is None or isinstance(value, str)):
+        return value or ""
+    if(name == "year" and isinstance(value, int)):
+        return str(value)
+    errors[i] = errors[i] or f"invalid {name}: {value!r}"
+    return ""
+
+# LCOE breakdown of a chunk of records (see BATCH_OUTPUT_COLUMNS)
+# @return (dictionary {component: array} with NaN where not available, list of error messages)
+def evaluate_records(records, cache = None):
+    size = len(records)
+    errors = [record.error if isinstance(record, Invalid_Record) else "" for record in records]
+    values = {column.attribute: np.full(size, column.default, dtype = np.float64) for column in parameter_schema()}
+    # designs first, then the parameters given explicitly
+    designs = [text_value(record, "design", errors, i) for i, record in enumerate(records)]
+    if(any(designs)):
+        registry = design_registry()
+        for design in set(designs) - {""}:
+            rows = [i for i, name in enumerate(designs) if name == design]
+            if(design not in registry):
+                for i in rows:
+                    errors[i] = f"unknown design: {design!r}"
+                continue
+            for name, value in registry.design_values(design).items():
+                values[name][rows] = value
+    given_hours = fill_column(values["utilization_hours"], records, "utilization_hours", errors)
+    for name in PARAMETER_NAMES:
+        if(name != "utilization_hours"):
+            fill_column(values[name], records, name, errors)
+    capacity_factor = np.full(size, np.nan)
+    given_factor = fill_column(capacity_factor, records, "capacity_factor", errors) & ~given_hours
+    values["utilization_hours"][given_factor] = np.rint(capacity_factor[given_factor] * 365 * 24)
+    check_parameters(values, errors)
+    # the rows with an error are calculated with the default parameters, their results are not written (nor cached)
+    invalid = np.array([bool(error) for error in errors], dtype = bool)
+    if(invalid.any()):
+        for column in parameter_schema():
+            values[column.attribute][invalid] = column.default
+    components = cache.LCOE(values) if cache is not None else LCOE_batch_calculator(**values)
+    # scenario/region/year rows only have the LCOE of IEA
+    keys = [tuple(text_value(record, name, errors, i) for name in ("scenario", "region", "year")) for i, record in enumerate(records)]
+    if(any(key[0] for key in keys)):
+        store = region_LCOE_store()
+        for i, key in enumerate(keys):
+            if(key[0]):
+                for component in LCOE_COMPONENTS:
+                    components[component][i] = np.nan
+                try:
+                    components["LCOE"][i] = store.get(*key).LCOE
+                except ValueError as error:
+                    errors[i] = str(error)
+    for i, error in enumerate(errors):
+        if(error):
+            for component in LCOE_COMPONENTS:
+                components[component][i] = np.nan
+    return components, errors
+
+# @return list of the columns of the csv output: the input columns in the order they first appear in @input records,
+# then BATCH_OUTPUT_COLUMNS
+def output_columns(records):
+    columns = dict.fromkeys(name for record in records for name in record if name is not None and name not in BATCH_OUTPUT_COLUMNS)
+    return list(columns) + list(BATCH_OUTPUT_COLUMNS)
+
+# write the records of a chunk with their results, NaN are written as empty values in csv and null in json
+# @input writer: csv.DictWriter for the csv output, every value is written under its own column and the missing ones are empty
+def write_records(file, format, records, components, errors, writer = None):
+    columns = [np.where(np.isnan(components[component]), None, components[component]).tolist() for component in LCOE_COMPONENTS] + [errors]
+    rows = (dict(record, **dict(zip(BATCH_OUTPUT_COLUMNS, row))) for record, row in zip(records, zip(*columns)))
+    if(format == "jsonl"):
+        file.write("".join(json.dumps(row) + "\n" for row in rows))
+    else:
+        writer.writerows({name: "" if value is None else value for name, value in row.items()} for row in rows)
+
+# headless calculator: stream reactor configurations from csv or json lines and write the LCOE breakdowns as it goes
+# the input is processed in chunks, so the memory used does not depend on the size of the input
+# @input argv: command line arguments, see "python 'LCOE program.py' batch --help"
+def batch_main(argv = None):
+    parser = argparse.ArgumentParser(prog = "LCOE program.py batch", description = "Calculate the LCOE of reactor configurations read from csv or json lines.")
+    parser.add_argument("input", nargs = "?", default = "-", help = "input file, - for stdin [default]")
+    parser.add_argument("-o", "--output", default = "-", help = "output file, - for stdout [default]")
+    parser.add_argument("--format", choices = ["csv", "jsonl"], help = "input format [default: from the file extension, csv for stdin]")
+    parser.add_argument("--output-format", choices = ["csv", "jsonl"], help = "output format [default: input format]")
+    parser.add_argument("--chunk-size", type = int, default = 50000, help = "rows processed together [default: 50000]")
+    parser.add_argument("--catalog", action = "append", default = [], help = "design catalog file (csv or json), can be repeated")
+    parser.add_argument("--cache", nargs = "?", const = RESULT_CACHE_FILE, help = f"use the persistent result cache, see Result_Cache [default file: {RESULT_CACHE_FILE}]")
+    parser.add_argument("--metrics", help = "json lines file where the metrics of the run are appended, see enable_instrumentation()")
+    parser.add_argument("--metrics-interval", type = float, default = 10.0, help = "seconds between two metrics snapshots [default: 10]")
+    arguments = parser.parse_args(argv)
+    if(arguments.chunk_size < 1):
+        parser.error(f"--chunk-size has to be at least 1, it is {arguments.chunk_size}")
+    if(arguments.metrics):
+        enable_instrumentation(dump_path = arguments.metrics, dump_interval = arguments.metrics_interval)
+    input_format = arguments.format or ("jsonl" if arguments.input.endswith((".jsonl", ".json")) else "csv")
+    output_format = arguments.output_format or input_format
+    for catalog in arguments.catalog:
+        design_registry().load(catalog)
+    input_file = sys.stdin if arguments.input == "-" else open(arguments.input, newline = "")
+    output_file = sys.stdout if arguments.output == "-" else open(arguments.output, "w", newline = "")
+    cache = Result_Cache(arguments.cache) if arguments.cache else None
+    try:
+        writer = None
+        for records in chunked(read_records(input_file, input_format), arguments.chunk_size):
+            components, errors = evaluate_records(records, cache)
+            if(output_format == "csv" and writer is None):
+                # the header is written with the first chunk: columns that appear only in later json records are not written
+                writer = csv.DictWriter(output_file, output_columns(records), restval = "", extrasaction = "ignore", lineterminator = "\n")
+                writer.writeheader()
+            write_records(output_file, output_format, records, components, errors, writer)
+    finally:
+        if(input_file is not sys.stdin):
+            input_file.close()
+        if(output_file is not sys.stdout):
+            output_file.close()
+        if(cache is not None):
+            cache.close()
+        if(arguments.metrics):
+            disable_instrumentation()
+    return 0
@@ -0,0 +1,182 @@
+import json
+import os
+import numpy as np
+from .core import LCOE_COMPONENTS, LCOE_COMPONENT_NAMES, PARAMETER_NAMES
+from .fleet import parameter_schema
+from .compact import COMPACT_DTYPES, compact_array
+
+## columnar output:
+
+# binary column store for large sweeps and Monte Carlo runs, it is a directory with:
+#   header.json   small header with the number of rows and the schema of the columns (dtype, name and unit)
+#   <column>.bin  raw little endian values of every column, one after the other
+# the columns can be appended in chunks and read back with memory mapping, without loading the files
+COLUMN_HEADER_FILE = "header.json"
+COLUMN_FORMAT_VERSION = 1
+
+# schema of the columns for the parameters and the results, names and units come from parameter_schema()
+# @input names: columns to include [default = PARAMETER_NAMES + LCOE_COMPONENTS]
+# @input compact: store the columns with COMPACT_DTYPES instead of float64 [default = False]
+# @return list of dictionaries {"column", "dtype", "name", "unit_of_measurement"}
+def column_schema(names = None, compact = False):
+    names = PARAMETER_NAMES + LCOE_COMPONENTS if names is None else names
+    descriptions = {column.attribute: (column.name, column.unit_of_measurement) for column in parameter_schema()}
+    descriptions.update({component: (name, "$/MWh") for component, name in zip(LCOE_COMPONENTS, LCOE_COMPONENT_NAMES)})
+    return [{"column": name, "dtype": COMPACT_DTYPES.get(name, "<f4") if compact else "<f8", "name": descriptions.get(name, (name, ""))[0], "unit_of_measurement": descriptions.get(name, (name, ""))[1]} for name in names]
+
+# writer of a column store, if the directory exists with the same columns the new rows are appended
+# the header is rewritten after every chunk, so a reader always sees complete rows
+# @input compact: see column_schema(), for a new store (an existing store keeps its types)
+class Column_Writer:
+    def __init__(self, path, names = None, compact = False):
+        self.path = path
+        schema = column_schema(names, compact = compact)
+        header_path = os.path.join(path, COLUMN_HEADER_FILE)
+        if(os.path.exists(header_path)):
+            with open(header_path) as file:
+                self.header = json.load(file)
+            if([column["column"] for column in self.header["columns"]] != [column["column"] for column in schema]):
+                raise ValueError(f"The column store {path!r} has columns {[column['column'] for column in self.header['columns']]}, they can not be appended with different columns")
+        else:
+            os.makedirs(path, exist_ok = True)
+            self.header = {"format": "LCOE columns", "version": COLUMN_FORMAT_VERSION, "rows": 0, "columns": schema}
+            self.write_header()
+        self.files = {column["column"]: open(os.path.join(path, column["column"] + ".bin"), "ab") for column in self.header["columns"]}
+        # drop the rows written after the last header update (interrupted appends)
+        for column in self.header["columns"]:
+            self.files[column["column"]].truncate(self.header["rows"] * np.dtype(column["dtype"]).itemsize)
+    
+    def write_header(self):
+        temporary = os.path.join(self.path, COLUMN_HEADER_FILE + ".tmp")
+        with open(temporary, "w") as file:
+            json.dump(self.header, file, indent = 1)
+        os.replace(temporary, os.path.join(self.path, COLUMN_HEADER_FILE))
+    
+    # append a chunk {column: array}, all the columns of the store are needed and must have the same length
+    def append(self, chunk):
+        size = None
+        for column in self.header["columns"]:
+            values = chunk[column["column"]]
+            if(np.dtype(column["dtype"]).kind == "u"): # compact integral column
+                values = compact_array(column["column"], values)
+            values = np.ascontiguousarray(values, dtype = column["dtype"])
+            if(size is not None and len(values) != size):
+                raise ValueError(f"Column {column['column']!r} has {len(values)} rows instead of {size}")
+            size = len(values)
+            self.files[column["column"]].write(values.data)
+        for file in self.files.values():
+            file.flush()
+        self.header["rows"] += size
+        self.write_header()
+    
+    def close(self):
+        for file in self.files.values():
+            file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exception):
+        self.close()
+
+# reader of a column store, every column is a read-only numpy memmap (no copy, pages are loaded when used)
+class Column_Reader:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, COLUMN_HEADER_FILE)) as file:
+            self.header = json.load(file)
+        self.schema = {column["column"]: column for column in self.header["columns"]}
+    
+    def __len__(self):
+        return self.header["rows"]
+    
+    def names(self):
+        return list(self.schema)
+    
+    # @return memmap of the column @input name
+    def __getitem__(self, name):
+        if(len(self) == 0):
+            return np.empty(0, dtype = self.schema[name]["dtype"])
+        return np.memmap(os.path.join(self.path, name + ".bin"), dtype = self.schema[name]["dtype"], mode = "r", shape = (len(self),))
+    
+    # percentiles of the column @input name computed by streaming over the memmap, see streaming_percentiles()
+    def percentiles(self, name, q = (10, 50, 90)):
+        return streaming_percentiles(self[name], q)
+
+# exact percentiles (numpy "linear" method) of a large array, e.g. a memmap, without sorting or copying it:
+# the values are read in chunks to narrow the interval containing every needed rank with histograms,
+# then the few values left in the interval are collected and sorted
+# every pass counts again the values below the interval, so rounding in the bins can not give a wrong rank
+# @input collect_limit: maximum number of values collected for one rank, more values are collected only if the
+#                       interval can not get narrower (values a few ulps apart)
+# NaN values raise ValueError (numpy would return NaN)
+def streaming_percentiles(values, q = (10, 50, 90), chunk_size = 1 << 22, bins = 1 << 14, collect_limit = 1 << 20):
+    size = len(values)
+    if(size == 0):
+        raise ValueError("Percentiles of an empty column")
+    chunks = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    positions = np.asarray(q, dtype = np.float64) / 100 * (size - 1)
+    ranks = sorted(set(np.floor(positions).astype(int).tolist()) | set(np.ceil(positions).astype(int).tolist()))
+    lows = [float(np.min(values[start:end])) for start, end in chunks]
+    highs = [float(np.max(values[start:end])) for start, end in chunks]
+    if(np.isnan(lows).any()):
+        raise ValueError("Percentiles of a column with NaN values")
+    low, high = min(lows), max(highs)
+    intervals = {rank: (low, high, size) for rank in ranks} # interval containing the rank and values expected inside
+    narrowest = set() # ranks whose interval did not get narrower in the last pass, their values are collected
+    found = {}
+    while(len(found) < len(ranks)):
+        active = [rank for rank in ranks if rank not in found]
+        collect = {rank for rank in active if intervals[rank][2] <= collect_limit or rank in narrowest}
+        below = dict.fromkeys(active, 0)
+        counts = {rank: np.zeros(bins, dtype = np.int64) for rank in active}
+        collected = {rank: [] for rank in collect}
+        extremes = {rank: [np.inf, -np.inf] for rank in active} # smallest and largest value inside the interval
+        for start, end in chunks:
+            chunk = values[start:end]
+            for rank in active:
+                low, high, expected = intervals[rank]
+                below[rank] += int(np.count_nonzero(chunk < low))
+                inside = chunk[(chunk >= low) & (chunk <= high)]
+                if(rank in collect):
+                    collected[rank].append(inside)
+                elif(len(inside)):
+                    extremes[rank] = [min(extremes[rank][0], float(inside.min())), max(extremes[rank][1], float(inside.max()))]
+                    if(high > low):
+                        index = np.minimum(((inside - low) / (high - low) * bins).astype(np.int64), bins - 1)
+                        counts[rank] += np.bincount(index, minlength = bins)
+        for rank in active:
+            low, high, expected = intervals[rank]
+            if(rank in collect):
+                inside = np.sort(np.concatenate(collected[rank]))
+                found[rank] = float(inside[rank - below[rank]])
+            elif(extremes[rank][0] == extremes[rank][1]):
+                # all the values inside are equal (ties)
+                found[rank] = extremes[rank][0]
+            else:
+                cumulative = below[rank] + np.cumsum(counts[rank])
+                index = int(np.searchsorted(cumulative, rank, side = "right"))
+                width = (high - low) / bins
+                # the new interval is a bit larger than the bin, the values below it are counted again in the next pass
+                new_low = max(extremes[rank][0], low + index * width - 4 * np.spacing(abs(low) + abs(high)))
+                new_high = min(extremes[rank][1], low + (index + 1) * width + 4 * np.spacing(abs(low) + abs(high)))
+                new_high = max(new_low, new_high)
+                if(new_high - new_low >= high - low):
+                    narrowest.add(rank)
+                intervals[rank] = (new_low, new_high, int(counts[rank][index]))
+    result = []
+    for position in positions:
+        below, above = found[int(np.floor(position))], found[int(np.ceil(position))]
+        result.append(below + (position - np.floor(position)) * (above - below))
+    return np.array(result)
+
+# write the parameters and the LCOE breakdown of a sweep in a column store
+# @input parameters: dictionary {name: array} with PARAMETER_NAMES, @input components: result of LCOE_batch_calculator()
+# @input compact: see column_schema() [default = False]
+def write_columns(path, parameters, components, compact = False):
+    with Column_Writer(path, compact = compact) as writer:
+        size = len(components["LCOE"])
+        chunk = {name: np.broadcast_to(parameters[name], size) for name in PARAMETER_NAMES}
+        chunk.update(components)
+        writer.append(chunk)
+    return Column_Reader(path)
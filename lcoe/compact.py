@@ -0,0 +1,98 @@
+from collections import namedtuple
+import numpy as np
+from .core import LCOE_COMPONENTS, PARAMETER_NAMES, Reactor
+from .batch import LCOE_batch_calculator
+
+## compact mode for very large sweeps:
+
+# storage types of the compact mode: the integral parameters as unsigned integers (lifetime and construction time are
+# rounded to integer years by the formula anyway), the other parameters and the results as float32
+# only the stored columns are narrower: LCOE_batch_calculator() converts every input to float64 before the financial
+# factors, so the compounding (1+r)^L of the recovery factor and all the sums are always done in float64
+# 30 + 24 bytes for a row with the ten parameters and the six results, instead of 80 + 48 bytes in float64
+COMPACT_DTYPES = {"capacity": "<u2", "lifetime": "<u1", "utilization_hours": "<u2", "construction_time": "<u1",
+                  "discount_rate": "<f4", "escalation_rate": "<f4", "overnight_costs": "<f4", "fuel_cycle_costs": "<f4", "FOM_costs": "<f4", "VOM_costs": "<f4",
+                  **{component: "<f4" for component in LCOE_COMPONENTS}}
+COMPACT_ERROR_LIMIT = 0.01 # [$/MWh] maximum LCOE deviation of the compact mode from the full precision path
+
+# @return @input values of the column @input name converted to its compact storage type
+# integral columns are rounded like Parameter.edit_value(), values that do not fit in the type raise ValueError
+def compact_array(name, values):
+    dtype = np.dtype(COMPACT_DTYPES[name])
+    values = np.asarray(values)
+    if(dtype.kind == "u"):
+        if(values.dtype.kind == "f"):
+            values = np.rint(values)
+        if(values.size and (np.min(values) < 0 or np.max(values) > np.iinfo(dtype).max)):
+            raise ValueError(f"Values of {name!r} have to be between 0 and {np.iinfo(dtype).max} in compact mode, they are between {np.min(values)} and {np.max(values)}")
+    return values.astype(dtype)
+
+# @return dictionary {name: compact array} of @input columns (dictionary {name: array})
+def compact_columns(columns):
+    return {name: compact_array(name, values) for name, values in columns.items()}
+
+# result of precision_check(), deviations in [$/MWh]
+# @var max_deviation dictionary {component: maximum absolute deviation} of the results before the rounding to the cent
+# @var rounding_changes rows whose rounded LCOE changes by one cent because the value is next to a rounding boundary
+class Precision_Check(namedtuple("Precision_Check", ("rows", "max_deviation", "rounding_changes", "limit"))):
+    __slots__ = ()
+
+    @property
+    def passed(self):
+        return self.max_deviation["LCOE"] < self.limit
+
+    def __repr__(self):
+        return (f"Compact mode check on {self.rows} rows: maximum LCOE deviation {self.max_deviation['LCOE']:.2e} $/MWh "
+                f"({'under' if self.passed else 'OVER'} the limit of {self.limit} $/MWh), rounded LCOE changed by one cent in {self.rounding_changes} rows")
+
+# compare the compact path with the full precision path on the rows @input parameters ({name: array or scalar}, broadcast together)
+# full precision: the parameters as given in float64, results in float64
+# compact: the parameters stored with COMPACT_DTYPES, results computed in float64 and stored as float32
+# @return Precision_Check
+def precision_check(parameters, limit = COMPACT_ERROR_LIMIT):
+    parameters = dict(zip(PARAMETER_NAMES, np.broadcast_arrays(*[np.asarray(parameters[name]) for name in PARAMETER_NAMES])))
+    full = LCOE_batch_calculator(**{name: values.astype(np.float64) for name, values in parameters.items()}, rounded = False)
+    compact = LCOE_batch_calculator(**compact_columns(parameters), rounded = False)
+    max_deviation = {component: float(np.max(np.abs(compact[component].astype(np.float32) - full[component]), initial = 0.0)) for component in LCOE_COMPONENTS}
+    rounding_changes = int(np.count_nonzero(np.round(compact["LCOE"], 2).astype(np.float32) != np.round(full["LCOE"], 2).astype(np.float32)))
+    return Precision_Check(int(np.size(full["LCOE"])), max_deviation, rounding_changes, limit)
+
+# LCOE_sweep() in compact mode: every combination of the values in @input grid with the other parameters of @input reactor
+# the grid columns are stored with COMPACT_DTYPES and the results as float32, the grid is computed in slices
+# of about @input slice_rows rows so that the float64 temporaries stay small
+# the axes of the grid are short, so the results are computed from their full precision values: they are the ones of
+# LCOE_sweep() stored as float32 (no value moves to the next cent), the compact grid columns are checked with precision_check()
+# @input check_rows: random rows of the grid checked with precision_check() before the sweep, a ValueError is raised
+#                    if the deviation is not under COMPACT_ERROR_LIMIT [default = 100000, 0 = no check]
+# @return dictionary {name: array} like LCOE_sweep()
+def compact_LCOE_sweep(reactor = None, rounded = True, slice_rows = 1 << 20, check_rows = 100000, seed = 0, **grid):
+    for name in grid:
+        if(name not in PARAMETER_NAMES):
+            raise ValueError(f"Unknown parameter {name!r}, it has to be one of {PARAMETER_NAMES}")
+    values = (reactor if reactor is not None else Reactor()).parameter_values()
+    if(not grid):
+        components = LCOE_batch_calculator(**values, rounded = rounded)
+        return {component: components[component].astype(COMPACT_DTYPES[component]).reshape(1) for component in LCOE_COMPONENTS}
+    axes = {name: np.asarray(grid[name], dtype = np.float64).ravel() for name in grid}
+    shape = tuple(len(axis) for axis in axes.values())
+    size = int(np.prod(shape))
+    if(check_rows and size):
+        rows = np.unravel_index(np.random.default_rng(seed).integers(0, size, min(check_rows, size)), shape)
+        check = precision_check({**values, **{name: axis[row] for (name, axis), row in zip(axes.items(), rows)}})
+        if(not check.passed):
+            raise ValueError(f"The compact mode is not precise enough for this sweep: {check}")
+    # open grid: every parameter varies along its own axis, like in LCOE_sweep()
+    axes = {name: axis.reshape([-1 if i == position else 1 for i in range(len(shape))]) for position, (name, axis) in enumerate(axes.items())}
+    result = {}
+    for name, axis in axes.items():
+        result[name] = np.empty(size, dtype = COMPACT_DTYPES[name])
+        result[name].reshape(shape)[...] = compact_array(name, axis)
+    for component in LCOE_COMPONENTS:
+        result[component] = np.empty(size, dtype = COMPACT_DTYPES[component])
+    first = next(iter(axes))
+    step = max(1, slice_rows // max(1, int(np.prod(shape[1:]))))
+    for start in range(0, shape[0], step):
+        components = LCOE_batch_calculator(**{**values, **axes, first: axes[first][start:start + step]}, rounded = rounded, factorise = True)
+        for component in LCOE_COMPONENTS:
+            result[component].reshape(shape)[start:start + step] = components[component]
+    return result
@@ -0,0 +1,505 @@
+import copy
+import math
+from collections import namedtuple
+from functools import lru_cache
+
+## usefull function:
+
+# function for check if an input is Y or N
+# @output True if "Y" and False if "N"
+def yes_no_input(input):
+    control_input = str(input).upper()
+    while control_input not in ["Y", "N"]:
+        control_input = str(input("Input has to be Y or N, please re-enter it correctly: ")).upper()
+    if control_input == "Y":
+        return True
+    else:
+        return False
+
+
+# function for print a list with numbered and alphabetic or input index
+# @output is string or it print directly inside the function based on the @input string [print by default]
+def print_list(list, index=0, sep=". ", double_index = False, input_index = [""], string = False):
+    if(input_index[index]==""):
+        second_index=[""]*26
+        if(string):
+            output = ""
+            if(double_index):
+                i = 0
+                for letter in "abcdefghijklmnopqrstuvwxyz": # the argument string hides the module string
+                    second_index[i] = f"({letter})"
+                    i+=1
+            while(index < len(list)):
+              output = output + f"{index+1}{second_index[index]}{sep}{list[index]}\n"
+              index+=1
+            return output + f"\n"
+        else:
+            if(double_index):
+                i = 0
+                for letter in "abcdefghijklmnopqrstuvwxyz": # the argument string hides the module string
+                    second_index[i] = f"({letter})"
+                    i+=1
+            while(index < len(list)):
+              print(f"{index+1}{second_index[index]}{sep}{list[index]}")
+              index+=1
+            print("")
+    else:
+        if(string):
+            output = ""
+            while(index < len(list)):
+              output = output + f"{input_index[index]}{sep}{list[index]}\n"
+              index+=1
+            return output + f"\n"
+        else:
+            while(index < len(list)):
+              print(f"{input_index[index]}{sep}{list[index]}")
+              index+=1
+            print("")
+
+
+# function for format rows as a table with aligned columns
+# @input header: list of column titles, @input rows: list of lists of values (already formatted strings or numbers)
+# the first column is aligned to the left and the others to the right
+# @output string with the table
+def format_table(header, rows, sep = "  "):
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(str(title)), *(len(row[i]) for row in rows)) for i, title in enumerate(header)]
+    lines = [sep.join(str(title).ljust(width) for title, width in zip(header, widths)), sep.join("-" * width for width in widths)]
+    lines += [sep.join([row[0].ljust(widths[0])] + [value.rjust(width) for value, width in zip(row[1:], widths[1:])]) for row in rows]
+    return "\n".join(lines) + "\n"
+
+# convert a number read from a data file in int or float like the values written in the code
+def parse_number(text):
+    return float(text) if any(character in text for character in ".eE") else int(text)
+
+
+## real program:
+
+# order of the inputs of LCOE_calculator() and of the cost components of its result
+PARAMETER_NAMES = ("capacity", "lifetime", "utilization_hours", "construction_time", "discount_rate", "escalation_rate", "overnight_costs", "fuel_cycle_costs", "FOM_costs", "VOM_costs")
+LCOE_COMPONENTS = ("CAPITAL", "FOM", "VOM", "FUEL", "DECOMMISSIONING", "LCOE")
+LCOE_COMPONENT_NAMES = ("Capital", "Fixed Operation and Maintenance", "Variable Operation and Maintenance", "Fuel", "Decommissioning", "Levelized Cost Of Electricity")
+
+# immutable result of LCOE_calculator(), all values in [$/MWh] rounded to the cent
+# it is a tuple so it is cheap to create, compare and send between processes
+class LCOE_Result(namedtuple("LCOE_Result", LCOE_COMPONENTS)):
+    __slots__ = ()
+
+    # @return dictionary {component: percentage of LCOE} for the five cost components
+    @property
+    def percentages(self):
+        return {component: round(value / self.LCOE * 100, 2) for component, value in zip(LCOE_COMPONENTS[:-1], self[:-1])}
+
+    # @return list of Parameter, the five cost components and the LCOE as last element
+    def to_parameters(self):
+        return [Parameter(name = name, unit_of_measurement = "$/MWh", value = value) for name, value in zip(LCOE_COMPONENT_NAMES, self)]
+
+    # print LCOE breakdown or just LCOE based on the @input only_result [default = False]
+    def print_result(self, only_result = False):
+        list_scomposed = self.to_parameters()
+        LCOE = list_scomposed.pop()
+        print(f"{LCOE.print_value()}")
+        if(not only_result):
+            print(f"\nCosts breakdown by category:")
+            [print(f"{value.print_value()}") for value in list_scomposed]
+            print(f"\nCosts breakdown in percentage:")
+            [print(f"{value.name}: {(value.value/LCOE.value*100):.2f} %") for value in list_scomposed]
+
+# financial factors of the LCOE formula, they only depend on few parameters so they are cached:
+# sweeps usually repeat the same (discount rate, lifetime) and (discount rate, escalation rate, construction time)
+# see financial_cache_info() for hit/miss statistics
+FINANCIAL_CACHE_SIZE = 4096
+
+# capital recovery factor, it is 1/L for a discount rate of 0 (limit of the formula) like recovery_factor_batch()
+@lru_cache(maxsize = FINANCIAL_CACHE_SIZE)
+def recovery_factor(discount_rate, lifetime):
+    if(discount_rate == 0):
+        return 1 / lifetime
+    return (discount_rate * math.pow(1 + discount_rate, lifetime)) / (math.pow(1 + discount_rate, lifetime) - 1)
+
+# investment cost at the start of operation for 1 $/kW of overnight costs:
+# overnight costs are spent uniformly during construction, escalated and financed up to the start of operation
+# the construction time is rounded to integer years (half to even) like np.rint() in the batch engine
+@lru_cache(maxsize = FINANCIAL_CACHE_SIZE)
+def investment_factor(discount_rate, escalation_rate, construction_time):
+    construction_time = round(construction_time)
+    escalated_cost = sum((1 / construction_time) * (math.pow(1 + escalation_rate, t - 0.5)) for t in range(1, construction_time + 1))
+    return sum((escalated_cost / construction_time) * (math.pow(1 + discount_rate, construction_time + 1 - t)) for t in range(1, construction_time + 1))
+
+# yearly deposit of the decommissioning sinking fund for 1 $/kW of overnight costs
+# decommissioning costs are 15% of the overnight costs and the interest of decommissioning fund is assumed to be 0.01
+@lru_cache(maxsize = FINANCIAL_CACHE_SIZE)
+def decommissioning_factor(lifetime):
+    return (0.15 * 0.01) / (math.pow(1.01, lifetime) - 1)
+
+FINANCIAL_FACTORS = (recovery_factor, investment_factor, decommissioning_factor)
+
+# @return dictionary {factor name: {"hits", "misses", "size", "maxsize", "hit_rate"}} of the financial factors caches
+def financial_cache_info():
+    info = {}
+    for factor in FINANCIAL_FACTORS:
+        hits, misses, maxsize, size = factor.cache_info()
+        info[factor.__name__] = {"hits": hits, "misses": misses, "size": size, "maxsize": maxsize, "hit_rate": hits / (hits + misses) if hits + misses else 0.0}
+    return info
+
+def clear_financial_cache():
+    for factor in FINANCIAL_FACTORS:
+        factor.cache_clear()
+
+# formula for calculate Levelized Cost Of Electricity [$/MWh]
+# formulas based on [2]
+# with the exception of Fuel and O&M costs for which various other data and prices would be needed 
+# so an approximation has been used
+# lifetime and construction time are rounded to integer years like in Reactor.LCOE_result() and LCOE_batch_calculator()
+# @output LCOE_Result, nothing is printed
+def compute_LCOE(capacity, lifetime, utilization_hours, construction_time, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs): # O_M_costs
+    
+    # useful costants
+    kW_MW = 1000 # convertion kW <-> MW
+    lifetime = round(lifetime)
+    construction_time = round(construction_time)
+
+    # Calculate CAPITAL
+    investment_cost = overnight_costs * investment_factor(discount_rate, escalation_rate, construction_time)
+    annual_capital_charge = investment_cost * kW_MW * recovery_factor(discount_rate, lifetime)
+    CAPITAL = round(annual_capital_charge / utilization_hours, 2)
+
+    # Calculate FOM
+    FOM = round(FOM_costs * kW_MW / utilization_hours, 2)
+
+    # Calculate VOM
+    VOM = round(VOM_costs * kW_MW / utilization_hours, 2)
+
+    # Calculate FUEL
+    FUEL = round(fuel_cycle_costs * kW_MW / utilization_hours, 2)
+
+    # Calculate DECOMMISSIONING, interest of decommissioning fund is assumed to be 0.01 
+    DECOMMISSIONING = round(overnight_costs * decommissioning_factor(lifetime) * kW_MW / utilization_hours, 2)
+
+    # Calculate LCOE
+    LCOE = round(CAPITAL + FOM + VOM + FUEL + DECOMMISSIONING, 2)
+    return LCOE_Result(CAPITAL, FOM, VOM, FUEL, DECOMMISSIONING, LCOE)
+
+# dependency graph of the LCOE formula: {node: names of the parameters and nodes it depends on} in evaluation order
+# after an edit only the nodes that depend on the edited parameters have to be recomputed, see dependent_nodes()
+# e.g. the capital charge depends on discount, escalation, lifetime, construction, overnight costs and utilization hours
+LCOE_DEPENDENCIES = {
+    "investment_factor": ("discount_rate", "escalation_rate", "construction_time"),
+    "recovery_factor": ("discount_rate", "lifetime"),
+    "decommissioning_factor": ("lifetime",),
+    "CAPITAL": ("overnight_costs", "investment_factor", "recovery_factor", "utilization_hours"),
+    "FOM": ("FOM_costs", "utilization_hours"),
+    "VOM": ("VOM_costs", "utilization_hours"),
+    "FUEL": ("fuel_cycle_costs", "utilization_hours"),
+    "DECOMMISSIONING": ("overnight_costs", "decommissioning_factor", "utilization_hours"),
+    "LCOE": ("CAPITAL", "FOM", "VOM", "FUEL", "DECOMMISSIONING"),
+}
+
+# functions of the nodes of LCOE_DEPENDENCIES with the same operations of compute_LCOE() (so the same results)
+# the financial factors are called by name, so they use the cache and the instrumentation
+LCOE_NODE_FUNCTIONS = {
+    "investment_factor": lambda discount_rate, escalation_rate, construction_time: investment_factor(discount_rate, escalation_rate, construction_time),
+    "recovery_factor": lambda discount_rate, lifetime: recovery_factor(discount_rate, lifetime),
+    "decommissioning_factor": lambda lifetime: decommissioning_factor(lifetime),
+    "CAPITAL": lambda overnight_costs, investment, recovery, utilization_hours: round(overnight_costs * investment * 1000 * recovery / utilization_hours, 2),
+    "FOM": lambda FOM_costs, utilization_hours: round(FOM_costs * 1000 / utilization_hours, 2),
+    "VOM": lambda VOM_costs, utilization_hours: round(VOM_costs * 1000 / utilization_hours, 2),
+    "FUEL": lambda fuel_cycle_costs, utilization_hours: round(fuel_cycle_costs * 1000 / utilization_hours, 2),
+    "DECOMMISSIONING": lambda overnight_costs, decommissioning, utilization_hours: round(overnight_costs * decommissioning * 1000 / utilization_hours, 2),
+    "LCOE": lambda CAPITAL, FOM, VOM, FUEL, DECOMMISSIONING: round(CAPITAL + FOM + VOM + FUEL + DECOMMISSIONING, 2),
+}
+
+# @return tuple of the nodes of LCOE_DEPENDENCIES that depend (directly or not) on @input names (frozenset of parameters), in evaluation order
+# example: dependent_nodes(frozenset(["FOM_costs"])) -> ("FOM", "LCOE")
+@lru_cache(maxsize = None)
+def dependent_nodes(names):
+    changed = set(names)
+    nodes = []
+    for node, inputs in LCOE_DEPENDENCIES.items():
+        if(changed.intersection(inputs)):
+            changed.add(node)
+            nodes.append(node)
+    return tuple(nodes)
+
+# True if @input a and @input b are the same value of the same type (70 and 70.0 are printed differently)
+def same_value(a, b):
+    return type(a) is type(b) and a == b
+
+# calculate and print Levelized Cost Of Electricity [$/MWh], see compute_LCOE()
+# @output print LCOE breakdown or just LCOE based on the @input only_result [default = False]
+# @input quiet: do not print anything [default = False]
+# @return LCOE_Result
+def LCOE_calculator(capacity, lifetime, utilization_hours, construction_time, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs, only_result = False, quiet = False): # O_M_costs
+    result = compute_LCOE(capacity, lifetime, utilization_hours, construction_time, discount_rate, escalation_rate, overnight_costs, fuel_cycle_costs, FOM_costs, VOM_costs)
+    if(not quiet):
+        result.print_result(only_result = only_result)
+    return result
+
+
+# class for name, unit of measurement and value of parameters
+class Parameter:
+    def __init__(self, name, unit_of_measurement, value):
+        self.name = name
+        self.unit_of_measurement = unit_of_measurement
+        self.value = value   
+    
+    def edit_value(self, new_value):
+        if (type(self.value) is int):
+            self.value = round(new_value)
+        else: self.value = new_value
+    
+    # functions for print the parameter with 3 different format
+    def print_name(self):
+        if(self.unit_of_measurement == ""):
+            return f"{self.name}"
+        else:
+            return f"{self.name} [{self.unit_of_measurement}]"
+    def print_value(self):
+        if(self.unit_of_measurement == ""):
+            return f"{self.name}: {self.value}"
+        else:
+            return f"{self.name}: {self.value} [{self.unit_of_measurement}]"
+    
+    def print_only_value(self):
+        if(self.unit_of_measurement == ""):
+            return f"{self.value}"
+        else:
+            return f"{self.value} [{self.unit_of_measurement}]"
+    
+
+# create object Reactor
+# all @var are object of the Parameter class
+# has method for edit parameters, calculate LCOE, use default design or scenario/region/year
+class Reactor:
+    def __init__(self, capacity = Parameter(name = "Capacity", unit_of_measurement = "MW", value = int(1000)), lifetime = Parameter(name = "Lifetime", unit_of_measurement = "year", value = int(60)), 
+                 utilization_hours = Parameter(name = "Utilization Hours", unit_of_measurement = "h", value = int(7884)), construction_time = Parameter(name = "Construction Time", unit_of_measurement = "year", value = int(7)), 
+                 discount_rate = Parameter(name = "Discout Rate ", unit_of_measurement = "", value = float(0.07)), escalation_rate = Parameter(name = "Escalation Rate ", unit_of_measurement = "", value = float(0.01)),
+                 overnight_costs = Parameter(name = "Overnight Construction Costs", unit_of_measurement = "$/kW", value = int(4000)), fuel_cycle_costs = Parameter(name = "Fuel Cycle Costs", unit_of_measurement = "$/kW y", value = float(70)), 
+                 FOM_costs = Parameter(name = "Fix Operation and Maintainance costs", unit_of_measurement = "$/kW y", value = float(112)), VOM_costs = Parameter(name = "Variable Operation and Maintainance costs", unit_of_measurement = "$/kW y", value = float(13))):
+                 # O_M_costs = Parameter(name ="Operation and Maintenance costs", unit_of_measurement = "$/kW", value = 125)
+        self.capacity = copy.deepcopy(capacity)
+        self.lifetime = copy.deepcopy(lifetime)
+        self.utilization_hours = copy.deepcopy(utilization_hours)
+        self.construction_time = copy.deepcopy(construction_time)
+        self.discount_rate = copy.deepcopy(discount_rate)
+        self.escalation_rate = copy.deepcopy(escalation_rate)
+        self.overnight_costs = copy.deepcopy(overnight_costs)
+        self.fuel_cycle_costs = copy.deepcopy(fuel_cycle_costs)
+        self.FOM_costs = copy.deepcopy(FOM_costs)
+        self.VOM_costs = copy.deepcopy(VOM_costs)
+        # self.O_M_costs = copy.deepcopy(O_M_costs)
+        self.list_value = [value for key, value in self.__dict__.items()]
+        self.list_print = [value.print_value() for value in self.list_value] # parameters formatting for print the list
+        self.printed_values = [value.value for value in self.list_value] # values formatted in list_print, see refresh_print()
+        self.LCOE_values = {} # parameters and nodes of LCOE_DEPENDENCIES of the last LCOE, see LCOE_result()
+        self.choose_CF_UH = 0
+        self.edit_total_O_M_done = False
+  
+    # @input if edit_all == True -> edit all parameters
+    def edit_parameter(self, edit_all = False):
+        list_name = [value.print_name() for value in self.list_value] # name of parameters
+        if(edit_all): # edit all parameters
+            for parameter in range(0,len(list_name)):
+                if(parameter == 2): # edit CF or UH
+                    self.utilization_hours.edit_value(self.ask_CF_UH())
+                    print(f"Value updated:\n{self.list_value[parameter].print_value()}\n")
+                    continue
+                elif(parameter == 7): # edit Fuel costs may need a calibration
+                    self.fuel_cycle_costs.edit_value(float(input(f"Digit the value for {list_name[parameter]}: ")))
+                    calibration = self.calibration("Fuel")
+                    self.fuel_cycle_costs.edit_value(round(self.fuel_cycle_costs.value*calibration))
+                    print(f"Value updated:\n{self.list_value[parameter].print_value()}\n")
+                    continue
+                elif(parameter == 8): # edit FOM or O_M
+                    edit_total = yes_no_input(input(f"Do you want to edit total Operation and Maintenance? [y/n]: "))
+                    if(edit_total):
+                        self.O_M_breakdown(O_M_costs = float(input(f"Digit the value for total Operation and Maintenance [$/kW y]: ")))
+                        print(f"Values updated:\n{self.list_value[8].print_value()}\n{self.list_value[9].print_value()}\n")
+                        break
+                elif(parameter == 9): 
+                    self.VOM_costs.edit_value(float(input(f"Digit the value for Variable Operation and Maintainance costs [$/kW y]: ")))
+                    calibration = self.calibration("VOM")
+                    self.VOM_costs.edit_value(round(self.VOM_costs.value*calibration))
+                    print(f"Value updated:\n{self.list_value[parameter].print_value()}\n")
+                    break
+                self.list_value[parameter].edit_value(float(input(f"Digit the new value for {list_name[parameter]}: ")))
+                print(f"Value updated:\n{self.list_value[parameter].print_value()}\n")
+            pass
+        else: # edit a single parameter
+            end = False
+            while(not end): 
+                print(f"\nWhat parameter do you want to edit?")
+                print_list(self.list_print) # print current parameters
+                print(f"FOM and VOM can be edited individually or you can provide the total costs of Operation and Maintenance and there will be an approximation of the breakdown (the approximation is godd for CF>=80%)")
+                parameter = int(input(f"\nDigit the associated number and press Enter: "))
+                if(parameter in [9,10]): # edit FOM, VOM or O_M
+                    if(not self.edit_total_O_M_done):
+                        edit_total = yes_no_input(input(f"Do you want to edit total Operation and Maintenance? [y/n]: "))
+                        self.edit_total_O_M_done = True
+                        if(edit_total):
+                            self.O_M_breakdown(O_M_costs = float(input(f"Digit the value for total Operation and Maintenance [$/kW y]: ")))
+                    elif(parameter == 9):
+                        self.FOM_costs.edit_value(float(input(f"Digit the value for Fix Operation and Maintainance costs [$/kW y]: ")))
+                    elif(parameter == 10): 
+                        self.VOM_costs.edit_value(float(input(f"Digit the value for Variable Operation and Maintainance costs [$/kW y]: ")))
+                        calibration = self.calibration("VOM")
+                        self.VOM_costs.edit_value(round(self.VOM_costs.value*calibration))
+                    print(f"Values updated:\n{self.list_value[8].print_value()}\n{self.list_value[9].print_value()}\n")
+                elif(parameter == 3): # edit CF or UH
+                    self.utilization_hours.edit_value(self.ask_CF_UH())
+                    print(f"Value updated:\n{self.list_value[parameter - 1].print_value()}\n")
+                elif(parameter == 8): # edit Fuel costs may need a calibration
+                    self.fuel_cycle_costs.edit_value(float(input(f"Digit the value for {list_name[parameter - 1]}: ")))
+                    calibration = self.calibration("Fuel")
+                    self.fuel_cycle_costs.edit_value(round(self.fuel_cycle_costs.value*calibration))
+                    print(f"Value updated:\n{self.list_value[parameter - 1].print_value()}\n")
+                else:
+                    self.list_value[parameter - 1].edit_value(float(input(f"Digit the new value for {list_name[parameter - 1]}: ")))
+                    print(f"Value updated:\n{self.list_value[parameter - 1].print_value()}\n")
+                self.refresh_print() # update list for print update
+                end = not yes_no_input(input(f"Do you want to edit more parameters? [y/n]: "))
+        # the new reactor starts from the LCOE values of this one: its first LCOE recomputes only the components
+        # that depend on the edited parameters
+        reactor = Reactor(*self.list_value)
+        reactor.LCOE_values = dict(self.LCOE_values)
+        return reactor
+    
+    # function dedicated to ask Capacity Factor or Utilization Hours
+    # @return Utilization Hours
+    def ask_CF_UH(self):
+        if(self.choose_CF_UH == 0): # do not ask every time and preserv user choice
+            print(f"Do you want to enter Capacity Factor or Utilization Hours?: ")
+            print_list(["Capacity Factor","Utilization Hours"])
+            self.choose_CF_UH = int(input(f"Digit the associated number and press Enter: "))
+        if(self.choose_CF_UH == 1):
+            CF = float(input(f"Digit the value for Capacity Factor: "))
+            alert = (CF>1)
+            while(alert):
+                CF = float(input(f"Attention you entered a Capacity Factor > 1, please re-enter it correctly: "))
+                alert = (CF>1)
+            utilization_hours = round(CF*365*24)
+        else:
+            utilization_hours = int(input(f"Digit the value for Utilization Hours: "))
+        return utilization_hours
+    
+    # function for when the CF or UH influence a parameter
+    # @input make_decision for directly choose "skip" [decision = 3]
+    # @return the recalibraction factor
+    def calibration(self, parameter, make_decision = True):
+        if(make_decision):
+            print("\nThe Capacity Factor and so the value of Utilization Hours influence "+parameter+", now it's: "+self.utilization_hours.print_only_value()+", do you want to:")
+            print_list(["edit the UH or CF", "enter for which UH or CF the inserted "+parameter+" is calculated and have it recalculated automatically according to the current CF", "skip"])
+            decision = int(input(f"Digit the associated number and press Enter: "))
+        else:
+            decision = 3
+        calibration = 1
+        if(decision == 1):
+            self.utilization_hours.edit_value(self.ask_CF_UH())
+            print(f"Value updated:\n{self.utilization_hours.print_value()}\n")
+        elif(decision == 2):
+            UH_used = self.ask_CF_UH()
+            calibration = self.utilization_hours.value / UH_used
+        return calibration
+    
+    # function for breakdown O&M costs in FOM and VOM
+    # @input O&M costs value
+    # @input calibration_decision for automatic calculation of breakdown without other input
+    # paramteres are uptdated inside the function
+    def O_M_breakdown(self, O_M_costs, calibration_decision = True):
+        calibration = self.calibration("O&M", make_decision = calibration_decision)
+        # at CF >= 80% VOM is approsively 1/9 of FOM
+        self.FOM_costs.edit_value(round(O_M_costs/10*9))
+        self.VOM_costs.edit_value(round(O_M_costs/10*calibration))
+        
+    #def convert_MWh_kW(self, value_MWh): ## to be added
+    #    pass
+    
+    # edit the parameter @input name (one of PARAMETER_NAMES) with @input value without asking anything
+    # only its formatted string is updated and only the LCOE components that depend on it are recomputed
+    # example: reactor.set_parameter("discount_rate", 0.05).LCOE_calculator()
+    # @return self, so edits can be chained
+    def set_parameter(self, name, value):
+        if(name not in PARAMETER_NAMES):
+            raise ValueError(f"Unknown parameter {name!r}, it has to be one of {PARAMETER_NAMES}")
+        getattr(self, name).edit_value(value)
+        self.refresh_print()
+        return self
+    
+    # format again the parameters whose value changed since list_print was built
+    def refresh_print(self):
+        for i, value in enumerate(self.list_value):
+            if(not same_value(value.value, self.printed_values[i])):
+                self.list_print[i] = value.print_value()
+                self.printed_values[i] = value.value
+    
+    # LCOE with the current parameters, only the nodes of LCOE_DEPENDENCIES that depend on the parameters
+    # changed since the last call are recomputed (all of them at the first call)
+    # @return LCOE_Result, the same of compute_LCOE()
+    def LCOE_result(self):
+        values = self.parameter_values()
+        values["lifetime"] = round(values["lifetime"])
+        values["construction_time"] = round(values["construction_time"])
+        changed = frozenset(name for name, value in values.items() if name not in self.LCOE_values or self.LCOE_values[name] != value)
+        if(changed):
+            self.LCOE_values.update(values)
+            for node in dependent_nodes(changed):
+                self.LCOE_values[node] = LCOE_NODE_FUNCTIONS[node](*[self.LCOE_values[name] for name in LCOE_DEPENDENCIES[node]])
+        return LCOE_Result(*[self.LCOE_values[component] for component in LCOE_COMPONENTS])
+    
+    # function for calculate and print LCOE with current parameters, see LCOE_result()
+    # @input only_result and quiet as in LCOE_calculator()
+    # @return LCOE_Result
+    def LCOE_calculator(self, only_result = False, quiet = False):
+        result = self.LCOE_result()
+        if(not quiet):
+            result.print_result(only_result = only_result)
+        return result
+    
+    def default_design(self): # use default design
+        from .designs import Reactor_Design, design_registry
+        self.design_list = design_registry().names()
+        print(f"Select the design: ")
+        print_list(self.design_list)
+        return Reactor_Design(design_name = self.design_list[int(input(f"Digit the associated number and press Enter: "))-1])
+    
+    def default_region_LCOE(self): # use default region with LCOE already calculated by IEA
+        from .regions import Reactor_Region_LCOE
+        self.scenario_list = ["Net Zero by 2050", "Announced Pledges", "Stated Policies", "Multi-Scenario"]
+        self.region_list = ["United States", "European Union", "China", "India", "Multi-Region"]
+        self.year_list = ["2021", "2030", "2050", "Multi-Year"]
+        print(f"\nSelect the scenario: ")
+        print_list(self.scenario_list)
+        scenario = self.scenario_list[int(input(f"Digit the associated number and press Enter: "))-1]
+        print(f"\nSelect the region: ")
+        print_list(self.region_list)
+        region = self.region_list[int(input(f"Digit the associated number and press Enter: "))-1]
+        print(f"\nSelect the year: ")
+        print_list(self.year_list)
+        year = self.year_list[int(input(f"Digit the associated number and press Enter: "))-1]
+        print("")
+        return Reactor_Region_LCOE(scenario_name = scenario, region_name = region, year_name = year)
+    
+    # print a table with the LCOE of every combination of the values in @input grid, see LCOE_sweep()
+    # example: reactor.multiple_options(discount_rate = [0.03, 0.07, 0.1])
+    # @return the dictionary of LCOE_sweep()
+    def multiple_options(self, **grid):
+        from .batch import LCOE_sweep
+        result = LCOE_sweep(self, **grid)
+        names = [getattr(self, name).print_name() for name in grid]
+        rows = [[f"{result[name][i]:g}" for name in grid] + [f"{result['LCOE'][i]:.2f}"] for i in range(len(result["LCOE"]))]
+        print(format_table(names + ["LCOE [$/MWh]"], rows))
+        return result
+    
+    # @return value of @input parameter that gives the @input target LCOE [$/MWh] with the other parameters unchanged, see break_even()
+    # example: reactor.break_even("overnight_costs", 70)
+    def break_even(self, parameter, target):
+        from .inverse import break_even
+        return float(break_even(self, parameter, target).value[0])
+
+    # @return dictionary {name: value} of the parameters with the names of PARAMETER_NAMES
+    def parameter_values(self):
+        return {name: getattr(self, name).value for name in PARAMETER_NAMES}
+    
+    def __repr__(self): # return a string with the reactor parameters in their value format
+        self.refresh_print()
+        return print_list(self.list_print, input_index = ["●"]*len(self.list_print), sep = " " ,string = True)
@@ -0,0 +1,127 @@
+import csv
+import json
+import os
+from functools import lru_cache
+import numpy as np
+from .core import LCOE_COMPONENTS, PARAMETER_NAMES, Reactor, parse_number, print_list
+from .table import Table
+from .batch import LCOE_batch_calculator
+
+## designs:
+
+# catalog of reactor designs, one entry for every design name
+# the catalog files are csv (lines starting with # are comments) or json (list of objects or {name: object})
+# every entry can have capacity_factor, O_M_costs and any of PARAMETER_NAMES, the other parameters keep the Reactor() defaults
+DESIGN_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "IEA_PCGE_2020_designs.csv")
+DESIGN_FIELDS = PARAMETER_NAMES + ("capacity_factor", "O_M_costs")
+
+class Design_Registry:
+    def __init__(self, paths = (DESIGN_DATA_FILE,)):
+        self.designs = {}
+        for path in paths:
+            self.load(path)
+    
+    def __len__(self):
+        return len(self.designs)
+    
+    def __contains__(self, name):
+        return name in self.designs
+    
+    # add the designs of a catalog file, designs with the same name are replaced
+    def load(self, path):
+        with open(path, newline = "") as file:
+            if(path.lower().endswith(".json")):
+                entries = json.load(file)
+                if(isinstance(entries, dict)):
+                    entries = [dict(entry, design = name) for name, entry in entries.items()]
+            else:
+                entries = list(csv.DictReader(line for line in file if not line.startswith("#")))
+        for entry in entries:
+            entry = dict(entry)
+            name = entry.pop("design")
+            self.register(name, **{field: parse_number(value) if isinstance(value, str) else value for field, value in entry.items() if value not in ("", None)})
+    
+    # add or replace the design @input name with the catalog @input values
+    def register(self, name, **values):
+        for field in values:
+            if(field not in DESIGN_FIELDS):
+                raise ValueError(f"Unknown field {field!r} for design {name!r}, it has to be one of {DESIGN_FIELDS}")
+        self.designs[name] = values
+    
+    def names(self):
+        return list(self.designs)
+    
+    # @return dictionary {name: value} of the parameters set by the design (only the ones in the catalog)
+    # capacity factor is converted in utilization hours and O&M costs are split in FOM and VOM like Reactor.O_M_breakdown()
+    def design_values(self, name):
+        if(name not in self.designs):
+            raise ValueError(f"Unknown design {name!r}, designs are {self.names()}")
+        entry = self.designs[name]
+        values = {field: value for field, value in entry.items() if field in PARAMETER_NAMES}
+        if("capacity_factor" in entry):
+            values["utilization_hours"] = round(entry["capacity_factor"]*365*24)
+        if("O_M_costs" in entry):
+            values["FOM_costs"] = round(entry["O_M_costs"]/10*9)
+            values["VOM_costs"] = round(entry["O_M_costs"]/10)
+        return values
+    
+    # @return dictionary {name: array} with all the PARAMETER_NAMES for the designs @input names [default = all]
+    def parameter_arrays(self, names = None):
+        names = self.names() if names is None else names
+        default = Reactor().parameter_values()
+        rows = [dict(default, **self.design_values(name)) for name in names]
+        return {parameter: np.array([row[parameter] for row in rows], dtype = np.float64) for parameter in PARAMETER_NAMES}
+
+# the registry is created at the first use with the IEA designs and the catalogs in the environment variable
+# LCOE_DESIGN_CATALOGS (paths separated by os.pathsep), more catalogs can be added with design_registry().load(path)
+@lru_cache(maxsize = None)
+def design_registry():
+    paths = [DESIGN_DATA_FILE] + [path for path in os.environ.get("LCOE_DESIGN_CATALOGS", "").split(os.pathsep) if path]
+    return Design_Registry(paths)
+
+# LCOE of every design, or of every design x discount rate x capacity factor, in one batch evaluation
+# @input names: designs to compare [default = all the designs of design_registry()]
+# @input discount_rates, capacity_factors: lists of values that replace the design values [default = design values]
+# @return Table ranked by LCOE with design, discount rate, capacity factor, utilization hours and LCOE_COMPONENTS
+def compare_designs(names = None, discount_rates = None, capacity_factors = None):
+    registry = design_registry()
+    names = registry.names() if names is None else list(names)
+    parameters = registry.parameter_arrays(names)
+    # open grid designs x discount rates x capacity factors
+    parameters = {name: values[:, None, None] for name, values in parameters.items()}
+    if(discount_rates is not None):
+        parameters["discount_rate"] = np.asarray(discount_rates, dtype = np.float64)[None, :, None]
+    if(capacity_factors is not None):
+        parameters["utilization_hours"] = np.rint(np.asarray(capacity_factors, dtype = np.float64) * 365 * 24)[None, None, :]
+    components = LCOE_batch_calculator(**parameters, factorise = True)
+    shape = components["LCOE"].shape
+    columns = {"design": np.broadcast_to(np.array(names)[:, None, None], shape).ravel()}
+    columns["discount_rate"] = np.broadcast_to(parameters["discount_rate"], shape).ravel()
+    columns["utilization_hours"] = np.broadcast_to(parameters["utilization_hours"], shape).ravel()
+    columns["capacity_factor"] = np.round(columns["utilization_hours"] / (365 * 24), 4)
+    columns.update({component: components[component].ravel() for component in LCOE_COMPONENTS})
+    table = Table(columns).sort("LCOE")
+    table.columns["rank"] = np.arange(1, len(table) + 1)
+    return table
+
+# sub class of Reactor for use default design
+# data from [1] Capacity Factor is set to 85% because data are provided whit this CF
+# the designs are in design_registry(), other designs can be added with catalog files
+# @var design_name (string) the name of the design
+class Reactor_Design(Reactor):
+    def __init__(self, design_name, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.design_name = design_name
+        self.assign_design()
+    
+    # assign the values of the selected design
+    # values have been previously converted in $/kW 
+    def assign_design(self):
+        for name, value in design_registry().design_values(self.design_name).items():
+            getattr(self, name).edit_value(value)
+        self.refresh_print() # update list for print update
+    
+    def __repr__(self): # return a string with the reactor parameters in their value format and the design name
+        self.refresh_print()
+        return f"Design: {self.design_name}\nParameters:\n"+print_list(self.list_print, input_index = ["●"]*len(self.list_print), sep = " " ,string = True)
+ 
@@ -0,0 +1,167 @@
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+from .core import LCOE_COMPONENTS, LCOE_DEPENDENCIES, PARAMETER_NAMES, Parameter, Reactor, dependent_nodes, format_table
+from .batch import LCOE_NODE_FUNCTIONS_BATCH, LCOE_batch_calculator
+from .compact import COMPACT_DTYPES, compact_array
+
+## reactor fleet:
+
+# description of the parameter columns, taken once from the defaults of Reactor()
+# @return tuple of Column_Schema(attribute, name, unit_of_measurement, dtype, default) in the order of PARAMETER_NAMES
+Column_Schema = namedtuple("Column_Schema", ("attribute", "name", "unit_of_measurement", "dtype", "default"))
+
+@lru_cache(maxsize = None)
+def parameter_schema():
+    reactor = Reactor()
+    return tuple(Column_Schema(name, getattr(reactor, name).name, getattr(reactor, name).unit_of_measurement, np.dtype(np.int32) if type(getattr(reactor, name).value) is int else np.dtype(np.float64), getattr(reactor, name).value) for name in PARAMETER_NAMES)
+
+# many reactors stored as one typed numpy column for every parameter (structure of arrays)
+# names and units are kept once in parameter_schema(), formatted strings are built only when a reactor is displayed
+# @var columns dictionary {name: array} with the keys of PARAMETER_NAMES
+# @var compact: columns and results stored with COMPACT_DTYPES (narrower types, the LCOE is still computed in float64)
+# @var integer_rows: {name: True or boolean array} rows of the float columns that were given as python int (e.g. the costs
+#                    of a design), parameter_values() gives them back as int like the integer parameters of the schema
+class Reactor_Fleet:
+    def __init__(self, columns, compact = False, integer_rows = None):
+        self.compact = compact
+        self.columns = {}
+        self.integer_rows = dict(integer_rows or {})
+        for column in parameter_schema():
+            values = np.asarray(columns[column.attribute])
+            if(column.dtype.kind == "f" and values.dtype.kind in "iu"):
+                self.integer_rows[column.attribute] = True
+            if(compact):
+                self.columns[column.attribute] = compact_array(column.attribute, values)
+                continue
+            if(column.dtype.kind == "i" and values.dtype.kind == "f"):
+                values = np.rint(values) # like Parameter.edit_value() for integer parameters
+            self.columns[column.attribute] = np.asarray(values, dtype = column.dtype)
+        lengths = {len(values) for values in self.columns.values()}
+        if(len(lengths) != 1):
+            raise ValueError(f"All the columns must have the same length, lengths are {sorted(lengths)}")
+        self.LCOE_nodes = None # nodes of LCOE_DEPENDENCIES kept up to date by edit(), see tracked_LCOE()
+        self.edited_columns = set() # columns already copied by edit(), the others can be shared with the caller
+    
+    # bulk creation from arrays, the parameters not given (or given as scalars) are repeated for every reactor
+    # @input size: number of reactors, needed only if all the parameters are scalars
+    @classmethod
+    def from_arrays(cls, size = None, compact = False, **arrays):
+        for name in arrays:
+            if(name not in PARAMETER_NAMES):
+                raise ValueError(f"Unknown parameter {name!r}, it has to be one of {PARAMETER_NAMES}")
+        if(size is None):
+            size = max((np.size(values) for values in arrays.values() if np.ndim(values) > 0), default = 1)
+        columns = {}
+        for column in parameter_schema():
+            values = arrays.get(column.attribute, column.default)
+            columns[column.attribute] = values if np.ndim(values) > 0 else np.full(size, compact_array(column.attribute, values) if compact else values)
+        return cls(columns, compact = compact)
+    
+    @classmethod
+    def from_reactors(cls, reactors, compact = False):
+        columns = {name: [getattr(reactor, name).value for reactor in reactors] for name in PARAMETER_NAMES}
+        integer_rows = {name: np.array([type(value) is int for value in values], dtype = bool) for name, values in columns.items()}
+        return cls(columns, compact = compact, integer_rows = {name: rows for name, rows in integer_rows.items() if rows.any()})
+    
+    def __len__(self):
+        return len(self.columns[PARAMETER_NAMES[0]])
+    
+    def __getitem__(self, name):
+        return self.columns[name]
+    
+    # memory used by the columns [bytes]
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+    
+    # @return dictionary {name: value} of the reactor @input index with python int and float like Reactor.parameter_values()
+    # the integer parameters of the schema and the integer_rows are int (also when stored as float in compact mode)
+    def parameter_values(self, index):
+        values = {}
+        for column in parameter_schema():
+            value = self.columns[column.attribute][index]
+            rows = self.integer_rows.get(column.attribute)
+            values[column.attribute] = int(value) if column.dtype.kind == "i" or rows is True or (rows is not None and rows[index]) else value.item()
+        return values
+    
+    # @return the reactor @input index as a Reactor object
+    def to_reactor(self, index):
+        values = self.parameter_values(index)
+        return Reactor(*[Parameter(name = column.name, unit_of_measurement = column.unit_of_measurement, value = values[column.attribute]) for column in parameter_schema()])
+    
+    def to_reactors(self):
+        return [self.to_reactor(index) for index in range(len(self))]
+    
+    # @return a new fleet with the reactors @input indexes (integer array, slice or boolean mask)
+    def take(self, indexes):
+        integer_rows = {name: rows if rows is True else rows[indexes].copy() for name, rows in self.integer_rows.items()}
+        return Reactor_Fleet({name: values[indexes] for name, values in self.columns.items()}, compact = self.compact, integer_rows = integer_rows)
+    
+    # @return list of strings with the parameters of the reactor @input index, like Reactor.list_print
+    def list_print(self, index):
+        values = self.parameter_values(index)
+        return [Parameter(column.name, column.unit_of_measurement, values[column.attribute]).print_value() for column in parameter_schema()]
+    
+    # LCOE of all the reactors with LCOE_batch_calculator(), the columns are used directly
+    # in compact mode the results are computed in float64 and stored as float32
+    # @return dictionary {component: array} with the keys of LCOE_COMPONENTS
+    def LCOE(self, rounded = True, factorise = False):
+        components = LCOE_batch_calculator(**self.columns, rounded = rounded, factorise = factorise)
+        if(self.compact):
+            return {component: values.astype(COMPACT_DTYPES[component]) for component, values in components.items()}
+        return components
+    
+    # LCOE of all the reactors kept up to date by edit(): computed in full at the first call, then every edit()
+    # recomputes only the nodes of LCOE_DEPENDENCIES that depend on the edited parameters and only for the edited reactors
+    # the values are the same of LCOE() (in float64 also in compact mode), the arrays are updated in place by edit()
+    # @return dictionary {component: array} with the keys of LCOE_COMPONENTS
+    def tracked_LCOE(self):
+        if(self.LCOE_nodes is None):
+            self.LCOE_nodes = {}
+            self.evaluate_nodes(dependent_nodes(frozenset(PARAMETER_NAMES)), slice(None))
+        return {component: self.LCOE_nodes[component] for component in LCOE_COMPONENTS}
+    
+    # evaluate @input nodes (in the order of LCOE_DEPENDENCIES) for the reactors @input rows
+    def evaluate_nodes(self, nodes, rows):
+        for node in nodes:
+            values = LCOE_NODE_FUNCTIONS_BATCH[node](*[self.LCOE_nodes[name][rows] if name in self.LCOE_nodes else self.columns[name][rows] for name in LCOE_DEPENDENCIES[node]])
+            if(node in self.LCOE_nodes):
+                self.LCOE_nodes[node][rows] = values
+            else:
+                self.LCOE_nodes[node] = np.array(values, dtype = np.float64)
+    
+    # what-if edit: set the parameters @input values ({name: scalar or array with one value for every edited reactor})
+    # of the reactors @input indexes (integer array, slice or boolean mask) [default = all the reactors]
+    # the cost is proportional to the edited reactors and to the nodes that depend on the edited parameters
+    # (a column is copied the first time it is edited, because it can be an array of the caller)
+    # example: fleet.edit(np.flatnonzero(fleet["lifetime"] > 60), discount_rate = 0.05)
+    # @return self
+    def edit(self, indexes = None, **values):
+        for name in values:
+            if(name not in PARAMETER_NAMES):
+                raise ValueError(f"Unknown parameter {name!r}, it has to be one of {PARAMETER_NAMES}")
+        rows = slice(None) if indexes is None else (indexes if isinstance(indexes, slice) else np.asarray(indexes))
+        for name, value in values.items():
+            kind = np.asarray(value).dtype.kind
+            if(name in self.integer_rows or kind in "iu"):
+                # the edited rows are integer only if the new values are
+                if(not isinstance(self.integer_rows.get(name), np.ndarray)):
+                    self.integer_rows[name] = np.full(len(self), name in self.integer_rows, dtype = bool)
+                self.integer_rows[name][rows] = kind in "iu"
+            value = compact_array(name, value) if self.compact else np.asarray(value)
+            if(self.columns[name].dtype.kind == "i" and value.dtype.kind == "f"):
+                value = np.rint(value) # like Parameter.edit_value() for integer parameters
+            if(name not in self.edited_columns):
+                self.columns[name] = self.columns[name].copy()
+                self.edited_columns.add(name)
+            self.columns[name][rows] = value
+        if(self.LCOE_nodes is not None):
+            self.evaluate_nodes(dependent_nodes(frozenset(values)), rows)
+        return self
+    
+    def __repr__(self): # return a string with the number of reactors and the first ones in a table
+        shown = min(len(self), 10)
+        header = [f"{column.name.strip()} [{column.unit_of_measurement}]" if column.unit_of_measurement else column.name.strip() for column in parameter_schema()]
+        rows = [[str(self.columns[name][index]) for name in PARAMETER_NAMES] for index in range(shown)]
+        return f"Reactor fleet: {len(self)} reactors\n" + format_table(header, rows) + ("...\n" if shown < len(self) else "")
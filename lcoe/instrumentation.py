@@ -0,0 +1,186 @@
+import copy
+import math
+import json
+import sys
+import time
+import importlib
+from functools import wraps
+import numpy as np
+from .core import financial_cache_info, format_table
+
+## instrumentation:
+
+# opt-in metrics of the hot paths: calls, rows, cumulative time, latency percentiles and cache hit rates
+# enable_instrumentation() replaces the functions and methods of INSTRUMENTED_STAGES with timed wrappers and
+# disable_instrumentation() puts the originals back, so when it is disabled the code runs unchanged (no overhead)
+# times are inclusive: a stage contains the stages it calls (e.g. "Reactor.__init__" contains "deepcopy")
+# only the calls of the current process are measured (not the ones in the Monte Carlo workers)
+# stage: (module, owner, attribute, rows of a call) with owner None for the functions of the module
+# a function is replaced in every loaded module of the package that imported it
+INSTRUMENTED_STAGES = {
+    "investment_factor": ("core", None, "investment_factor", None),
+    "recovery_factor": ("core", None, "recovery_factor", None),
+    "decommissioning_factor": ("core", None, "decommissioning_factor", None),
+    "compute_LCOE": ("core", None, "compute_LCOE", None),
+    "LCOE_batch_calculator": ("batch", None, "LCOE_batch_calculator", lambda result, args: np.size(result["LCOE"])),
+    "DCF_calculator": ("cashflow", None, "DCF_calculator", lambda result, args: np.size(result["LCOE"])),
+    "monte_carlo_chunk": ("montecarlo", None, "monte_carlo_chunk", lambda result, args: args[2]),
+    "Parameter.__init__": ("core", "Parameter", "__init__", None),
+    "Reactor.__init__": ("core", "Reactor", "__init__", None),
+    "deepcopy": ("core", "copy", "deepcopy", None),
+    "Design_Registry.design_values": ("designs", "Design_Registry", "design_values", None),
+    "Region_LCOE_Store.parameters": ("regions", "Region_LCOE_Store", "parameters", None),
+    "Region_LCOE_Store.cube": ("regions", "Region_LCOE_Store", "cube", lambda result, args: len(result)),
+    "print_list": ("core", None, "print_list", None),
+    "format_table": ("core", None, "format_table", None),
+    "Parameter.print_value": ("core", "Parameter", "print_value", None),
+    "evaluate_records": ("cli", None, "evaluate_records", lambda result, args: len(args[0])),
+    "write_records": ("cli", None, "write_records", lambda result, args: len(args[2])),
+}
+METRICS_BINS_PER_DECADE = 20 # latency histogram: 20 logarithmic bins for every factor 10, from 10 ns to 1000 s
+METRICS_MIN_LATENCY = 1e-8
+METRICS_BINS = 11 * METRICS_BINS_PER_DECADE
+
+# the module copy seen by this file while the instrumentation is enabled: copy.deepcopy is timed, the rest is the module copy
+class Timed_Copy:
+    def __init__(self, module):
+        self.module = module
+    
+    def __getattr__(self, name):
+        return getattr(self.module, name)
+
+# calls, rows, time and latency histogram of every stage
+# every instrumented call is recorded with record(), a snapshot is appended to @var dump_path every @var dump_interval seconds
+class Metrics:
+    def __init__(self, dump_path = None, dump_interval = 10.0):
+        self.stages = {}
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self.started = time.time()
+        self.last_dump = time.perf_counter()
+    
+    def record(self, stage, seconds, rows = 1):
+        metrics = self.stages.get(stage)
+        if(metrics is None):
+            metrics = self.stages[stage] = {"calls": 0, "rows": 0, "seconds": 0.0, "max_seconds": 0.0, "histogram": [0] * METRICS_BINS}
+        metrics["calls"] += 1
+        metrics["rows"] += rows
+        metrics["seconds"] += seconds
+        metrics["max_seconds"] = max(metrics["max_seconds"], seconds)
+        index = int(math.log10(seconds / METRICS_MIN_LATENCY) * METRICS_BINS_PER_DECADE) if seconds > METRICS_MIN_LATENCY else 0
+        metrics["histogram"][min(index, METRICS_BINS - 1)] += 1
+        if(self.dump_path is not None and time.perf_counter() - self.last_dump >= self.dump_interval):
+            self.dump()
+    
+    # @return latency [s] under which there are @input q percent of the calls of @input histogram (upper edge of the bin)
+    @staticmethod
+    def percentile(histogram, q):
+        target = q / 100 * sum(histogram)
+        cumulative = 0
+        for index, count in enumerate(histogram):
+            cumulative += count
+            if(count and cumulative >= target):
+                return METRICS_MIN_LATENCY * 10 ** ((index + 1) / METRICS_BINS_PER_DECADE)
+        return 0.0
+    
+    # @return dictionary (json serializable) with the metrics of every stage and the hit rates of the financial factors caches
+    def snapshot(self):
+        stages = {}
+        for stage, metrics in self.stages.items():
+            stages[stage] = {"calls": metrics["calls"], "rows": metrics["rows"], "seconds": metrics["seconds"], "mean_seconds": metrics["seconds"] / metrics["calls"],
+                             "p50_seconds": self.percentile(metrics["histogram"], 50), "p90_seconds": self.percentile(metrics["histogram"], 90),
+                             "p99_seconds": self.percentile(metrics["histogram"], 99), "max_seconds": metrics["max_seconds"],
+                             "rows_per_second": metrics["rows"] / metrics["seconds"] if metrics["seconds"] else 0.0}
+        return {"time": time.time(), "elapsed_seconds": time.time() - self.started, "stages": stages, "caches": financial_cache_info()}
+    
+    # append a snapshot as one json line to @var dump_path
+    def dump(self):
+        self.last_dump = time.perf_counter()
+        with open(self.dump_path, "a") as file:
+            file.write(json.dumps(self.snapshot()) + "\n")
+    
+    def __repr__(self):
+        rows = [[stage, metrics["calls"], metrics["rows"], f"{metrics['seconds']:.4f}", f"{metrics['p50_seconds']*1e6:.1f}", f"{metrics['p99_seconds']*1e6:.1f}"]
+                for stage, metrics in sorted(self.snapshot()["stages"].items(), key = lambda item: -item[1]["seconds"])]
+        return format_table(["Stage", "Calls", "Rows", "Time [s]", "p50 [us]", "p99 [us]"], rows)
+
+METRICS = None # Metrics of the enabled instrumentation
+INSTRUMENTED_ORIGINALS = [] # (namespace, attribute, original) to restore
+PACKAGE_NAMES = set() # names of the package namespace when the instrumentation is enabled, see disable_instrumentation()
+
+# @return timed wrapper of @input function that records its calls in METRICS as @input stage
+# a wrapper still referenced after disable_instrumentation() only calls @input function
+def timed(stage, function, rows = None):
+    clock = time.perf_counter
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if(METRICS is None):
+            return function(*args, **kwargs)
+        start = clock()
+        result = function(*args, **kwargs)
+        METRICS.record(stage, clock() - start, 1 if rows is None else rows(result, args))
+        return result
+    return wrapper
+
+# @return the modules of the package already imported
+def package_modules():
+    return [module for name, module in list(sys.modules.items()) if module is not None and (name == __package__ or name.startswith(__package__ + "."))]
+
+# replace @input attribute of @input namespace (module or class) with @input value, the original is saved to be restored
+def replace_attribute(namespace, attribute, value):
+    INSTRUMENTED_ORIGINALS.append((namespace, attribute, vars(namespace)[attribute]))
+    setattr(namespace, attribute, value)
+
+# start the instrumentation of INSTRUMENTED_STAGES (or of the stages in @input stages)
+# @input dump_path: json lines file where a snapshot is appended every @input dump_interval seconds [default = no dump]
+# @return Metrics
+def enable_instrumentation(stages = None, dump_path = None, dump_interval = 10.0):
+    global METRICS
+    if(METRICS is not None):
+        disable_instrumentation()
+    METRICS = Metrics(dump_path, dump_interval)
+    package = importlib.import_module(__package__)
+    package.warm_up(data = False) # all the modules are loaded, so all of them see the wrappers
+    PACKAGE_NAMES.update(vars(package))
+    for stage in (stages or INSTRUMENTED_STAGES):
+        module, owner, attribute, rows = INSTRUMENTED_STAGES[stage]
+        module = importlib.import_module(f".{module}", __package__)
+        if(owner == "copy"):
+            timed_copy = Timed_Copy(copy)
+            timed_copy.deepcopy = timed(stage, copy.deepcopy, rows)
+            replace_attribute(module, "copy", timed_copy)
+        elif(owner is None):
+            original = getattr(module, attribute)
+            wrapper = timed(stage, original, rows)
+            for loaded in package_modules():
+                for name, value in list(vars(loaded).items()):
+                    if(value is original):
+                        replace_attribute(loaded, name, wrapper)
+        else:
+            owner = getattr(module, owner)
+            replace_attribute(owner, attribute, timed(stage, vars(owner)[attribute], rows))
+    return METRICS
+
+# stop the instrumentation and restore the original functions, the last snapshot is dumped
+# the names that the package cached (lazy import) while the instrumentation was enabled can be wrappers: they are
+# removed, so the next use imports the original again
+# @return Metrics (None if the instrumentation was not enabled)
+def disable_instrumentation():
+    global METRICS
+    for namespace, attribute, original in reversed(INSTRUMENTED_ORIGINALS):
+        setattr(namespace, attribute, original)
+    INSTRUMENTED_ORIGINALS.clear()
+    package = sys.modules.get(__package__)
+    if(package is not None and PACKAGE_NAMES):
+        for name in set(vars(package)) - PACKAGE_NAMES:
+            if(name in package.MODULE_OF):
+                delattr(package, name)
+    PACKAGE_NAMES.clear()
+    metrics, METRICS = METRICS, None
+    if(metrics is not None and metrics.dump_path is not None):
+        metrics.dump()
+    return metrics
+
+# @return Metrics.snapshot() of the enabled instrumentation, None if it is disabled
+def metrics_snapshot():
+    return METRICS.snapshot() if METRICS is not None else None
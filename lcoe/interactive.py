@@ -0,0 +1,41 @@
+from .core import Reactor, print_list, yes_no_input
+
+## interactive calculator:
+
+# main function for the user interaction
+def main():
+    
+    #welcome
+    print("Welcome on nuclear LCOE calculator !")
+    new_reactor = Reactor() # create dafault reactor
+    print("\nDefault parameters:")
+    print(new_reactor) # print  default parameters
+    
+    # choose the customization
+    what_to_do = ["Use all default parameters", "Edit some parameters", "Customize all the parameters", 
+                  "Start from a default design (value from IEA Projected Costs of Generating Electricity 2020) (you will still be able to edit the parameters)", 
+                  "Use default Scenario, Geographic Region and Year (parameters and LCOE already calculated by IEA in World Energy Outlook 2022)"]
+    print("Select what to do:")
+    print_list(what_to_do)
+    customization = int(input(f"Digit the associated number and press Enter: "))
+    print("")
+    # editing of parameters
+    edit = False
+    if(customization == 3):
+        new_reactor = new_reactor.edit_parameter(edit_all = True)
+    elif(customization == 4):
+        new_reactor = new_reactor.default_design()
+        edit = yes_no_input(input(f"Do you want to edit some parameters? [y/n]: "))
+    elif(customization == 5):
+        new_reactor = new_reactor.default_region_LCOE()
+    if(customization == 2 or edit):
+        new_reactor = new_reactor.edit_parameter() 
+    if(not customization == 5):
+        # print final parameters and LCOE
+        what_customization = ["default reactor", "customizated reactor", "totally customizated reactor", 
+                              "{new_reactor.design_name} design", "{new_reactor.region_name} region"]
+        print(f"\nFinal values for {what_customization[customization-1]}: ")
+        print(new_reactor)
+        new_reactor.LCOE_calculator()
+    else:
+        print(new_reactor)
@@ -0,0 +1,129 @@
+import numpy as np
+from .core import format_table
+from .batch import LCOE_batch_calculator
+from .sensitivity import LCOE_gradient_batch, parameter_arrays
+
+## inverse solver:
+
+# break-even value of one parameter for a target LCOE, for many reactors at once
+# the LCOE is linear in overnight, fuel, FOM and VOM costs and inversely proportional to the utilization hours:
+# they are solved in closed form from two evaluations of LCOE_batch_calculator()
+# the LCOE grows with discount and escalation rate: they are solved with Newton steps (exact derivative of
+# LCOE_gradient_batch()) kept inside a bracket that is halved when the Newton step falls outside it
+# the target is the unrounded LCOE, the rounding to the cent of LCOE_calculator() is not inverted
+LINEAR_PARAMETERS = ("overnight_costs", "fuel_cycle_costs", "FOM_costs", "VOM_costs")
+ITERATIVE_PARAMETERS = ("discount_rate", "escalation_rate")
+INVERSE_BOUNDS = {"discount_rate": (0.0, 1.0), "escalation_rate": (-0.5, 1.0)}
+
+# @var value array of break-even values (NaN where there is no solution)
+# @var converged boolean array, @var iterations array with the iterations of every reactor
+# @var residual array of LCOE(value) - target [$/MWh]
+class Inverse_Result:
+    def __init__(self, parameter, value, converged, iterations, residual, newton_steps = 0, bisection_steps = 0):
+        self.parameter = parameter
+        self.value = value
+        self.converged = converged
+        self.iterations = iterations
+        self.residual = residual
+        self.newton_steps = newton_steps
+        self.bisection_steps = bisection_steps
+    
+    def __len__(self):
+        return len(self.value)
+    
+    # @return dictionary with the convergence statistics
+    def statistics(self):
+        converged = self.converged
+        return {"reactors": len(self), "converged": int(np.count_nonzero(converged)), "failed": int(np.count_nonzero(~converged)),
+                "max_iterations": int(self.iterations.max(initial = 0)), "mean_iterations": float(self.iterations.mean()) if len(self) else 0.0,
+                "newton_steps": self.newton_steps, "bisection_steps": self.bisection_steps,
+                "max_residual": float(np.abs(self.residual[converged]).max(initial = 0))}
+    
+    def __repr__(self):
+        return f"Break-even {self.parameter}:\n" + format_table(["Statistic", "Value"], [[name, f"{value:g}" if isinstance(value, float) else str(value)] for name, value in self.statistics().items()])
+
+# solve the @input parameter for the @input target LCOE [$/MWh] of @input reactors, see parameter_arrays()
+# @input parameter: one of LINEAR_PARAMETERS, ITERATIVE_PARAMETERS, "utilization_hours" or "capacity_factor"
+# @input target: scalar or array broadcast with the reactors
+# @input tolerance: maximum |LCOE - target| [$/MWh] of the iterative solver [default = 1e-6]
+# @input bounds: (low, high) of the search for the rates [default = INVERSE_BOUNDS]
+# @return Inverse_Result, the reactors whose target is outside the possible LCOE (e.g. negative costs) are not converged
+def break_even(reactors, parameter, target, tolerance = 1e-6, max_iterations = 100, bounds = None):
+    parameters = parameter_arrays(reactors)
+    parameters["lifetime"] = np.rint(parameters["lifetime"])
+    parameters["construction_time"] = np.rint(parameters["construction_time"])
+    target = np.asarray(target, dtype = np.float64)
+    shape = np.broadcast_shapes(parameters["capacity"].shape, target.shape)
+    parameters = {name: np.broadcast_to(value, shape).ravel() for name, value in parameters.items()}
+    target = np.broadcast_to(target, shape).ravel()
+    if(parameter in LINEAR_PARAMETERS or parameter in ("utilization_hours", "capacity_factor")):
+        return break_even_closed_form(parameters, parameter, target)
+    if(parameter in ITERATIVE_PARAMETERS):
+        return break_even_iterative(parameters, parameter, target, tolerance, max_iterations, bounds or INVERSE_BOUNDS[parameter])
+    raise ValueError(f"Break-even of {parameter!r} is not available, it has to be one of {LINEAR_PARAMETERS + ITERATIVE_PARAMETERS + ('utilization_hours', 'capacity_factor')}")
+
+# LCOE = slope * value + intercept for the linear costs, LCOE = constant / utilization_hours for the utilization hours
+def break_even_closed_form(parameters, parameter, target):
+    name = "utilization_hours" if parameter == "capacity_factor" else parameter
+    if(name == "utilization_hours"):
+        constant = LCOE_batch_calculator(**(parameters | {name: 1.0}), rounded = False)["LCOE"]
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            value = constant / target
+    else:
+        intercept = LCOE_batch_calculator(**(parameters | {name: 0.0}), rounded = False)["LCOE"]
+        slope = LCOE_batch_calculator(**(parameters | {name: 1.0}), rounded = False)["LCOE"] - intercept
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            value = (target - intercept) / slope
+    converged = np.isfinite(value) & (value >= 0)
+    if(name == "utilization_hours"):
+        converged &= (value <= 365 * 24)
+    value = np.where(converged, value, np.nan)
+    residual = LCOE_batch_calculator(**(parameters | {name: value}), rounded = False)["LCOE"] - target
+    if(parameter == "capacity_factor"):
+        value = value / (365 * 24)
+    return Inverse_Result(parameter, value, converged, np.zeros(len(value), dtype = np.int64), residual)
+
+# safeguarded Newton: the bracket [low, high] always contains the root because the LCOE grows with the rate,
+# only the reactors not yet converged are evaluated in every iteration
+def break_even_iterative(parameters, parameter, target, tolerance, max_iterations, bounds):
+    size = len(target)
+    low = np.full(size, float(bounds[0]))
+    high = np.full(size, float(bounds[1]))
+    residual_low = LCOE_batch_calculator(**(parameters | {parameter: low}), rounded = False)["LCOE"] - target
+    residual_high = LCOE_batch_calculator(**(parameters | {parameter: high}), rounded = False)["LCOE"] - target
+    bracketed = (residual_low <= 0) & (residual_high >= 0)
+    value = np.where(bracketed, low - residual_low * (high - low) / np.where(residual_high > residual_low, residual_high - residual_low, 1.0), np.nan)
+    residual = np.full(size, np.nan)
+    converged = np.zeros(size, dtype = bool)
+    iterations = np.zeros(size, dtype = np.int64)
+    newton_steps = bisection_steps = 0
+    active = np.flatnonzero(bracketed)
+    for iteration in range(max_iterations):
+        if(len(active) == 0):
+            break
+        gradient, components = LCOE_gradient_batch({name: values[active] for name, values in parameters.items()} | {parameter: value[active]})
+        f = components["LCOE"] - target[active]
+        residual[active] = f
+        iterations[active] += 1
+        done = np.abs(f) <= tolerance
+        converged[active[done]] = True
+
+        # shrink the bracket around the root and take the Newton step, or bisect when it leaves the bracket
+        low[active] = np.where(f < 0, value[active], low[active])
+        high[active] = np.where(f > 0, value[active], high[active])
+        with np.errstate(divide = "ignore", invalid = "ignore"):
+            step = value[active] - f / gradient[parameter]
+        newton = np.isfinite(step) & (step > low[active]) & (step < high[active])
+        middle = (low[active] + high[active]) / 2
+        value[active] = np.where(done, value[active], np.where(newton, step, middle))
+        newton_steps += int(np.count_nonzero(newton & ~done))
+        bisection_steps += int(np.count_nonzero(~newton & ~done))
+
+        # a bracket as small as the floating point spacing can not be improved
+        collapsed = ~done & (high[active] - low[active] <= 4 * np.spacing(np.abs(high[active]) + 1))
+        converged[active[collapsed]] = True
+        active = active[~done & ~collapsed]
+    if(len(active)):
+        residual[active] = LCOE_batch_calculator(**({name: values[active] for name, values in parameters.items()} | {parameter: value[active]}), rounded = False)["LCOE"] - target[active]
+    value = np.where(converged, value, np.nan)
+    return Inverse_Result(parameter, value, converged, iterations, residual, newton_steps, bisection_steps)
@@ -0,0 +1,103 @@
+import numpy as np
+from .core import Reactor
+from .table import Table
+from .batch import LCOE_batch_calculator
+from .designs import Reactor_Design
+
+## learning curve:
+
+# nth-of-a-kind overnight costs with Wright's law [6][7]: every doubling of the units built reduces the cost by the learning rate
+#   cost(k) = cost(1) * k^-b with b = -log2(1 - learning_rate)
+# the costs depend only on the unit index, so they are computed once for the largest fleet and every schedule
+# (and every learning rate) reads the cumulative sums over the units
+# @return (learning rates x units) array of overnight costs [$/kW] of the units 1...@input units
+def learning_curve_costs(first_unit_costs, learning_rates, units):
+    exponents = -np.log2(1 - np.atleast_1d(np.asarray(learning_rates, dtype = np.float64)))
+    return first_unit_costs * np.exp(-exponents[:, None] * np.log(np.arange(1, units + 1, dtype = np.float64))[None, :])
+
+# @return integer array with the units built every year of @input schedule (a list of units per year)
+def check_schedule(schedule):
+    schedule = np.asarray(schedule)
+    if(schedule.ndim != 1 or len(schedule) == 0 or np.any(schedule < 0) or np.any(schedule != np.rint(schedule)) or schedule.sum() == 0):
+        raise ValueError(f"The schedule has to be a list with the (integer, not negative) units built every year, got {schedule.tolist()}")
+    return schedule.astype(np.int64)
+
+# @return the Reactor of @input reactor: a Reactor, the name of a design of design_registry() or None for Reactor()
+def build_out_reactor(reactor):
+    if(reactor is None):
+        return Reactor()
+    if(isinstance(reactor, str)):
+        return Reactor_Design(design_name = reactor)
+    return reactor
+
+# fleet build-out of one design with one learning rate
+# @var overnight_costs array of the overnight costs of every unit [$/kW], @var year array with the year of every unit (1 = first year)
+# @var components dictionary {component: array} with the LCOE breakdown of every unit [$/MWh]
+# @var capital array with the overnight capital of every unit [M$]
+class Fleet_Build_Out:
+    def __init__(self, reactor, learning_rate, schedule):
+        self.reactor = reactor
+        self.learning_rate = learning_rate
+        self.schedule = check_schedule(schedule)
+        values = reactor.parameter_values()
+        self.overnight_costs = learning_curve_costs(values["overnight_costs"], learning_rate, int(self.schedule.sum()))[0]
+        self.year = np.repeat(np.arange(1, len(self.schedule) + 1), self.schedule)
+        self.components = LCOE_batch_calculator(**(values | {"overnight_costs": self.overnight_costs}), factorise = True)
+        self.capital = self.overnight_costs * values["capacity"] * 1000 / 1e6
+    
+    def __len__(self):
+        return len(self.overnight_costs)
+    
+    # average LCOE of the fleet [$/MWh], all the units have the same capacity and utilization hours
+    @property
+    def fleet_LCOE(self):
+        return float(self.components["LCOE"].mean())
+    
+    # overnight capital of the whole fleet [M$]
+    @property
+    def total_capital(self):
+        return float(self.capital.sum())
+    
+    # @return Table with the units, the capital and the LCOE range of the units built every year
+    def yearly(self):
+        table = Table({"year": self.year, "LCOE": self.components["LCOE"], "capital": self.capital}).group_by(["year"], "LCOE", ("count", "min", "max"))
+        table.columns["capital_M$"] = np.round(np.add.reduceat(self.capital, np.flatnonzero(np.diff(self.year, prepend = 0))), 2)
+        return table
+    
+    def __repr__(self):
+        return (f"Fleet build-out: {len(self)} units in {len(self.schedule)} years, learning rate {self.learning_rate*100:g} %\n"
+                + f"First unit: {self.overnight_costs[0]:.2f} [$/kW], {self.components['LCOE'][0]:.2f} [$/MWh]\n"
+                + f"Last unit: {self.overnight_costs[-1]:.2f} [$/kW], {self.components['LCOE'][-1]:.2f} [$/MWh]\n"
+                + f"Fleet average LCOE: {self.fleet_LCOE:.2f} [$/MWh], total overnight capital: {self.total_capital:.2f} [M$]")
+
+# @input reactor: a Reactor, the name of a design of design_registry() or None for Reactor() [default]
+#                 its overnight costs are the costs of the first unit
+# @input learning_rate: cost reduction for every doubling of the units (e.g. 0.05 -> 5%)
+# @input schedule: list with the units built every year, e.g. [1, 2, 4, 8]
+# @return Fleet_Build_Out
+def fleet_build_out(reactor = None, learning_rate = 0.05, schedule = (1,)):
+    return Fleet_Build_Out(build_out_reactor(reactor), learning_rate, schedule)
+
+# fleet average LCOE and total capital for every combination of @input learning_rates and @input schedules
+# the LCOE of a unit is linear in its overnight costs, so the LCOE of all the units is an affine function of the
+# cumulative costs: one cumulative sum over the units of the largest schedule serves all the schedules
+# @return Table with learning_rate, schedule (index in @input schedules), units, years, last unit costs, fleet_LCOE and total capital [M$]
+def learning_sweep(reactor = None, learning_rates = (0.0, 0.05, 0.1), schedules = ((1,),)):
+    reactor = build_out_reactor(reactor)
+    values = reactor.parameter_values()
+    schedules = [check_schedule(schedule) for schedule in schedules]
+    units = np.array([schedule.sum() for schedule in schedules])
+    learning_rates = np.asarray(learning_rates, dtype = np.float64)
+    costs = learning_curve_costs(values["overnight_costs"], learning_rates, int(units.max()))
+    components = LCOE_batch_calculator(**(values | {"overnight_costs": costs}), factorise = True)
+    cumulative_costs = np.cumsum(costs, axis = 1)
+    cumulative_LCOE = np.cumsum(components["LCOE"], axis = 1)
+    columns = {}
+    columns["learning_rate"] = np.repeat(learning_rates, len(schedules))
+    columns["schedule"] = np.tile(np.arange(len(schedules)), len(learning_rates))
+    columns["units"] = np.tile(units, len(learning_rates))
+    columns["years"] = np.tile([len(schedule) for schedule in schedules], len(learning_rates))
+    columns["last_unit_costs"] = np.round(costs[:, units - 1].ravel(), 2)
+    columns["fleet_LCOE"] = np.round((cumulative_LCOE[:, units - 1] / units).ravel(), 2)
+    columns["total_capital_M$"] = np.round((cumulative_costs[:, units - 1] * values["capacity"] * 1000 / 1e6).ravel(), 2)
+    return Table(columns)
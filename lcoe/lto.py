@@ -0,0 +1,106 @@
+import numpy as np
+from .core import LCOE_COMPONENTS, compute_LCOE, investment_factor, recovery_factor
+from .table import Table
+from .batch import factorised_lookup, investment_factor_batch, recovery_factor_batch, round_cents
+from .learning import build_out_reactor
+
+## long term operation:
+
+# LCOE of long term operation (LTO): after the base lifetime the plant is refurbished and operated for one or more extension periods
+# every period has:
+#   extension: years of operation after the refurbishment
+#   refurbishment_costs: [$/kW] spent uniformly during the outage, escalated and financed like the construction
+#   outage: years without generation for the refurbishment, rounded up to whole years (the spending is spread over them,
+#           with no outage the refurbishment is paid at the start of the extension)
+#   O_M_uplift: relative increase of FOM and VOM costs during the extension (e.g. 0.1 -> +10%)
+# the decommissioning fund is completed during the base lifetime, so the extensions have no decommissioning component
+# the base case is calculated once with the cached financial factors and every period is evaluated for all the options at once:
+# the periods only need the cached investment_factor() and recovery_factor() of their own (rate, years) combinations
+LTO_PERIOD_FIELDS = ("extension", "refurbishment_costs", "outage", "O_M_uplift")
+
+# @var base LCOE_Result of the base lifetime
+# @var periods list with a dictionary {component: array} for every extension period (one value for every option)
+# @var whole_life array with the LCOE of base lifetime and extensions, levelized over the discounted energy of all the periods
+class LTO_Result:
+    def __init__(self, base, options, periods, whole_life):
+        self.base = base
+        self.options = options
+        self.periods = periods
+        self.whole_life = whole_life
+    
+    def __len__(self):
+        return len(self.whole_life)
+    
+    # @return Table with the fields of every period, the LTO LCOE of every period and the whole-life LCOE for every option
+    def table(self):
+        columns = {"option": np.arange(len(self))}
+        for number, (options, components) in enumerate(zip(self.options, self.periods), start = 1):
+            columns.update({f"{name}_{number}": values for name, values in options.items()})
+            columns[f"LCOE_{number}"] = components["LCOE"]
+        columns["whole_life_LCOE"] = np.round(self.whole_life, 2)
+        return Table(columns)
+    
+    def __repr__(self):
+        return f"Base lifetime LCOE: {self.base.LCOE:.2f} [$/MWh]\n" + repr(self.table())
+
+# @input reactor: a Reactor, the name of a design of design_registry() or None for Reactor() [default]
+# @input periods: list of dictionaries with the keys of LTO_PERIOD_FIELDS, the values can be arrays of options broadcast together
+#                 example: [{"extension": 20, "refurbishment_costs": [500, 1000], "outage": 1, "O_M_uplift": 0.1}]
+# @input rounded: round every component to the cent like LCOE_calculator() [default = True]
+# @return LTO_Result
+def LTO_LCOE(reactor = None, periods = ({"extension": 20, "refurbishment_costs": 1000, "outage": 1, "O_M_uplift": 0.1},), rounded = True):
+    reactor = build_out_reactor(reactor)
+    values = reactor.parameter_values()
+    values["lifetime"], values["construction_time"] = round(values["lifetime"]), round(values["construction_time"])
+    base = compute_LCOE(**values)
+    for period in periods:
+        for name in period:
+            if(name not in LTO_PERIOD_FIELDS):
+                raise ValueError(f"Unknown LTO field {name!r}, it has to be one of {LTO_PERIOD_FIELDS}")
+    options = [{name: np.asarray(period[name], dtype = np.float64) for name in LTO_PERIOD_FIELDS} for period in periods]
+    for option in options:
+        if(np.any(~(np.rint(option["extension"]) > 0))):
+            raise ValueError(f"The extension has to be at least 1 year, it is {option['extension']}")
+        if(np.any(~(option["outage"] >= 0))):
+            raise ValueError(f"The outage can not be negative, it is {option['outage']}")
+    shape = np.broadcast_shapes(*[value.shape for option in options for value in option.values()], (1,))
+    options = [{name: np.broadcast_to(value, shape).ravel() for name, value in option.items()} for option in options]
+
+    # useful costants
+    kW_MW = 1000 # convertion kW <-> MW
+    utilization_hours = values["utilization_hours"]
+    discount_rate, escalation_rate = values["discount_rate"], values["escalation_rate"]
+
+    # whole-life LCOE = sum(LCOE of period * discounted energy of period) / sum(discounted energy of period)
+    # the discounted energy of a period is its annuity factor 1/recovery_factor() discounted to the start of operation
+    weight = 1 / recovery_factor(discount_rate, values["lifetime"])
+    numerator = base.LCOE * weight
+    denominator = weight
+    start = float(values["lifetime"])
+    result = []
+    for option in options:
+        extension = np.rint(option["extension"])
+        # the same whole years of outage for the financing of the refurbishment and for the start of the extension
+        outage = np.ceil(option["outage"])
+        investment = np.where(outage == 0, 1.0, factorised_lookup(investment_factor, investment_factor_batch, discount_rate, escalation_rate, np.maximum(1, outage)))
+        recovery = factorised_lookup(recovery_factor, recovery_factor_batch, discount_rate, extension)
+        components = {}
+        # same order of the operations of compute_LCOE(), see LCOE_batch_calculator()
+        components["CAPITAL"] = option["refurbishment_costs"] * investment * kW_MW * recovery / utilization_hours
+        components["FOM"] = values["FOM_costs"] * (1 + option["O_M_uplift"]) * kW_MW / utilization_hours
+        components["VOM"] = values["VOM_costs"] * (1 + option["O_M_uplift"]) * kW_MW / utilization_hours
+        components["FUEL"] = np.full(len(extension), values["fuel_cycle_costs"] * kW_MW / utilization_hours)
+        components["DECOMMISSIONING"] = np.zeros(len(extension))
+        if(rounded):
+            for component in LCOE_COMPONENTS[:-1]:
+                components[component] = round_cents(components[component])
+        components["LCOE"] = components["CAPITAL"] + components["FOM"] + components["VOM"] + components["FUEL"] + components["DECOMMISSIONING"]
+        if(rounded):
+            components["LCOE"] = round_cents(components["LCOE"])
+        result.append(components)
+        start = start + outage
+        weight = np.power(1 + discount_rate, -start) / recovery
+        numerator = numerator + components["LCOE"] * weight
+        denominator = denominator + weight
+        start = start + extension
+    return LTO_Result(base, options, result, numerator / denominator)
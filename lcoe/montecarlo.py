@@ -0,0 +1,164 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .core import LCOE_COMPONENTS, LCOE_COMPONENT_NAMES, PARAMETER_NAMES, Reactor, print_list
+from .batch import LCOE_batch_calculator
+from .designs import Reactor_Design
+from .columns import Column_Reader, Column_Writer, streaming_percentiles
+from .aggregate import Result_Aggregator, ascii_histogram
+
+## Monte Carlo:
+
+# distributions accepted by monte_carlo_LCOE(), written as tuples (name, *arguments):
+#   ("uniform", low, high)
+#   ("triangular", low, mode, high)
+#   ("lognormal", median, sigma)   sigma of the logarithm
+#   ("beta", a, b)                 or ("beta", a, b, low, high) for a beta scaled in [low, high]
+# besides PARAMETER_NAMES the key "capacity_factor" can be used, it is converted in utilization hours
+MONTE_CARLO_DISTRIBUTIONS = ("uniform", "triangular", "lognormal", "beta")
+
+# draw @input size values of a distribution tuple with the random generator @input rng
+def sample_distribution(distribution, size, rng):
+    kind, *arguments = distribution
+    if(kind == "uniform"):
+        return rng.uniform(arguments[0], arguments[1], size)
+    elif(kind == "triangular"):
+        return rng.triangular(arguments[0], arguments[1], arguments[2], size)
+    elif(kind == "lognormal"):
+        return rng.lognormal(math.log(arguments[0]), arguments[1], size)
+    elif(kind == "beta"):
+        low, high = (arguments[2], arguments[3]) if len(arguments) == 4 else (0, 1)
+        return low + (high - low) * rng.beta(arguments[0], arguments[1], size)
+    raise ValueError(f"Unknown distribution {kind!r}, it has to be one of {MONTE_CARLO_DISTRIBUTIONS}")
+
+# check the distributions given to monte_carlo_LCOE() before starting the workers
+def check_distributions(distributions):
+    for name, distribution in distributions.items():
+        if(name not in PARAMETER_NAMES and name != "capacity_factor"):
+            raise ValueError(f"Unknown parameter {name!r}, it has to be one of {PARAMETER_NAMES} or 'capacity_factor'")
+        if(distribution[0] not in MONTE_CARLO_DISTRIBUTIONS):
+            raise ValueError(f"Unknown distribution {distribution[0]!r} for {name}, it has to be one of {MONTE_CARLO_DISTRIBUTIONS}")
+    if("capacity_factor" in distributions and "utilization_hours" in distributions):
+        raise ValueError("Give a distribution for capacity_factor or for utilization_hours, not both")
+
+# sample the parameters and calculate the LCOE of one chunk, executed inside the worker processes
+# @input base_values: {name: value} for the parameters without a distribution
+# @input seed: numpy SeedSequence of the chunk, so results do not depend on the number of workers
+# @input keep_parameters: add the sampled parameters to the result [default = False]
+# @return dictionary {component: array} with the unrounded cost components
+def monte_carlo_chunk(base_values, distributions, size, seed, keep_parameters = False):
+    rng = np.random.default_rng(seed)
+    values = dict(base_values)
+    for name, distribution in distributions.items():
+        if(name == "capacity_factor"):
+            values["utilization_hours"] = np.rint(sample_distribution(distribution, size, rng) * 365 * 24)
+        else:
+            values[name] = sample_distribution(distribution, size, rng)
+    values = {name: np.broadcast_to(value, size) for name, value in values.items()}
+    result = LCOE_batch_calculator(**values, rounded = False)
+    if(keep_parameters):
+        result.update({name: values[name] for name in sampled_parameters(distributions)})
+    return result
+
+# like monte_carlo_chunk() but only the summary of the chunk is sent back to the main process
+# @return Result_Aggregator with one group named @input group
+def monte_carlo_summary_chunk(base_values, distributions, size, seed, group = None, sketch_size = 1000):
+    return Result_Aggregator(sketch_size = sketch_size, seed = seed).update(monte_carlo_chunk(base_values, distributions, size, seed), group)
+
+# @return the names of PARAMETER_NAMES sampled with @input distributions
+def sampled_parameters(distributions):
+    return [name for name in PARAMETER_NAMES if name in distributions or (name == "utilization_hours" and "capacity_factor" in distributions)]
+
+# copy the chunks (in order) in the preallocated arrays of @input result
+def store_chunks(result, chunk_sizes, chunks):
+    start = 0
+    for size, chunk in zip(chunk_sizes, chunks):
+        for component in result:
+            result[component][start:start + size] = chunk[component]
+        start += size
+
+# LCOE distribution of a Monte Carlo run, samples are arrays in memory or memmaps of a column store
+# @var samples dictionary {component: array} with the keys of LCOE_COMPONENTS, None for a run with only the summary
+# @var summary Result_Aggregator of a run with only the summary, None if the samples are kept
+class Monte_Carlo_Result:
+    def __init__(self, samples, reactor, summary = None):
+        self.samples = samples
+        self.reactor = reactor
+        self.summary = summary
+    
+    def __len__(self):
+        return len(self.samples["LCOE"]) if self.samples is not None else len(self.summary)
+    
+    # @return dictionary {component: array of percentiles} for the percentiles in @input q
+    def percentiles(self, q = (10, 50, 90)):
+        if(self.samples is None):
+            group, = self.summary.groups
+            return {component: np.round(values, 2) for component, values in self.summary.percentiles(q, group).items()}
+        return {component: np.round(streaming_percentiles(values, q) if isinstance(values, np.memmap) else np.percentile(values, q), 2) for component, values in self.samples.items()}
+    
+    # @return string with the chart of the distribution of @input component, see ascii_histogram()
+    def ascii_histogram(self, component = "LCOE", bins = 20, width = 50):
+        if(self.samples is None):
+            group, = self.summary.groups
+            return self.summary.ascii_histogram(component, group, bins, width)
+        return ascii_histogram(*np.histogram(self.samples[component], bins = bins), width = width)
+    
+    # @return list of strings "name: P10 x | P50 y | P90 z [$/MWh]"
+    def print_percentiles(self, q = (10, 50, 90)):
+        return [f"{name}: " + " | ".join(f"P{p} {value:.2f}" for p, value in zip(q, values)) + " [$/MWh]" for name, values in zip(LCOE_COMPONENT_NAMES, self.percentiles(q).values())]
+    
+    def __repr__(self):
+        return f"Monte Carlo samples: {len(self)}\nPercentiles:\n"+print_list(self.print_percentiles(), input_index = ["●"]*len(LCOE_COMPONENTS), sep = " " ,string = True)
+
+# Monte Carlo uncertainty analysis of the LCOE
+# the parameters start from the default Reactor() or the design @input design_name or the @input reactor
+# and the parameters in @input distributions {name: distribution tuple} are sampled (see MONTE_CARLO_DISTRIBUTIONS)
+# @input samples: total number of samples, drawn in chunks of @input chunk_size
+# @input workers: number of processes [default = number of CPUs], with 1 everything runs in this process
+# @input seed: seed for reproducible runs, every chunk has an independent random stream spawned from it
+# @input output: directory of a column store where the chunks are appended with the sampled parameters,
+#                instead of keeping the samples in memory [default = None]
+# @input summary_only: keep only a streaming summary (moments, quantile sketch) merged from the workers, the memory does not
+#                      depend on @input samples; the summary is one group named @input design_name [default = False]
+# @return Monte_Carlo_Result
+def monte_carlo_LCOE(distributions, reactor = None, design_name = None, samples = 1000000, chunk_size = 250000, workers = None, seed = None, output = None, summary_only = False, sketch_size = 1000):
+    check_distributions(distributions)
+    if(samples < 1 or chunk_size < 1):
+        raise ValueError(f"The number of samples and the chunk size have to be at least 1, they are {samples} and {chunk_size}")
+    function = monte_carlo_chunk
+    if(summary_only and output is not None):
+        raise ValueError("A run with summary_only does not write the samples, do not give an output")
+    if(reactor is None):
+        reactor = Reactor_Design(design_name = design_name) if design_name is not None else Reactor()
+    base_values = reactor.parameter_values()
+    chunk_sizes = [chunk_size] * (samples // chunk_size) + ([samples % chunk_size] if samples % chunk_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    arguments = ([base_values] * len(chunk_sizes), [distributions] * len(chunk_sizes), chunk_sizes, seeds, [output is not None] * len(chunk_sizes))
+    if(summary_only):
+        function = monte_carlo_summary_chunk
+        arguments = arguments[:4] + ([design_name] * len(chunk_sizes), [sketch_size] * len(chunk_sizes))
+        summary = Result_Aggregator(sketch_size = sketch_size, seed = seed)
+        store = lambda chunks: [summary.merge(chunk) for chunk in chunks]
+    elif(output is None):
+        result = {component: np.empty(samples) for component in LCOE_COMPONENTS}
+        store = lambda chunks: store_chunks(result, chunk_sizes, chunks)
+    else:
+        writer = Column_Writer(output, sampled_parameters(distributions) + list(LCOE_COMPONENTS))
+        store = lambda chunks: [writer.append(chunk) for chunk in chunks]
+    try:
+        if(workers == 1 or len(chunk_sizes) == 1):
+            store(map(function, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers = workers) as executor:
+                store(executor.map(function, *arguments))
+    finally:
+        if(output is not None):
+            writer.close()
+    if(summary_only):
+        if(not summary.groups):
+            summary.summaries(design_name)
+        return Monte_Carlo_Result(None, reactor, summary)
+    if(output is not None):
+        reader = Column_Reader(output)
+        result = {component: reader[component] for component in LCOE_COMPONENTS}
+    return Monte_Carlo_Result(result, reactor)
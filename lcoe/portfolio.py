@@ -0,0 +1,254 @@
+import math
+import numpy as np
+from .core import format_table
+from .table import Table
+from .batch import LCOE_batch_calculator
+from .designs import design_registry
+from .regions import region_LCOE_store
+
+## portfolio optimizer:
+
+# cost of one unit of every design built in every region, the table used by optimize_portfolio()
+# a unit keeps the capacity, fuel and O&M costs of its design and takes discount rate and capacity factor of the region [3];
+# with @input regional_costs the overnight costs of the design are scaled by the regional cost index
+# (overnight costs of the region / mean of all the regions of the scenario and year), else they are the design ones
+# @input designs, regions: names [default = all], @input year: one of the years of the data
+# @return Table with design, region, capacity [MW], discount_rate, utilization_hours, overnight_costs [$/kW],
+#         LCOE [$/MWh] and capital [M$ per unit, overnight costs x capacity]
+def portfolio_cost_table(scenario = "Stated Policies", year = "2030", designs = None, regions = None, regional_costs = True):
+    registry = design_registry()
+    designs = registry.names() if designs is None else list(designs)
+    rows = region_LCOE_store().select(scenario = scenario, year = year)
+    index = rows["overnight_costs"] / rows["overnight_costs"].mean() if len(rows["region"]) else None
+    if(regions is not None):
+        selected = np.isin(rows["region"], regions)
+        rows, index = {name: values[selected] for name, values in rows.items()}, index[selected]
+    if(len(rows["region"]) == 0):
+        raise ValueError(f"No regional data for scenario {scenario!r}, year {year!r}, regions {regions!r}")
+    parameters = {name: values[:, None] for name, values in registry.parameter_arrays(designs).items()}
+    parameters["discount_rate"] = rows["discount_rate"][None, :]
+    parameters["utilization_hours"] = np.rint(rows["capacity_factor"] * 365 * 24)[None, :]
+    if(regional_costs):
+        parameters["overnight_costs"] = np.round(parameters["overnight_costs"] * index[None, :])
+    components = LCOE_batch_calculator(**parameters)
+    shape = components["LCOE"].shape
+    columns = {"design": np.broadcast_to(np.array(designs)[:, None], shape).ravel(), "region": np.broadcast_to(rows["region"][None, :], shape).ravel()}
+    for name in ("capacity", "discount_rate", "utilization_hours", "overnight_costs"):
+        columns[name] = np.broadcast_to(parameters[name], shape).ravel()
+    columns["LCOE"] = components["LCOE"].ravel()
+    columns["capital"] = columns["overnight_costs"] * columns["capacity"] / 1000
+    return Table(columns)
+
+# capacity, capital and capacity weighted LCOE of many candidate portfolios at once
+# @input units: (candidates x rows of the @input cost_table) array with the number of units of every design/region pair
+# @return dictionary {"capacity": [MW], "capital": [M$], "LCOE": [$/MWh]} of arrays, one value for every candidate
+def evaluate_portfolios(units, cost_table):
+    units = np.atleast_2d(np.asarray(units, dtype = np.float64))
+    capacity = units @ cost_table["capacity"]
+    with np.errstate(invalid = "ignore", divide = "ignore"):
+        LCOE = (units @ (cost_table["capacity"] * cost_table["LCOE"])) / capacity
+    return {"capacity": capacity, "capital": units @ cost_table["capital"], "LCOE": LCOE}
+
+# exact dynamic programming of one region: cheapest portfolio for every total capacity 0, step, 2 step ... states x step
+# with any number of units of every design (unbounded knapsack on the capacity)
+# for one design with capacity p steps and cost a, along every residue class of the capacity the recurrence
+# best[j] = min over i <= j of (old[i] + (j - i) a) is a cumulative minimum of old[i] - i a, so every design is one numpy pass
+# @input costs: cost of one unit (minimized), @input tracked: (quantities x designs) values summed along the best portfolios
+# @return (best cost, (quantities x states + 1) sums of @input tracked, (designs x states + 1) units or None if not @input counts)
+def region_dynamic_programming(costs, sizes, tracked, states, counts = False):
+    best = np.full(states + 1, np.inf)
+    best[0] = 0.0
+    sums = np.zeros((len(tracked), states + 1))
+    units = np.zeros((len(costs), states + 1), dtype = np.int64) if counts else None
+    for design, (cost, size) in enumerate(zip(costs, sizes)):
+        rows = -(-(states + 1) // size)
+        grid = np.full(rows * size, np.inf)
+        grid[:states + 1] = best
+        step = np.arange(rows)[:, None]
+        shifted = grid.reshape(rows, size) - step * cost
+        running = np.minimum.accumulate(shifted, axis = 0)
+        start = np.maximum.accumulate(np.where(shifted <= running, step, 0), axis = 0) # row of the running minimum
+        added = (step - start).ravel()[:states + 1] # units of this design added to reach the state
+        best = (running + step * cost).ravel()[:states + 1]
+        source = np.arange(states + 1) - added * size
+        sums = sums[:, source] + added * tracked[:, design][:, None]
+        if(counts):
+            units = units[:, source]
+            units[design] += added
+    return best, sums, units
+
+# optimal portfolio of optimize_portfolio()
+# @var units Table of the cost table rows with at least one unit, with units, capacity [MW] and capital [M$] of the pair
+# @var capacity [MW], capital [M$], LCOE capacity weighted [$/MWh] of the fleet
+# @var status "optimal" (exact solution) or "feasible" (best portfolio found by the Lagrangian search of the budget)
+# @var multipliers Lagrange multipliers of the budget of the portfolios of the regions, @var evaluations multipliers evaluated
+class Portfolio_Result:
+    def __init__(self, cost_table, units, objective, status, multipliers = (), evaluations = 1):
+        self.cost_table = cost_table
+        self.objective = objective
+        self.status = status
+        self.multipliers = multipliers
+        self.evaluations = evaluations
+        totals = evaluate_portfolios(units, cost_table)
+        self.capacity, self.capital, self.LCOE = [float(totals[name][0]) for name in ("capacity", "capital", "LCOE")]
+        chosen = units > 0
+        columns = {name: cost_table[name][chosen] for name in ("design", "region", "LCOE")}
+        columns["units"] = units[chosen]
+        columns["capacity"] = units[chosen] * cost_table["capacity"][chosen]
+        columns["capital"] = units[chosen] * cost_table["capital"][chosen]
+        self.units = Table(columns)
+
+    # @return dictionary {(design, region): units}
+    def unit_counts(self):
+        return {(row["design"], row["region"]): row["units"] for row in self.units.rows()}
+
+    # @return Table with units, capacity and capital of every region
+    def by_region(self):
+        units = self.units.group_by("region", "units", ("sum",))
+        units.columns["capacity"] = self.units.group_by("region", "capacity", ("sum",))["capacity_sum"]
+        units.columns["capital"] = self.units.group_by("region", "capital", ("sum",))["capital_sum"]
+        return units
+
+    def __repr__(self):
+        rows = [[row["design"], row["region"], row["units"], f"{row['capacity']:g}", f"{row['capital']:,.0f}", f"{row['LCOE']:.2f}"] for row in self.units.rows()]
+        return (f"Portfolio ({self.status}, objective {self.objective}): {int(self.units['units'].sum())} units, capacity {self.capacity:g} MW, "
+                f"capital {self.capital:,.0f} M$, fleet LCOE {self.LCOE:.2f} $/MWh\n" + format_table(["Design", "Region", "Units", "Capacity [MW]", "Capital [M$]", "LCOE [$/MWh]"], rows))
+
+# choose how many units of every design to build in every region
+# @input targets: {region: minimum capacity [MW]}, only these regions are built
+# @input objective: "LCOE" minimizes the capacity weighted LCOE of the fleet, "capital" the total capital
+# @input budget: maximum total capital [M$] [default = no budget]
+# @input limits: {region: maximum capacity [MW]} [default = target + capacity of the largest unit]
+# @input allowed: {region: list of designs} that can be built in the region [default = all the designs of the cost table]
+# @input cost_table: Table of portfolio_cost_table() [default = portfolio_cost_table(scenario, year) of the target regions]
+# @input capacity_step: resolution of the capacity [MW] [default = greatest common divisor of the unit capacities, exact]
+#                       with a larger step the unit capacities are rounded to it: faster, but approximate
+# every region is solved exactly by region_dynamic_programming() for all its capacities at once, then:
+#   - capital: every region takes its cheapest capacity within target and limit (exact)
+#   - LCOE: the capacities of the regions are chosen by Dinkelbach iterations on the ratio cost / capacity (exact)
+# with a budget (LCOE objective) the capital is added to the unit costs with a Lagrange multiplier: for every Dinkelbach
+# ratio the smallest multiplier whose portfolio is within the budget is found by bisection; the result is then the best
+# portfolio within the budget found by the search ("feasible"), not always the optimum because of the integer units
+# @input max_iterations: maximum number of multipliers evaluated by the search of the budget
+# @return Portfolio_Result
+def optimize_portfolio(targets, objective = "LCOE", budget = None, limits = None, allowed = None, cost_table = None, scenario = "Stated Policies", year = "2030", capacity_step = None, max_iterations = 100):
+    if(objective not in ("LCOE", "capital")):
+        raise ValueError(f"Unknown objective {objective!r}, it has to be 'LCOE' or 'capital'")
+    if(cost_table is None):
+        cost_table = portfolio_cost_table(scenario, year, regions = list(targets))
+    regions = list(targets)
+    limits = limits or {}
+    step = capacity_step or math.gcd(*np.rint(cost_table["capacity"]).astype(int).tolist())
+    weights = cost_table["capacity"] * cost_table["LCOE"] if objective == "LCOE" else cost_table["capital"]
+    capital = cost_table["capital"]
+    problems = []
+    for region in regions:
+        rows = np.flatnonzero((cost_table["region"] == region) & (np.isin(cost_table["design"], allowed[region]) if allowed and region in allowed else True))
+        if(len(rows) == 0):
+            raise ValueError(f"No design can be built in region {region!r}")
+        sizes = np.maximum(np.rint(cost_table["capacity"][rows] / step).astype(np.int64), 1)
+        low = math.ceil(targets[region] / step - 1e-9)
+        high = int((limits[region] if region in limits else targets[region] + cost_table["capacity"][rows].max()) // step)
+        if(high < low):
+            raise ValueError(f"The limit of region {region!r} is below its target")
+        problems.append({"region": region, "rows": rows, "sizes": sizes, "low": low, "high": high, "capacity": np.arange(high + 1) * step})
+
+    # unit costs of the search: weights + multiplier * capital, only the capital for an infinite multiplier
+    def unit_costs(rows, multiplier):
+        return capital[rows] if multiplier == math.inf else weights[rows] + multiplier * capital[rows]
+
+    # (best cost, sums of weights and capital) of every region for every multiplier evaluated, only the states between target and limit
+    tables = {}
+    def region_tables(multiplier):
+        if(multiplier not in tables):
+            tables[multiplier] = []
+            for problem in problems:
+                rows = problem["rows"]
+                best, sums, _ = region_dynamic_programming(unit_costs(rows, multiplier), problem["sizes"], np.stack((weights[rows], capital[rows])), problem["high"])
+                if(not np.isfinite(best[problem["low"]:]).any()):
+                    raise ValueError(f"No portfolio of region {problem['region']!r} meets its capacity target within the limit")
+                tables[multiplier].append((best[problem["low"]:], sums[:, problem["low"]:]))
+        return tables[multiplier]
+
+    # a solution is (list of (multiplier, state) of every region, weights, capital, capacity), the state counts from the target
+    def solution_of(picks):
+        sums = [tables[multiplier][region][1][:, state] for region, (multiplier, state) in enumerate(picks)]
+        return picks, sum(total[0] for total in sums), sum(total[1] for total in sums), sum(problem["capacity"][problem["low"] + state] for problem, (multiplier, state) in zip(problems, picks))
+
+    # portfolio minimizing the sum of (best cost - @input ratio * capacity) of the regions for @input multiplier
+    def choose(multiplier, ratio = 0.0):
+        return solution_of([(multiplier, int(np.argmin(best - ratio * problem["capacity"][problem["low"]:]))) for (best, sums), problem in zip(region_tables(multiplier), problems)])
+
+    def value(solution):
+        return solution[1] / solution[3] if objective == "LCOE" else solution[1]
+
+    # Dinkelbach iterations for the ratio weights / capacity with the multiplier @input multiplier, from @input solution
+    def dinkelbach(multiplier, solution):
+        while(objective == "LCOE"):
+            new = choose(multiplier, value(solution))
+            if(value(new) >= value(solution)):
+                break
+            solution = new
+        return solution
+
+    # local search on the portfolios already evaluated: every region in turn takes the portfolio of the tables
+    # that improves the value of the fleet within the budget, until no region changes
+    def improve(solution):
+        picks = list(solution[0])
+        changed = True
+        while(changed):
+            changed = False
+            for region, problem in enumerate(problems):
+                _, total_weights, total_capital, total_capacity = solution_of(picks)
+                current = value(solution_of(picks))
+                multiplier, state = picks[region]
+                others_weights = total_weights - tables[multiplier][region][1][0, state]
+                others_capital = total_capital - tables[multiplier][region][1][1, state]
+                others_capacity = total_capacity - problem["capacity"][problem["low"] + state]
+                for multiplier, table in tables.items():
+                    best, sums = table[region]
+                    values = others_weights + sums[0]
+                    if(objective == "LCOE"):
+                        values = values / (others_capacity + problem["capacity"][problem["low"]:])
+                    values = np.where(np.isfinite(best) & (others_capital + sums[1] <= budget), values, np.inf)
+                    state = int(np.argmin(values))
+                    if(values[state] < current - 1e-9 * abs(current)):
+                        picks[region], current, changed = (multiplier, state), values[state], True
+        return solution_of(picks)
+
+    solution = dinkelbach(0.0, choose(0.0))
+    status = "optimal"
+    if(budget is not None and solution[2] > budget):
+        minimum = choose(math.inf)
+        if(minimum[2] > budget):
+            raise ValueError(f"No portfolio meets the targets within the budget: the minimum capital is {minimum[2]:,.0f} M$")
+        if(objective == "capital"):
+            solution = minimum
+        else:
+            solution, status = minimum, "feasible"
+            start = float(weights.mean()) / float(capital.mean())
+            while(len(tables) < max_iterations):
+                ratio = value(solution)
+                # bisection of the multiplier between an infeasible (low) and a feasible (high) value for this ratio
+                low, high = 0.0, start
+                while(choose(high, ratio)[2] > budget and len(tables) < max_iterations):
+                    low, high = high, high * 4
+                while(high - low > 1e-4 * high and len(tables) < max_iterations):
+                    middle = (low + high) / 2
+                    if(choose(middle, ratio)[2] <= budget):
+                        high = middle
+                    else:
+                        low = middle
+                candidate = choose(high, ratio)
+                if(candidate[2] > budget or value(candidate) >= value(solution)):
+                    break
+                solution = candidate
+            solution = improve(solution)
+
+    # units of the chosen states, with the same unit costs of the search
+    units = np.zeros(len(cost_table), dtype = np.int64)
+    for problem, (multiplier, state) in zip(problems, solution[0]):
+        rows = problem["rows"]
+        _, _, counts = region_dynamic_programming(unit_costs(rows, multiplier), problem["sizes"], np.stack((weights[rows], capital[rows])), problem["low"] + state, counts = True)
+        units[rows] += counts[:, problem["low"] + state]
+    return Portfolio_Result(cost_table, units, objective, status, [multiplier for multiplier, state in solution[0]], len(tables))
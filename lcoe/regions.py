@@ -0,0 +1,132 @@
+import csv
+import os
+from collections import namedtuple
+from functools import lru_cache
+import numpy as np
+from .core import Parameter, parse_number, print_list
+from .table import Table
+
+## regions:
+
+## to be added
+# sub class of Reactor for use default scenario/region/year
+# data from [3]
+# @var regionn_name (string) the name of the region
+"""
+class Reactor_Region(Reactor):
+    def __init__(self, scenario_name, region_name, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.scenario_name = scenario_name
+        self.region_name = region_name
+        self.assign_region()
+    
+    # assign the values of the selected region
+    def assign_region(self):
+        pass
+"""
+
+
+# data of [3] World Energy Outlook 2022, one row for every scenario/region/year
+REGION_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "IEA_WEO_2022.csv")
+REGION_FIELDS = ("discount_rate", "overnight_costs", "capacity_factor", "Fuel_O_M", "LCOE")
+REGION_FIELD_NAMES = (("Discount Rate ", ""), ("Overnight Costs", "$/kW"), ("Capacity Factor", ""), ("Fuel and Operation and Maintainance Costs", "$/MWh"), ("Levelized Cost Of Electricity", "$/MWh"))
+Region_Record = namedtuple("Region_Record", REGION_FIELDS)
+
+# indexed data store of the regional parameters and LCOE, loaded once from a csv file (lines starting with # are comments)
+# @var scenarios, regions, years: names in the order of the file
+# @var columns: dictionary {column: numpy array} with "scenario", "region", "year", "note" and REGION_FIELDS
+class Region_LCOE_Store:
+    def __init__(self, path = REGION_DATA_FILE):
+        with open(path, newline = "") as file:
+            rows = list(csv.DictReader(line for line in file if not line.startswith("#")))
+        self.index = {}
+        self.notes = {}
+        for row in rows:
+            key = (row["scenario"], row["region"], row["year"])
+            self.index[key] = Region_Record(*[parse_number(row[field]) for field in REGION_FIELDS])
+            self.notes[key] = row.get("note", "")
+        self.scenarios = list(dict.fromkeys(key[0] for key in self.index))
+        self.regions = list(dict.fromkeys(key[1] for key in self.index))
+        self.years = list(dict.fromkeys(key[2] for key in self.index))
+        self.columns = {"scenario": np.array([key[0] for key in self.index]), "region": np.array([key[1] for key in self.index]), "year": np.array([key[2] for key in self.index])}
+        self.columns.update({field: np.array([record[i] for record in self.index.values()], dtype = np.float64) for i, field in enumerate(REGION_FIELDS)})
+        self.columns["note"] = np.array(list(self.notes.values()))
+        self.shared_parameters = {}
+    
+    def __len__(self):
+        return len(self.index)
+    
+    # @return Region_Record of the scenario/region/year, ValueError if the combination is not in the data
+    def get(self, scenario, region, year):
+        try:
+            return self.index[(scenario, region, str(year))]
+        except KeyError:
+            raise ValueError(f"No data for scenario {scenario!r}, region {region!r}, year {year!r}: scenarios are {self.scenarios}, regions {self.regions}, years {self.years}") from None
+    
+    # @return tuple of Parameter with REGION_FIELD_NAMES, created once for every combination and shared
+    def parameters(self, scenario, region, year):
+        key = (scenario, region, str(year))
+        if(key not in self.shared_parameters):
+            record = self.get(*key)
+            self.shared_parameters[key] = tuple(Parameter(name = name, unit_of_measurement = unit, value = value) for (name, unit), value in zip(REGION_FIELD_NAMES, record))
+        return self.shared_parameters[key]
+    
+    # bulk retrieval of a slice of the data as columns, e.g. select(year = "2030") for all scenarios and regions in 2030
+    # @input scenario, region, year: a name, a list of names or None for all
+    # @return dictionary {column: numpy array} with the rows matching all the conditions
+    def select(self, scenario = None, region = None, year = None):
+        mask = np.ones(len(self), dtype = bool)
+        for column, wanted in (("scenario", scenario), ("region", region), ("year", year)):
+            if(wanted is not None):
+                wanted = [wanted] if isinstance(wanted, (str, int)) else wanted
+                mask &= np.isin(self.columns[column], [str(value) for value in wanted])
+        return {column: values[mask] for column, values in self.columns.items()}
+
+    # cube query: any combination of fixed and wildcard axes, e.g. cube(region = None, year = ["2030", "2050"])
+    # @input scenario, region, year: a name, a list of names, None or "Multi-Scenario"/"Multi-Region"/"Multi-Year" for all
+    # @return Table with one row for every matching combination
+    def cube(self, scenario = None, region = None, year = None):
+        wildcards = ("Multi-Scenario", "Multi-Region", "Multi-Year")
+        axes = [None if value in wildcards else value for value in (scenario, region, year)]
+        return Table(self.select(*axes))
+
+# the store is loaded at the first use and then shared
+@lru_cache(maxsize = None)
+def region_LCOE_store(path = REGION_DATA_FILE):
+    return Region_LCOE_Store(path)
+
+
+# sub class of Reactor for use default scenario/region/year
+# data from [3] but using the LCOE already calulated by IEA
+# @var regionn_name (string) the name of the region
+class Reactor_Region_LCOE():
+    def __init__(self, scenario_name, region_name, year_name):
+        self.scenario_name = scenario_name
+        self.region_name = region_name
+        self.year_name = year_name
+        self.assign_region()
+        self.list_value = [value for key, value in self.__dict__.items()]
+        self.list_print = [value.print_value() for value in self.list_value[3:]] # parameters formatting for print the list
+        
+    # assign the values of the selected region from the data store, the Parameter objects are shared and read-only
+    # with a "Multi-*" name nothing is assigned and __repr__ shows all the matching combinations
+    def assign_region(self):
+        if(self.scenario_name == "Multi-Scenario" or self.region_name == "Multi-Region" or self.year_name == "Multi-Year"):
+            return
+        self.discount_rate, self.overnight_costs, self.capacity_factor, self.Fuel_O_M, self.LCOE = region_LCOE_store().parameters(self.scenario_name, self.region_name, self.year_name)
+
+    def __repr__(self): # return a string with the reactor parameters in their value format and the scenario/region/year names
+        # "Multi-*" names select all the values of their axis, the blocks of all the combinations are joined in one pass
+        store = region_LCOE_store()
+        cube = store.cube(self.scenario_name, self.region_name, self.year_name)
+        blocks = []
+        for scenario, region, year in zip(cube["scenario"].tolist(), cube["region"].tolist(), cube["year"].tolist()):
+            list_print = [value.print_value() for value in store.parameters(scenario, region, year)]
+            blocks.append(f"Scenario: {scenario}\nRegion: {region}\nYear: {year}\nParameters:\n"+print_list(list_print, input_index = ["●"]*len(list_print), sep = " " ,string = True))
+        return "".join(blocks)
+
+# cube query on the IEA World Energy Outlook 2022 data, see Region_LCOE_Store.cube()
+# example: region_LCOE_cube(year = ["2030", "2050"]).group_by("region", "LCOE") for min/max/mean LCOE per region
+#          region_LCOE_cube(year = "2030").pivot(index = "region", columns = "scenario", values = "LCOE")
+def region_LCOE_cube(scenario = None, region = None, year = None):
+    return region_LCOE_store().cube(scenario, region, year)
@@ -0,0 +1,106 @@
+import numpy as np
+from .core import PARAMETER_NAMES, Reactor, format_table
+from .batch import LCOE_batch_calculator, decommissioning_factor_batch, investment_factor_batch, recovery_factor_batch
+from .fleet import Reactor_Fleet
+
+## sensitivity analysis:
+
+# stack the parameters of @input reactors (a Reactor, a list of Reactor, a Reactor_Fleet or a dictionary {name: array})
+# @return dictionary {name: float array} with the keys of PARAMETER_NAMES
+def parameter_arrays(reactors):
+    if(isinstance(reactors, Reactor)):
+        reactors = [reactors]
+    if(isinstance(reactors, Reactor_Fleet)):
+        reactors = reactors.columns
+    if(isinstance(reactors, dict)):
+        arrays = np.broadcast_arrays(*[np.asarray(reactors[name], dtype = np.float64) for name in PARAMETER_NAMES])
+    else:
+        arrays = np.array([[getattr(reactor, name).value for name in PARAMETER_NAMES] for reactor in reactors], dtype = np.float64).T
+    return {name: np.atleast_1d(array) for name, array in zip(PARAMETER_NAMES, arrays)}
+
+# logarithmic derivatives of the geometric_mean_factor() with respect to the rate and to the periods
+# the limits for rate = 0 are (periods+1)/2 and 0
+def geometric_mean_log_derivatives(rate, periods):
+    zero_rate = (rate == 0)
+    safe_rate = np.where(zero_rate, 1.0, rate)
+    growth = np.exp(periods * np.log1p(rate))
+    safe_growth = np.where(zero_rate, 2.0, growth)
+    d_rate = 1 / (1 + rate) + periods * growth / ((1 + rate) * (safe_growth - 1)) - 1 / safe_rate
+    d_periods = growth * np.log1p(rate) / (safe_growth - 1) - 1 / periods
+    return np.where(zero_rate, (periods + 1) / 2, d_rate), np.where(zero_rate, 0.0, d_periods)
+
+# exact partial derivatives of the unrounded LCOE [$/MWh per unit of parameter] for many reactors at once
+# lifetime and construction time are treated as continuous (the formulas are smooth in both)
+# @input parameters: dictionary {name: array} with the keys of PARAMETER_NAMES
+# @return (dictionary {name: array of dLCOE/dparameter}, dictionary {component: array} of LCOE_batch_calculator())
+def LCOE_gradient_batch(parameters):
+    p = {name: np.asarray(parameters[name], dtype = np.float64) for name in PARAMETER_NAMES}
+    r, e, n, L = p["discount_rate"], p["escalation_rate"], p["construction_time"], p["lifetime"]
+    kW_MW = 1000 # convertion kW <-> MW
+    MWh_kW = kW_MW / p["utilization_hours"]
+    CAPITAL = p["overnight_costs"] * investment_factor_batch(r, e, n) * recovery_factor_batch(r, L) * MWh_kW
+    DECOMMISSIONING = p["overnight_costs"] * decommissioning_factor_batch(L) * MWh_kW
+    LCOE = CAPITAL + DECOMMISSIONING + (p["FOM_costs"] + p["VOM_costs"] + p["fuel_cycle_costs"]) * MWh_kW
+
+    # logarithmic derivatives of the investment factor and of the recovery factor
+    d_escalation, d_construction_escalation = geometric_mean_log_derivatives(e, n)
+    d_discount, d_construction_discount = geometric_mean_log_derivatives(r, n)
+    zero_rate = (r == 0)
+    safe_rate = np.where(zero_rate, 1.0, r)
+    growth = np.exp(L * np.log1p(r))
+    safe_growth = np.where(zero_rate, 2.0, growth)
+    d_recovery_rate = np.where(zero_rate, (L + 1) / 2, 1 / safe_rate + L / (1 + r) - L * growth / ((1 + r) * (safe_growth - 1)))
+    d_recovery_lifetime = np.where(zero_rate, -1 / L, -np.log1p(r) / (safe_growth - 1))
+    d_decommissioning_lifetime = -np.log(1.01) / (1 - np.power(1.01, -L))
+
+    gradient = {}
+    gradient["capacity"] = np.zeros_like(LCOE)
+    gradient["lifetime"] = CAPITAL * d_recovery_lifetime + DECOMMISSIONING * d_decommissioning_lifetime
+    gradient["utilization_hours"] = -LCOE / p["utilization_hours"]
+    gradient["construction_time"] = CAPITAL * (d_construction_escalation + d_construction_discount)
+    gradient["discount_rate"] = CAPITAL * (d_discount + d_recovery_rate)
+    gradient["escalation_rate"] = CAPITAL * (d_escalation - 0.5 / (1 + e))
+    gradient["overnight_costs"] = (CAPITAL + DECOMMISSIONING) / p["overnight_costs"]
+    gradient["fuel_cycle_costs"] = MWh_kW
+    gradient["FOM_costs"] = MWh_kW
+    gradient["VOM_costs"] = MWh_kW
+    components = {"CAPITAL": CAPITAL, "FOM": p["FOM_costs"] * MWh_kW, "VOM": p["VOM_costs"] * MWh_kW, "FUEL": p["fuel_cycle_costs"] * MWh_kW, "DECOMMISSIONING": DECOMMISSIONING, "LCOE": LCOE}
+    return {name: np.broadcast_to(gradient[name], LCOE.shape) for name in PARAMETER_NAMES}, components
+
+# elasticities and tornado swings of the LCOE for many reactors
+# @var elasticity (reactors x parameters) array of dLCOE/dparameter * parameter / LCOE
+# @var low, high (reactors x parameters) arrays of LCOE recomputed with one parameter changed by -swing and +swing
+#      (not rounded, lifetime and construction time are rounded to integer years like in LCOE_batch_calculator())
+# @var order (reactors x parameters) array with the parameter indexes ranked by the size of the swing
+class Sensitivity_Result:
+    def __init__(self, parameters, swing = 0.1):
+        gradient, components = LCOE_gradient_batch(parameters)
+        self.swing = swing
+        self.LCOE = components["LCOE"]
+        derivative = np.stack([gradient[name] for name in PARAMETER_NAMES], axis = -1)
+        values = np.stack([np.broadcast_to(np.asarray(parameters[name], dtype = np.float64), self.LCOE.shape) for name in PARAMETER_NAMES], axis = -1)
+        self.elasticity = derivative * values / self.LCOE[..., None]
+        # one vectorized call for every reactor and parameter: column i has only the parameter i changed
+        changed = np.eye(len(PARAMETER_NAMES))
+        self.low, self.high = [LCOE_batch_calculator(**{name: values[..., i, None] * (1 + sign * swing * changed[i]) for i, name in enumerate(PARAMETER_NAMES)}, rounded = False)["LCOE"]
+                               for sign in (-1, 1)]
+        self.order = np.argsort(-np.abs(self.high - self.low), axis = -1, kind = "stable")
+    
+    def __len__(self):
+        return len(self.LCOE)
+    
+    # @return string with the tornado table of the reactor @input index sorted by swing
+    def table(self, index):
+        names = [value.print_name() for value in Reactor().list_value]
+        rows = [[names[i], f"{self.elasticity[index, i]:.4f}", f"{self.low[index, i]:.2f}", f"{self.high[index, i]:.2f}", f"{abs(self.high[index, i] - self.low[index, i]):.2f}"] for i in self.order[index]]
+        return f"LCOE: {self.LCOE[index]:.2f} [$/MWh], swing: ±{self.swing*100:g} %\n" + format_table(["Parameter", "Elasticity", f"LCOE -{self.swing*100:g}%", f"LCOE +{self.swing*100:g}%", "Range"], rows)
+    
+    def __repr__(self):
+        return "\n".join(self.table(index) for index in range(len(self)))
+
+# sensitivity and tornado analysis with exact derivatives, evaluated in one vectorized pass
+# @input reactors: a Reactor, a list of Reactor, a Reactor_Fleet or a dictionary {name: array} of parameters
+# @input swing: relative change of the parameters for the tornado [default = 0.1 -> ±10%]
+# @return Sensitivity_Result
+def sensitivity_analysis(reactors, swing = 0.1):
+    return Sensitivity_Result(parameter_arrays(reactors), swing = swing)
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import time
+import argparse
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .core import LCOE_COMPONENTS, PARAMETER_NAMES
+from .designs import design_registry
+from .cache import RESULT_CACHE_FILE, Result_Cache
+from .instrumentation import Metrics
+from .cli import BATCH_OUTPUT_COLUMNS, evaluate_records
+
+## HTTP service:
+
+# long-lived JSON service for dashboards, it only uses the standard library (asyncio) and listens on localhost by default
+#   POST /lcoe     body: one record or a list of records like the rows of the batch command (raw parameters, "design",
+#                  "scenario"/"region"/"year"), response: the records with LCOE_COMPONENTS and "error" (see BATCH_OUTPUT_COLUMNS)
+#                  a record has to be a json object of numbers and strings (numbers for the parameters), otherwise the
+#                  request is refused with 400; values out of their range (see PARAMETER_CHECKS) only give an error in their row
+#   GET /metrics   latency percentiles, throughput, queue and batch sizes
+#   GET /health
+# the records of concurrent requests are queued and evaluated together: the batcher waits batch_interval seconds after the
+# first queued record (or until max_batch records) and evaluates the micro-batch with one evaluate_records() call
+# backpressure: when max_queue records are waiting the requests are refused with 503 and a Retry-After header
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8765
+SERVICE_MAX_BODY = 16 * 2**20 # [bytes]
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+NUMERIC_COLUMNS = PARAMETER_NAMES + ("capacity_factor",)
+
+# @return error message of a @input record that is not a json object of numbers and strings, "" for a valid record
+def record_problem(record):
+    if(not isinstance(record, dict)):
+        return "the body has to be a json object or a list of objects"
+    for name, value in record.items():
+        if(value is not None and not isinstance(value, (str, int, float))):
+            return f"invalid {name}: {value!r}, it has to be a number or a string"
+        if(name in NUMERIC_COLUMNS and isinstance(value, str) and value != ""):
+            try:
+                float(value)
+            except ValueError:
+                return f"invalid {name}: {value!r}, it has to be a number"
+    return ""
+
+# evaluate_records() of every record alone, used when a micro-batch fails: only the records that fail get the error
+# @return (dictionary {component: array}, list of error messages) like evaluate_records()
+def evaluate_each(records, cache = None):
+    components = {component: np.full(len(records), np.nan) for component in LCOE_COMPONENTS}
+    errors = [""] * len(records)
+    for i, record in enumerate(records):
+        try:
+            result, error = evaluate_records([record], cache)
+        except Exception as exception:
+            errors[i] = f"evaluation failed: {exception!r}"
+            continue
+        for component in LCOE_COMPONENTS:
+            components[component][i] = result[component][0]
+        errors[i] = error[0]
+    return components, errors
+
+class LCOE_Service:
+    def __init__(self, host = SERVICE_HOST, port = SERVICE_PORT, batch_interval = 0.005, max_batch = 4096, max_queue = 100000, cache = None):
+        self.host = host
+        self.port = port
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+        self.cache = cache
+        self.metrics = Metrics() # "request": latency of every request, "batch": evaluation of every micro-batch
+        self.queue = None
+        self.server = None
+        self.batcher = None
+        self.executor = ThreadPoolExecutor(max_workers = 1) # one evaluation at a time, in order
+        self.rejected = 0
+    
+    # start listening and start the batcher, with port 0 a free port is chosen and saved in @var port
+    async def start(self):
+        self.queue = asyncio.Queue()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.batcher = asyncio.create_task(self.run_batcher())
+    
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.batcher.cancel()
+    
+    async def serve_forever(self):
+        await self.start()
+        print(f"LCOE service listening on http://{self.host}:{self.port}")
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+    
+    # collect a micro-batch of queued (record, future) and evaluate it in a worker thread, so the connections keep being served
+    async def run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while(True):
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_interval
+            while(len(batch) < self.max_batch):
+                timeout = deadline - loop.time()
+                if(timeout <= 0):
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            while(len(batch) < self.max_batch and not self.queue.empty()):
+                batch.append(self.queue.get_nowait())
+            records = [record for record, future in batch]
+            start = time.perf_counter()
+            try:
+                components, errors = await loop.run_in_executor(self.executor, evaluate_records, records, self.cache)
+            except Exception:
+                components, errors = await loop.run_in_executor(self.executor, evaluate_each, records, self.cache)
+            self.metrics.record("batch", time.perf_counter() - start, len(batch))
+            columns = [np.where(np.isnan(components[component]), None, components[component]).tolist() for component in LCOE_COMPONENTS] + [errors]
+            for (record, future), row in zip(batch, zip(*columns)):
+                if(not future.done()):
+                    future.set_result(dict(record, **dict(zip(BATCH_OUTPUT_COLUMNS, row))))
+    
+    # queue the @input records and wait for their results
+    # @return (status, body) of the response
+    async def evaluate(self, records):
+        if(self.queue.qsize() + len(records) > self.max_queue):
+            self.rejected += 1
+            return 503, {"error": "too many queued records, retry later"}
+        loop = asyncio.get_running_loop()
+        futures = []
+        for record in records:
+            futures.append(loop.create_future())
+            self.queue.put_nowait((record, futures[-1]))
+        return 200, await asyncio.gather(*futures)
+    
+    # @return dictionary with latency percentiles [ms], throughput and queue state
+    def snapshot(self):
+        snapshot = self.metrics.snapshot()
+        request = snapshot["stages"].get("request", {"calls": 0, "rows": 0, "p50_seconds": 0.0, "p99_seconds": 0.0})
+        batch = snapshot["stages"].get("batch", {"calls": 0, "rows": 0})
+        return {"requests": request["calls"], "records": request["rows"], "rejected": self.rejected,
+                "p50_ms": request["p50_seconds"] * 1000, "p99_ms": request["p99_seconds"] * 1000,
+                "requests_per_second": request["calls"] / snapshot["elapsed_seconds"], "records_per_second": request["rows"] / snapshot["elapsed_seconds"],
+                "batches": batch["calls"], "mean_batch_size": batch["rows"] / batch["calls"] if batch["calls"] else 0.0, "queued": self.queue.qsize()}
+    
+    # @return (status, body) of the response to @input method @input path with the json @input body
+    async def route(self, method, path, body):
+        if(path == "/health"):
+            return 200, {"status": "ok"}
+        if(path == "/metrics"):
+            return 200, self.snapshot()
+        if(path != "/lcoe"):
+            return 404, {"error": f"unknown path {path}"}
+        if(method != "POST"):
+            return 405, {"error": "use POST with a json record or list of records"}
+        try:
+            records = json.loads(body or b"null")
+        except ValueError as error:
+            return 400, {"error": f"invalid json: {error}"}
+        single = isinstance(records, dict)
+        records = [records] if single else records
+        if(not isinstance(records, list)):
+            return 400, {"error": "the body has to be a json object or a list of objects"}
+        for i, record in enumerate(records):
+            problem = record_problem(record)
+            if(problem):
+                return 400, {"error": problem if single else f"record {i}: {problem}"}
+        start = time.perf_counter()
+        status, result = await self.evaluate(records)
+        if(status == 200):
+            self.metrics.record("request", time.perf_counter() - start, len(records))
+            result = result[0] if single else result
+        return status, result
+    
+    # HTTP/1.1 with keep-alive, only the Content-Length of the body is supported
+    # a request that can not be parsed gets 400 and an unexpected error 500, then the connection is closed
+    async def handle_connection(self, reader, writer):
+        try:
+            while(True):
+                request_line = await reader.readline()
+                if(not request_line):
+                    break
+                headers = {}
+                while(True):
+                    line = await reader.readline()
+                    if(line in (b"\r\n", b"\n", b"")):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                except ValueError:
+                    status, result = 400, {"error": "invalid HTTP request"}
+                    keep_alive = False
+                else:
+                    if(length > SERVICE_MAX_BODY or length < 0):
+                        status, result = 413, {"error": f"body larger than {SERVICE_MAX_BODY} bytes"}
+                        keep_alive = False
+                    else:
+                        body = await reader.readexactly(length) if length else b""
+                        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                        try:
+                            status, result = await self.route(method, path.split("?")[0], body)
+                        except Exception as error:
+                            status, result = 500, {"error": f"internal error: {error!r}"}
+                            keep_alive = False
+                payload = json.dumps(result).encode()
+                extra = "Retry-After: 1\r\n" if status == 503 else ""
+                writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n{extra}Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + payload)
+                await writer.drain()
+                if(not keep_alive):
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+# blocking client of LCOE_Service for scripts and tests, one keep-alive connection
+# example: LCOE_Client().lcoe({"design": "APR1400 (Korea)"})["LCOE"]
+class LCOE_Client:
+    def __init__(self, host = SERVICE_HOST, port = SERVICE_PORT, timeout = 60):
+        self.connection = http.client.HTTPConnection(host, port, timeout = timeout)
+    
+    # @return (status, json body) of the response
+    def request(self, method, path, body = None):
+        self.connection.request(method, path, body = None if body is None else json.dumps(body), headers = {"Content-Type": "application/json"})
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+    
+    # @return result of one record (dictionary) or of a list of records, raise RuntimeError if the service refuses the request
+    def lcoe(self, records):
+        status, result = self.request("POST", "/lcoe", records)
+        if(status != 200):
+            raise RuntimeError(f"LCOE service error {status}: {result.get('error')}")
+        return result
+    
+    def metrics(self):
+        return self.request("GET", "/metrics")[1]
+    
+    def close(self):
+        self.connection.close()
+
+# @input argv: command line arguments, see "python 'LCOE program.py' serve --help"
+def serve_main(argv = None):
+    parser = argparse.ArgumentParser(prog = "LCOE program.py serve", description = "Serve LCOE queries as json over HTTP with micro-batching.")
+    parser.add_argument("--host", default = SERVICE_HOST, help = f"address to listen on [default: {SERVICE_HOST}]")
+    parser.add_argument("--port", type = int, default = SERVICE_PORT, help = f"port [default: {SERVICE_PORT}]")
+    parser.add_argument("--batch-interval", type = float, default = 5.0, help = "milliseconds the batcher waits to fill a micro-batch [default: 5]")
+    parser.add_argument("--max-batch", type = int, default = 4096, help = "records in a micro-batch [default: 4096]")
+    parser.add_argument("--max-queue", type = int, default = 100000, help = "queued records before refusing requests [default: 100000]")
+    parser.add_argument("--catalog", action = "append", default = [], help = "design catalog file (csv or json), can be repeated")
+    parser.add_argument("--cache", nargs = "?", const = RESULT_CACHE_FILE, help = f"use the persistent result cache [default file: {RESULT_CACHE_FILE}]")
+    arguments = parser.parse_args(argv)
+    for catalog in arguments.catalog:
+        design_registry().load(catalog)
+    cache = Result_Cache(arguments.cache) if arguments.cache else None
+    service = LCOE_Service(arguments.host, arguments.port, arguments.batch_interval / 1000, arguments.max_batch, arguments.max_queue, cache)
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
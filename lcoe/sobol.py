@@ -0,0 +1,214 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+from .core import LCOE_COMPONENTS, PARAMETER_NAMES, Reactor, format_table
+from .batch import LCOE_batch_calculator
+from .designs import Reactor_Design
+from .montecarlo import check_distributions
+
+## global sensitivity analysis (Sobol indices):
+
+# Sobol low-discrepancy sequence, direction numbers of S. Joe and F. Y. Kuo (new-joe-kuo-6.21201, https://web.maths.unsw.edu.au/~fkuo/sobol/)
+# one row (degree s, coefficients a, initial m_1 ... m_s) of the primitive polynomial for every dimension from the second one,
+# the first dimension has all m = 1; the Saltelli sampling uses 2 dimensions for every input, so up to 10 inputs
+SOBOL_DIRECTIONS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+)
+SOBOL_MAX_DIMENSIONS = len(SOBOL_DIRECTIONS) + 1
+SOBOL_BITS = 32 # up to 2**32 points
+
+# @return (dimensions x SOBOL_BITS) uint64 array with the direction numbers V_j = m_j * 2**(SOBOL_BITS - j)
+@lru_cache(maxsize = None)
+def sobol_direction_numbers(dimensions):
+    if(dimensions > SOBOL_MAX_DIMENSIONS):
+        raise ValueError(f"The Sobol sequence has at most {SOBOL_MAX_DIMENSIONS} dimensions, {dimensions} requested")
+    directions = np.zeros((dimensions, SOBOL_BITS), dtype = np.uint64)
+    directions[0] = [1 << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+    for dimension, (s, a, m) in enumerate(SOBOL_DIRECTIONS[:dimensions - 1], start = 1):
+        m = list(m)
+        for j in range(s, SOBOL_BITS):
+            value = m[j - s] ^ (m[j - s] << s)
+            for k in range(1, s):
+                value ^= ((a >> (s - 1 - k)) & 1) * (m[j - k] << k)
+            m.append(value)
+        directions[dimension] = [m[j] << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+    return directions
+
+# first @input samples points of the Sobol sequence in @input dimensions (Gray code order), as a (samples x dimensions) array in (0, 1)
+# @input scramble: random digital shift (xor with a random number for every dimension) drawn from @input seed,
+#                  it keeps the uniformity of the sequence and makes the estimates unbiased [default = True]
+# a power of 2 of samples keeps the balance of the sequence
+def sobol_points(samples, dimensions, seed = None, scramble = True):
+    directions = sobol_direction_numbers(dimensions)
+    index = np.arange(samples, dtype = np.uint64)
+    gray = index ^ (index >> np.uint64(1))
+    points = np.zeros((samples, dimensions), dtype = np.uint64)
+    for bit in range(max(samples - 1, 0).bit_length()):
+        points[((gray >> np.uint64(bit)) & np.uint64(1)).astype(bool)] ^= directions[:, bit]
+    if(scramble):
+        points ^= np.random.default_rng(seed).integers(0, 2**SOBOL_BITS, dimensions, dtype = np.uint64)
+    return (points.astype(np.float64) + 0.5) / 2**SOBOL_BITS
+
+# tabulated inverse cumulative distributions, for the distributions without a closed form inverse (numpy has none)
+# @return (cumulative probabilities, values) increasing, for np.interp()
+@lru_cache(maxsize = None)
+def normal_quantile_table(size = 1 << 14):
+    x = np.linspace(-8.5, 0.0, size)
+    return 0.5 * np.vectorize(math.erfc)(-x / math.sqrt(2)), x
+
+@lru_cache(maxsize = 64)
+def beta_quantile_table(a, b, size = 1 << 14):
+    x = np.linspace(0.0, 1.0, size + 1)
+    middle = (x[:-1] + x[1:]) / 2 # the density is evaluated in the middle of the intervals, finite also for a < 1 or b < 1
+    density = np.exp((a - 1) * np.log(middle) + (b - 1) * np.log1p(-middle) + math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b))
+    cumulative = np.concatenate(([0.0], np.cumsum(density)))
+    return cumulative / cumulative[-1], x
+
+# values of the distribution tuple @input distribution (see MONTE_CARLO_DISTRIBUTIONS) at the probabilities @input u in (0, 1)
+def distribution_quantiles(distribution, u):
+    kind, *arguments = distribution
+    if(kind == "uniform"):
+        return arguments[0] + u * (arguments[1] - arguments[0])
+    elif(kind == "triangular"):
+        low, mode, high = arguments
+        split = (mode - low) / (high - low)
+        return np.where(u < split, low + np.sqrt(u * (high - low) * (mode - low)), high - np.sqrt((1 - u) * (high - low) * (high - mode)))
+    elif(kind == "lognormal"):
+        probabilities, values = normal_quantile_table()
+        normal = np.where(u < 0.5, np.interp(u, probabilities, values), -np.interp(1 - u, probabilities, values))
+        return arguments[0] * np.exp(arguments[1] * normal)
+    elif(kind == "beta"):
+        low, high = (arguments[2], arguments[3]) if len(arguments) == 4 else (0, 1)
+        probabilities, values = beta_quantile_table(float(arguments[0]), float(arguments[1]))
+        return low + (high - low) * np.interp(u, probabilities, values)
+    raise ValueError(f"Unknown distribution {kind!r}")
+
+# uniform distributions ±@input spread around every non zero parameter of @input reactor
+# @return dictionary {name: ("uniform", low, high)}
+def default_distributions(reactor, spread = 0.2):
+    values = reactor.parameter_values()
+    return {name: ("uniform", min(values[name] * (1 - spread), values[name] * (1 + spread)), max(values[name] * (1 - spread), values[name] * (1 + spread))) for name in PARAMETER_NAMES if values[name] != 0}
+
+# model runs of the Saltelli scheme for the rows of the unit samples @input A and @input B (rows x inputs), executed inside the worker processes
+# the matrices A, B and AB_i (A with the column i of B) are stacked and evaluated in one batch
+# @return ((inputs + 2) x rows) array with the @input output of A, B, AB_1 ... AB_k
+def saltelli_chunk(base_values, distributions, A, B, output = "LCOE"):
+    names = list(distributions)
+    inputs = len(names)
+    stacked = np.concatenate([A, B] + [np.where(np.arange(inputs) == i, B, A) for i in range(inputs)])
+    values = dict(base_values)
+    for column, name in enumerate(names):
+        sampled = distribution_quantiles(distributions[name], stacked[:, column])
+        if(name == "capacity_factor"):
+            values["utilization_hours"] = np.rint(sampled * 365 * 24)
+        else:
+            values[name] = sampled
+    values = {name: np.broadcast_to(value, len(stacked)) for name, value in values.items()}
+    return LCOE_batch_calculator(**values, rounded = False)[output].reshape(inputs + 2, len(A))
+
+# first order (Saltelli 2010) and total order (Jansen) estimators of the model runs @input runs ((inputs + 2) x ... x samples)
+# @return (first order, total order) arrays (inputs x ...)
+def sobol_indices(runs):
+    f_A, f_B, f_AB = runs[0], runs[1], runs[2:]
+    variance = np.var(np.concatenate((f_A, f_B), axis = -1), axis = -1)
+    first = np.mean(f_B * (f_AB - f_A), axis = -1) / variance
+    total = 0.5 * np.mean((f_A - f_AB)**2, axis = -1) / variance
+    return first, total
+
+# Sobol indices of the inputs @var names with bootstrap confidence intervals
+# @var first, total arrays of first and total order indices, @var first_interval, total_interval (inputs x 2) arrays
+# @var runs ((inputs + 2) x samples) array with the model runs
+class Sobol_Result:
+    def __init__(self, names, runs, output = "LCOE", bootstrap = 200, confidence = 0.95, seed = None, bootstrap_chunk = 32):
+        self.names = names
+        self.runs = runs
+        self.output = output
+        self.confidence = confidence
+        self.first, self.total = sobol_indices(runs)
+        rng = np.random.default_rng(seed)
+        samples = runs.shape[1]
+        first, total = [], []
+        for start in range(0, bootstrap, bootstrap_chunk):
+            resamples = rng.integers(0, samples, (min(bootstrap_chunk, bootstrap - start), samples))
+            estimates = sobol_indices(runs[:, resamples])
+            first.append(estimates[0])
+            total.append(estimates[1])
+        q = (50 * (1 - confidence), 50 * (1 + confidence))
+        if(bootstrap):
+            self.first_interval = np.percentile(np.concatenate(first, axis = 1), q, axis = 1).T
+            self.total_interval = np.percentile(np.concatenate(total, axis = 1), q, axis = 1).T
+        else:
+            self.first_interval = self.total_interval = np.full((len(names), 2), np.nan)
+
+    @property
+    def samples(self):
+        return self.runs.shape[1]
+
+    # @return dictionary {name: (first order, total order)}
+    def indices(self):
+        return {name: (float(first), float(total)) for name, first, total in zip(self.names, self.first, self.total)}
+
+    # @return string with the table of the indices sorted by total order
+    def table(self):
+        names = dict(zip(PARAMETER_NAMES, [value.print_name() for value in Reactor().list_value]))
+        names["capacity_factor"] = "Capacity factor"
+        level = f"{self.confidence*100:g}%"
+        rows = [[names.get(self.names[i], self.names[i]), f"{self.first[i]:.4f}", f"[{self.first_interval[i, 0]:.4f}, {self.first_interval[i, 1]:.4f}]",
+                 f"{self.total[i]:.4f}", f"[{self.total_interval[i, 0]:.4f}, {self.total_interval[i, 1]:.4f}]"] for i in np.argsort(-self.total, kind = "stable")]
+        return format_table(["Parameter", "First order", f"{level} interval", "Total order", f"{level} interval"], rows)
+
+    def __repr__(self):
+        return f"Sobol indices of {self.output}, samples: {self.samples}, model runs: {self.runs.size}, interactions: {1 - self.first.sum():.4f}\n" + self.table()
+
+# variance based global sensitivity analysis: first and total order Sobol indices of the @input output of LCOE_batch_calculator()
+# the inputs are the parameters in @input distributions {name: distribution tuple} (see MONTE_CARLO_DISTRIBUTIONS),
+# by default every parameter of the reactor is uniform ±@input spread around its value
+# the other parameters are the ones of the default Reactor() or of the design @input design_name or of the @input reactor
+# @input samples: base samples N of the Saltelli scheme, the model runs are N * (inputs + 2) [default = 8192]
+# @input workers: number of processes [default = number of CPUs], with 1 everything runs in this process
+# @input chunk_size: base samples of every task, the task evaluates its chunk_size * (inputs + 2) runs in one batch
+# @input bootstrap: number of bootstrap resamples for the @input confidence intervals
+# @input seed: seed of the digital shift of the Sobol points and of the bootstrap, the result does not depend on the workers
+# @return Sobol_Result
+def sobol_analysis(distributions = None, reactor = None, design_name = None, samples = 8192, workers = None, chunk_size = 8192, bootstrap = 200, confidence = 0.95, seed = None, output = "LCOE", spread = 0.2):
+    if(reactor is None):
+        reactor = Reactor_Design(design_name = design_name) if design_name is not None else Reactor()
+    if(distributions is None):
+        distributions = default_distributions(reactor, spread)
+    check_distributions(distributions)
+    if(output not in LCOE_COMPONENTS):
+        raise ValueError(f"Unknown output {output!r}, it has to be one of {LCOE_COMPONENTS}")
+    inputs = len(distributions)
+    if(2 * inputs > SOBOL_MAX_DIMENSIONS):
+        raise ValueError(f"At most {SOBOL_MAX_DIMENSIONS // 2} inputs, {inputs} given")
+    shift_seed, bootstrap_seed = np.random.SeedSequence(seed).spawn(2)
+    points = sobol_points(samples, 2 * inputs, seed = shift_seed)
+    A, B = points[:, :inputs], points[:, inputs:]
+    starts = range(0, samples, chunk_size)
+    arguments = ([reactor.parameter_values()] * len(starts), [distributions] * len(starts), [A[start:start + chunk_size] for start in starts], [B[start:start + chunk_size] for start in starts], [output] * len(starts))
+    if(workers == 1 or len(starts) == 1):
+        runs = list(map(saltelli_chunk, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers = workers) as executor:
+            runs = list(executor.map(saltelli_chunk, *arguments))
+    return Sobol_Result(list(distributions), np.concatenate(runs, axis = 1), output, bootstrap, confidence, bootstrap_seed)
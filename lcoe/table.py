@@ -0,0 +1,85 @@
+import math
+import numpy as np
+from .core import format_table
+
+## tables:
+
+# first occurrence order of the distinct rows of the @input columns (list of arrays)
+# @return (index of the first row of every group, group number of every row) with the groups in order of appearance
+def group_rows(columns):
+    codes = np.zeros(len(columns[0]), dtype = np.int64)
+    for column in columns:
+        values, inverse = np.unique(column, return_inverse = True)
+        codes = codes * len(values) + inverse.reshape(-1)
+    codes, first, inverse = np.unique(codes, return_index = True, return_inverse = True)
+    appearance = np.argsort(first, kind = "stable")
+    rank = np.empty_like(appearance)
+    rank[appearance] = np.arange(len(appearance))
+    return first[appearance], rank[inverse.reshape(-1)]
+
+# columnar table: a dictionary {column name: numpy array} with arrays of the same length
+# the string is built once with format_table(), so printing is linear in the number of rows
+class Table:
+    AGGREGATIONS = {"min": np.minimum, "max": np.maximum, "sum": np.add}
+
+    def __init__(self, columns):
+        self.columns = {name: np.asarray(values) for name, values in columns.items()}
+    
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+    
+    def __getitem__(self, name):
+        return self.columns[name]
+    
+    # @return list of dictionaries, one for each row
+    def rows(self):
+        return [dict(zip(self.columns, row)) for row in zip(*[values.tolist() for values in self.columns.values()])]
+    
+    # @return a new Table with the rows sorted by the column @input by
+    def sort(self, by, descending = False):
+        order = np.argsort(self.columns[by], kind = "stable")
+        if(descending):
+            order = order[::-1]
+        return Table({name: values[order] for name, values in self.columns.items()})
+    
+    # aggregation of the column @input value for every group of the @input keys (a column name or a list)
+    # @input aggregations: names among "min", "max", "sum", "mean", "count"
+    # @return Table with the key columns and one column "value_aggregation" for every aggregation
+    def group_by(self, keys, value, aggregations = ("min", "max", "mean")):
+        keys = [keys] if isinstance(keys, str) else list(keys)
+        first, group = group_rows([self.columns[key] for key in keys])
+        order = np.argsort(group, kind = "stable")
+        values = self.columns[value][order].astype(np.float64)
+        starts = np.searchsorted(group[order], np.arange(len(first)))
+        counts = np.diff(np.append(starts, len(values)))
+        result = {key: self.columns[key][first] for key in keys}
+        for aggregation in aggregations:
+            if(aggregation == "count"):
+                result[f"{value}_count"] = counts
+            elif(aggregation == "mean"):
+                result[f"{value}_mean"] = np.add.reduceat(values, starts) / counts
+            elif(aggregation in self.AGGREGATIONS):
+                result[f"{value}_{aggregation}"] = self.AGGREGATIONS[aggregation].reduceat(values, starts)
+            else:
+                raise ValueError(f"Unknown aggregation {aggregation!r}, it has to be one of {tuple(self.AGGREGATIONS) + ('mean', 'count')}")
+        return Table(result)
+    
+    # pivoted table: one row for every value of @input index and one column for every value of @input columns
+    # missing combinations are NaN, every (index, columns) pair has to appear at most once (use group_by before)
+    def pivot(self, index, columns, values):
+        first_row, row = group_rows([self.columns[index]])
+        first_column, column = group_rows([self.columns[columns]])
+        if(len(np.unique(row * len(first_column) + column)) != len(row)):
+            raise ValueError(f"Duplicated ({index}, {columns}) pairs, aggregate them with group_by() before the pivot")
+        matrix = np.full((len(first_row), len(first_column)), np.nan)
+        matrix[row, column] = self.columns[values]
+        result = {index: self.columns[index][first_row]}
+        result.update({str(name): matrix[:, i] for i, name in enumerate(self.columns[columns][first_column])})
+        return Table(result)
+    
+    def __repr__(self):
+        def cell(value):
+            if(isinstance(value, float)):
+                return "-" if math.isnan(value) else f"{value:g}"
+            return str(value)
+        return format_table(list(self.columns), [[cell(value) for value in row] for row in zip(*[values.tolist() for values in self.columns.values()])])
@@ -0,0 +1,524 @@
+## tests of the LCOE calculator
+## run: python -m pytest tests
+
+import os
+import sys
+import asyncio
+import json
+import subprocess
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import lcoe
+import lcoe.service
+
+## usefull function:
+
+# @return dictionary {name: array} of @input size random reactor configurations with values rounded like the user inputs
+def random_parameters(size, seed = 0):
+    rng = np.random.default_rng(seed)
+    return {"capacity": np.full(size, 1000), "lifetime": rng.integers(20, 81, size), "utilization_hours": rng.integers(3000, 8761, size),
+            "construction_time": rng.integers(2, 12, size), "discount_rate": np.round(rng.uniform(0.01, 0.12, size), 3), "escalation_rate": np.round(rng.uniform(-0.02, 0.05, size), 3),
+            "overnight_costs": rng.integers(2000, 9000, size), "fuel_cycle_costs": np.round(rng.uniform(5, 100, size), 1), "FOM_costs": np.round(rng.uniform(50, 150, size), 1), "VOM_costs": np.round(rng.uniform(1, 20, size), 1)}
+
+# @return array (rows x components) of compute_LCOE() for every row of @input parameters
+def scalar_LCOE(parameters):
+    return np.array([lcoe.compute_LCOE(**dict(zip(parameters, row))) for row in zip(*[values.tolist() for values in parameters.values()])])
+
+## batch engine:
+
+def test_round_cents_is_python_round():
+    values = np.concatenate([np.random.default_rng(1).uniform(-1e4, 1e4, 100000), np.arange(-20000, 20000) / 1000, [3.325, 2.675, 0.005, 1.005]])
+    assert lcoe.round_cents(values).tolist() == [round(value, 2) for value in values.tolist()]
+
+@pytest.mark.parametrize("factorise", [False, True])
+def test_batch_matches_scalar(factorise):
+    parameters = random_parameters(50000)
+    batch = lcoe.LCOE_batch_calculator(**parameters, factorise = factorise)
+    scalar = scalar_LCOE(parameters)
+    for i, component in enumerate(lcoe.LCOE_COMPONENTS):
+        assert np.array_equal(batch[component], scalar[:, i]), component
+
+def test_batch_matches_scalar_on_a_cent_boundary():
+    # 13.3 * 1000 / 4000 is a bit more than 3.325
+    scalar = lcoe.compute_LCOE(1000, 60, 4000, 7, 0.07, 0.01, 4000, 70, 112, 13.3)
+    batch = lcoe.LCOE_batch_calculator(1000, 60, 4000, 7, 0.07, 0.01, 4000, 70, 112, 13.3)
+    assert scalar.VOM == 3.33 and float(batch["VOM"]) == 3.33 and float(batch["LCOE"]) == scalar.LCOE
+
+def test_batch_matches_scalar_with_non_integer_years():
+    parameters = random_parameters(5000, seed = 9)
+    rng = np.random.default_rng(10)
+    parameters["construction_time"] = np.round(rng.uniform(1.5, 12, 5000), 1)
+    parameters["lifetime"] = np.round(rng.uniform(20, 80, 5000) * 2) / 2 # halves are rounded to even like np.rint
+    parameters["discount_rate"][:100] = 0.0
+    batch = lcoe.LCOE_batch_calculator(**parameters)
+    scalar = scalar_LCOE(parameters)
+    for i, component in enumerate(lcoe.LCOE_COMPONENTS):
+        assert np.array_equal(batch[component], scalar[:, i]), component
+
+def test_sweep_matches_batch_on_the_full_grid():
+    grid = {"discount_rate": np.linspace(0.0, 0.12, 13), "overnight_costs": np.linspace(2000, 9000, 15), "lifetime": np.arange(30, 81, 10)}
+    sweep = lcoe.LCOE_sweep(**grid)
+    values = lcoe.Reactor().parameter_values()
+    values.update({name: sweep[name] for name in grid})
+    batch = lcoe.LCOE_batch_calculator(**values)
+    for component in lcoe.LCOE_COMPONENTS:
+        assert sweep[component].shape == (13 * 15 * 6,) and np.array_equal(sweep[component], batch[component]), component
+
+## Monte Carlo:
+
+MONTE_CARLO_DISTRIBUTIONS = {"overnight_costs": ("triangular", 3500, 4000, 6000), "discount_rate": ("uniform", 0.05, 0.09), "capacity_factor": ("beta", 8, 2, 0.6, 0.95)}
+
+def test_monte_carlo_does_not_depend_on_the_workers():
+    single = lcoe.monte_carlo_LCOE(MONTE_CARLO_DISTRIBUTIONS, samples = 20000, chunk_size = 3000, workers = 1, seed = 15)
+    parallel = lcoe.monte_carlo_LCOE(MONTE_CARLO_DISTRIBUTIONS, samples = 20000, chunk_size = 3000, workers = 3, seed = 15)
+    for component in lcoe.LCOE_COMPONENTS:
+        assert np.array_equal(single.samples[component], parallel.samples[component]), component
+    assert len(single) == 20000 and 0 < np.std(single.samples["LCOE"])
+
+def test_monte_carlo_rejects_no_samples():
+    with pytest.raises(ValueError):
+        lcoe.monte_carlo_LCOE(MONTE_CARLO_DISTRIBUTIONS, samples = 0)
+
+## sensitivity analysis:
+
+def test_gradient_matches_finite_differences():
+    parameters = {name: values.astype(np.float64) for name, values in random_parameters(1000, seed = 16).items()}
+    gradient, components = lcoe.LCOE_gradient_batch(parameters)
+    for name in lcoe.PARAMETER_NAMES:
+        step = 1e-6 * np.maximum(np.abs(parameters[name]), 1e-3)
+        plus = lcoe.LCOE_gradient_batch(dict(parameters, **{name: parameters[name] + step}))[1]["LCOE"]
+        minus = lcoe.LCOE_gradient_batch(dict(parameters, **{name: parameters[name] - step}))[1]["LCOE"]
+        assert np.allclose(gradient[name], (plus - minus) / (2 * step), rtol = 1e-5, atol = 1e-9), name
+
+def test_tornado_recomputes_the_LCOE():
+    reactor = lcoe.Reactor()
+    result = lcoe.sensitivity_analysis(reactor, swing = 0.2)
+    values = reactor.parameter_values()
+    for i, name in enumerate(lcoe.PARAMETER_NAMES):
+        for sign, LCOE in ((-1, result.low), (1, result.high)):
+            expected = lcoe.LCOE_batch_calculator(**dict(values, **{name: values[name] * (1 + sign * 0.2)}), rounded = False)["LCOE"]
+            assert LCOE[0, i] == expected, name
+    assert "LCOE -20%" in result.table(0)
+
+def test_sobol_indices_of_an_additive_function():
+    # f = x1 + 2 x2 + 0 x3 with uniform inputs: the indices are the shares of the variance 1 : 4 : 0, without interactions
+    points = lcoe.sobol_points(1 << 14, 6, seed = 22)
+    A, B = points[:, :3], points[:, 3:]
+    model = lambda x: x @ np.array([1.0, 2.0, 0.0])
+    runs = np.stack([model(A), model(B)] + [model(np.where(np.arange(3) == i, B, A)) for i in range(3)])
+    first, total = lcoe.sobol_indices(runs)
+    assert np.allclose(first, [0.2, 0.8, 0.0], atol = 2e-3) and np.allclose(total, [0.2, 0.8, 0.0], atol = 2e-3)
+    # the LCOE is linear in the O&M and fuel costs: uniform costs with widths 40, 10 and 20 give the shares 16 : 1 : 4
+    distributions = {"FOM_costs": ("uniform", 100, 140), "VOM_costs": ("uniform", 5, 15), "fuel_cycle_costs": ("uniform", 10, 30)}
+    single = lcoe.sobol_analysis(distributions, samples = 16384, chunk_size = 4096, workers = 1, bootstrap = 20, seed = 23)
+    parallel = lcoe.sobol_analysis(distributions, samples = 16384, chunk_size = 4096, workers = 2, bootstrap = 20, seed = 23)
+    assert np.array_equal(single.first, parallel.first) and np.array_equal(single.total, parallel.total)
+    # the first order estimator is noisier than the total order one on an output with a large mean
+    assert np.allclose(single.first, np.array([16, 1, 4]) / 21, atol = 1e-2) and np.allclose(single.total, np.array([16, 1, 4]) / 21, atol = 1e-4)
+
+## inverse solver:
+
+@pytest.mark.parametrize("parameter", ["overnight_costs", "discount_rate", "escalation_rate"])
+def test_break_even_reaches_the_target(parameter):
+    parameters = random_parameters(2000, seed = 11)
+    wanted = dict(parameters, **{parameter: parameters[parameter] * np.random.default_rng(12).uniform(0.5, 1.5, 2000)})
+    target = lcoe.LCOE_batch_calculator(**wanted, rounded = False)["LCOE"]
+    result = lcoe.break_even(parameters, parameter, target)
+    assert result.converged.all()
+    LCOE = lcoe.LCOE_batch_calculator(**dict(parameters, **{parameter: result.value}), rounded = False)["LCOE"]
+    assert np.abs(LCOE - target).max() <= 1e-6
+    assert np.allclose(result.value, wanted[parameter], rtol = 1e-6, atol = 1e-6)
+
+## learning curve:
+
+def test_learning_curve_follows_wright_law():
+    costs = lcoe.learning_curve_costs(4000, [0.0, 0.05, 0.1], 64)
+    assert np.array_equal(costs[0], np.full(64, 4000.0))
+    for row, learning_rate in zip(costs[1:], (0.05, 0.1)):
+        # every doubling of the units reduces the cost by the learning rate
+        assert np.allclose(row[[1, 3, 7, 15, 31, 63]], 4000 * (1 - learning_rate) ** np.arange(1, 7), rtol = 1e-12)
+    build_out = lcoe.fleet_build_out(learning_rate = 0.1, schedule = [1, 2, 4, 8])
+    sweep = lcoe.learning_sweep(learning_rates = [0.1], schedules = [[1, 2, 4, 8]])
+    assert len(build_out) == 15 and build_out.year.tolist() == [1, 2, 2, 3, 3, 3, 3] + [4] * 8
+    assert sweep["fleet_LCOE"][0] == round(build_out.fleet_LCOE, 2) and sweep["total_capital_M$"][0] == round(build_out.total_capital, 2)
+    with pytest.raises(ValueError):
+        lcoe.fleet_build_out(schedule = [1, -1])
+
+## long term operation:
+
+def test_LTO_rebuild_has_the_base_capital():
+    reactor = lcoe.Reactor()
+    values = reactor.parameter_values()
+    base = lcoe.compute_LCOE(**values)
+    # a refurbishment that costs and lasts like the construction, followed by a second lifetime
+    result = lcoe.LTO_LCOE(reactor, [{"extension": values["lifetime"], "refurbishment_costs": [values["overnight_costs"], 0], "outage": values["construction_time"], "O_M_uplift": 0}])
+    period = result.periods[0]
+    assert period["CAPITAL"].tolist() == [base.CAPITAL, 0] and period["FOM"].tolist() == [base.FOM] * 2 and period["DECOMMISSIONING"].tolist() == [0, 0]
+    assert (np.minimum(period["LCOE"], base.LCOE) < result.whole_life).all() and (result.whole_life < np.maximum(period["LCOE"], base.LCOE)).all()
+
+@pytest.mark.parametrize("period", [{"extension": 0}, {"extension": [20, -5]}, {"extension": np.nan}, {"outage": -1}, {"outage": np.nan}, {"lifetime": 20}])
+def test_LTO_rejects_invalid_periods(period):
+    with pytest.raises(ValueError):
+        lcoe.LTO_LCOE(periods = [dict({"extension": 20, "refurbishment_costs": 1000, "outage": 1, "O_M_uplift": 0.1}, **period)])
+
+## discounted cash flow:
+
+def test_DCF_matches_batch_on_flat_inputs():
+    parameters = random_parameters(100000, seed = 11)
+    batch = lcoe.LCOE_batch_calculator(**parameters)
+    flat = lcoe.DCF_calculator(parameters)
+    # the same yearly values written year by year
+    yearly = lcoe.DCF_calculator(parameters, FOM_costs = lcoe.escalation_path(parameters["FOM_costs"], 0.0, 80))
+    for component in lcoe.LCOE_COMPONENTS:
+        assert np.array_equal(flat[component], batch[component]), component
+        assert np.array_equal(yearly[component], batch[component]), component
+
+def test_DCF_discounts_the_yearly_costs():
+    reactor = lcoe.Reactor()
+    values = reactor.parameter_values()
+    fuel = lcoe.escalation_path(values["fuel_cycle_costs"], 0.02, values["lifetime"])
+    discount = (1 + values["discount_rate"]) ** -np.arange(1, values["lifetime"] + 1)
+    expected = (fuel * discount).sum() / (values["utilization_hours"] * discount.sum()) * 1000
+    result = lcoe.DCF_calculator(reactor, fuel_cycle_costs = fuel)
+    assert result["FUEL"][0] == round(float(expected), 2) and result["FUEL"][0] > lcoe.DCF_calculator(reactor)["FUEL"][0]
+
+## incremental recomputation:
+
+def test_reactor_edits_match_compute_LCOE():
+    rng = np.random.default_rng(2)
+    parameters = random_parameters(2000, seed = 3)
+    reactor = lcoe.Reactor()
+    for i in range(2000):
+        name = lcoe.PARAMETER_NAMES[rng.integers(len(lcoe.PARAMETER_NAMES))]
+        reactor.set_parameter(name, parameters[name][i].item())
+        assert reactor.LCOE_calculator(quiet = True) == lcoe.compute_LCOE(**reactor.parameter_values())
+    assert reactor.list_print == [value.print_value() for value in reactor.list_value]
+
+def test_fleet_round_trip_returns_the_same_reactors():
+    reactors = [lcoe.Reactor()] + [lcoe.Reactor_Design(design_name = name) for name in lcoe.design_registry().names()]
+    fleet = lcoe.Reactor_Fleet.from_reactors(reactors)
+    for reactor, copy in zip(reactors, fleet.to_reactors()):
+        assert [(type(value), value) for value in copy.parameter_values().values()] == [(type(value), value) for value in reactor.parameter_values().values()]
+        assert copy.list_print == reactor.list_print and copy.LCOE_result() == reactor.LCOE_result()
+    assert fleet.take([2, 1]).to_reactor(1).list_print == reactors[1].list_print
+    fleet.edit([1], FOM_costs = 90.5)
+    assert fleet.parameter_values(1)["FOM_costs"] == 90.5 and fleet.to_reactor(2).list_print == reactors[2].list_print
+
+def test_fleet_edits_match_LCOE():
+    rng = np.random.default_rng(4)
+    fleet = lcoe.Reactor_Fleet(random_parameters(20000, seed = 5))
+    tracked = fleet.tracked_LCOE()
+    edits = random_parameters(500, seed = 6)
+    for name in lcoe.PARAMETER_NAMES:
+        fleet.edit(rng.choice(len(fleet), 500, replace = False), **{name: edits[name]})
+    full = fleet.LCOE()
+    for component in lcoe.LCOE_COMPONENTS:
+        assert np.array_equal(tracked[component], full[component]), component
+
+## compact mode:
+
+def test_compact_deviation_stays_under_the_limit():
+    parameters = random_parameters(200000, seed = 25)
+    rng = np.random.default_rng(26)
+    # full precision values, not rounded like the user inputs
+    for name in ("discount_rate", "escalation_rate", "overnight_costs", "fuel_cycle_costs", "FOM_costs", "VOM_costs"):
+        parameters[name] = parameters[name] * rng.uniform(0.99, 1.01, 200000)
+    check = lcoe.precision_check(parameters)
+    assert check.rows == 200000 and check.passed and max(check.max_deviation.values()) < lcoe.COMPACT_ERROR_LIMIT
+    assert not lcoe.precision_check(parameters, limit = 1e-12).passed
+    with pytest.raises(ValueError):
+        lcoe.compact_array("lifetime", [60, 300])
+
+def test_compact_sweep_is_the_sweep_in_float32():
+    grid = {"discount_rate": np.linspace(0.0, 0.12, 25), "overnight_costs": np.linspace(2000, 9000, 29), "lifetime": np.arange(30, 81, 5)}
+    sweep = lcoe.LCOE_sweep(**grid)
+    compact = lcoe.compact_LCOE_sweep(slice_rows = 1000, **grid)
+    for name in list(grid) + list(lcoe.LCOE_COMPONENTS):
+        assert compact[name].dtype == np.dtype(lcoe.COMPACT_DTYPES[name]), name
+        assert np.array_equal(compact[name], sweep[name].astype(lcoe.COMPACT_DTYPES[name])), name
+
+## column store:
+
+def test_column_store_reads_back_the_written_chunks(tmp_path):
+    parameters = random_parameters(3000, seed = 12)
+    components = lcoe.LCOE_batch_calculator(**parameters)
+    with lcoe.Column_Writer(str(tmp_path / "sweep")) as writer:
+        for start in range(0, 3000, 1000):
+            writer.append({name: values[start:start + 1000] for name, values in {**parameters, **components}.items()})
+    reader = lcoe.Column_Reader(str(tmp_path / "sweep"))
+    assert len(reader) == 3000 and reader.names() == list(lcoe.PARAMETER_NAMES + lcoe.LCOE_COMPONENTS)
+    for name, values in {**parameters, **components}.items():
+        assert np.array_equal(reader[name], values), name
+
+def test_streaming_percentiles_match_numpy():
+    values = np.random.default_rng(13).lognormal(4, 0.5, 200000)
+    q = (0, 1, 10, 50, 90, 99.9, 100)
+    assert np.array_equal(lcoe.streaming_percentiles(values, q, chunk_size = 30000, bins = 64, collect_limit = 100), np.percentile(values, q))
+
+def test_streaming_percentiles_of_a_near_constant_column():
+    # more values than collect_limit a few ulps apart: the bins can not get narrower than the values
+    values = 70 + np.random.default_rng(14).integers(0, 5, 100000) * np.spacing(70.0)
+    assert np.array_equal(lcoe.streaming_percentiles(values, (10, 50, 90), chunk_size = 30000, collect_limit = 1000), np.percentile(values, (10, 50, 90)))
+    with pytest.raises(ValueError):
+        lcoe.streaming_percentiles(np.array([1.0, np.nan, 2.0]))
+
+## regional data:
+
+# values of the if/elif tree of Reactor_Region_LCOE.assign_region() before the data store
+OLD_REGION_VALUES = {("Net Zero by 2050", "United States", "2021"): (0.08, 5000, 0.9, 30, 100), ("Net Zero by 2050", "European Union", "2030"): (0.08, 5100, 0.8, 35, 115),
+                     ("Announced Pledges", "China", "2050"): (0.07, 2500, 0.8, 25, 60), ("Announced Pledges", "India", "2030"): (0.07, 2800, 0.85, 30, 65),
+                     ("Stated Policies", "United States", "2021"): (0.08, 5000, 0.9, 30, 105)}
+
+def test_region_store_matches_the_old_assignments():
+    store = lcoe.region_LCOE_store()
+    assert len(store) == 36
+    for key, values in OLD_REGION_VALUES.items():
+        assert tuple(store.get(*key)) == values, key
+        reactor = lcoe.Reactor_Region_LCOE(*key)
+        assert tuple(parameter.value for parameter in (reactor.discount_rate, reactor.overnight_costs, reactor.capacity_factor, reactor.Fuel_O_M, reactor.LCOE)) == values, key
+    with pytest.raises(ValueError):
+        store.get("Net Zero by 2050", "Antarctica", "2030")
+
+def test_cube_queries_match_the_store():
+    store = lcoe.region_LCOE_store()
+    assert len(lcoe.region_LCOE_cube("Multi-Scenario", "Multi-Region", "Multi-Year")) == len(store)
+    cube = lcoe.region_LCOE_cube(region = "China", year = ["2030", "2050"])
+    assert sorted(zip(cube["scenario"].tolist(), cube["year"].tolist())) == sorted((scenario, year) for scenario in store.scenarios for year in ("2030", "2050"))
+    for row in cube.rows():
+        assert row["LCOE"] == store.get(row["scenario"], row["region"], row["year"]).LCOE
+    pivot = lcoe.region_LCOE_cube(year = "2030").pivot(index = "region", columns = "scenario", values = "LCOE")
+    for i, region in enumerate(pivot["region"].tolist()):
+        for scenario in store.scenarios:
+            assert pivot[scenario][i] == store.get(scenario, region, "2030").LCOE
+    groups = lcoe.region_LCOE_cube(region = "European Union").group_by("region", "LCOE")
+    values = [store.get(scenario, "European Union", year).LCOE for scenario in store.scenarios for year in store.years]
+    assert (groups["LCOE_min"][0], groups["LCOE_max"][0]) == (min(values), max(values)) and groups["LCOE_mean"][0] == pytest.approx(np.mean(values))
+
+## reactor designs:
+
+# (capacity, overnight costs, fuel cycle costs, O&M costs) of the if/elif tree of Reactor_Design.assign_design() before the registry
+OLD_DESIGN_VALUES = {"EPR (France)": (1650, 4013, 70, 96), "ABWR (Japan)": (1152, 3963, 103, 173), "APR1400 (Korea)": (1400, 2157, 70, 124), "AP1000 (United States)": (1100, 4250, 70, 77),
+                     "VVER (Russia)": (1112, 2271, 37, 68), "CAP1000 (China)": (950, 2500, 75, 177), "PHWR (India)": (950, 2778, 70, 160)}
+
+def test_design_registry_matches_the_old_assignments():
+    assert lcoe.design_registry().names() == list(OLD_DESIGN_VALUES)
+    for name, (capacity, overnight_costs, fuel_cycle_costs, O_M_costs) in OLD_DESIGN_VALUES.items():
+        values = lcoe.Reactor_Design(name).parameter_values()
+        assert (values["capacity"], values["utilization_hours"], values["overnight_costs"], values["fuel_cycle_costs"]) == (capacity, round(0.85*365*24), overnight_costs, fuel_cycle_costs), name
+        assert (values["FOM_costs"], values["VOM_costs"]) == (round(O_M_costs/10*9), round(O_M_costs/10)), name
+
+def test_compare_designs_ranks_the_scalar_LCOE():
+    table = lcoe.compare_designs(discount_rates = [0.03, 0.07], capacity_factors = [0.8, 0.9])
+    assert len(table) == len(OLD_DESIGN_VALUES) * 4
+    assert table["rank"].tolist() == list(range(1, len(table) + 1)) and (np.diff(table["LCOE"]) >= 0).all()
+    for row in table.rows():
+        reactor = lcoe.Reactor_Design(row["design"]).set_parameter("discount_rate", row["discount_rate"]).set_parameter("utilization_hours", row["utilization_hours"])
+        assert row["LCOE"] == reactor.LCOE_calculator(quiet = True).LCOE, row
+
+## package import:
+
+def test_import_is_lazy():
+    command = ("import sys; import lcoe; loaded = sorted(name for name in sys.modules if name == 'numpy' or name.startswith('lcoe.')); "
+               "lcoe.Reactor().LCOE_calculator(quiet = True); print(loaded, 'numpy' in sys.modules, sorted(name for name in sys.modules if name.startswith('lcoe.')))")
+    output = subprocess.run([sys.executable, "-c", command], check = True, capture_output = True, text = True, cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    assert output.strip() == "[] False ['lcoe.core']"
+
+def test_every_export_resolves():
+    assert set(lcoe.__all__) <= set(dir(lcoe))
+    for name, module in lcoe.MODULE_OF.items():
+        assert getattr(lcoe, name) is getattr(sys.modules[f"lcoe.{module}"], name), name
+    with pytest.raises(AttributeError):
+        lcoe.not_a_name
+
+## benchmark:
+
+def test_benchmark_cases_run_and_regressions_are_found():
+    import benchmark
+    cases = benchmark.benchmark_cases(lcoe, scale = 0.001)
+    with open(benchmark.BASELINE_FILE) as file:
+        baseline = json.load(file)
+    assert set(cases) == set(baseline["cases"])
+    results = {"import_seconds": baseline["import_seconds"], "cases": {name: benchmark.measure(function, repeats = 1) for name, function in cases.items()}}
+    assert all(result["rows"] > 0 and result["seconds"] > 0 for result in results["cases"].values())
+    slower = {"import_seconds": baseline["import_seconds"], "cases": {name: dict(result, rows_per_second = result["rows_per_second"] * 0.6) for name, result in baseline["cases"].items()}}
+    assert benchmark.regressions(baseline, baseline, 0.3) == [] and benchmark.regressions(slower, baseline, 0.5) == []
+    assert len(benchmark.regressions(slower, baseline, 0.3)) == len(baseline["cases"])
+
+## portfolio optimization:
+
+def test_portfolio_stays_within_the_budget():
+    targets = {"United States": 5000, "China": 8000}
+    free = lcoe.optimize_portfolio(targets)
+    cheapest = lcoe.optimize_portfolio(targets, objective = "capital")
+    budget = (free.capital + cheapest.capital) / 2
+    result = lcoe.optimize_portfolio(targets, budget = budget)
+    assert cheapest.capital <= result.capital <= budget < free.capital and free.LCOE <= result.LCOE < cheapest.LCOE
+    for region, capacity in zip(result.by_region()["region"].tolist(), result.by_region()["capacity"].tolist()):
+        assert targets[region] <= capacity, region
+    with pytest.raises(ValueError):
+        lcoe.optimize_portfolio(targets, budget = cheapest.capital * 0.99)
+
+def test_portfolio_matches_the_enumeration():
+    designs = ["EPR (France)", "APR1400 (Korea)", "VVER (Russia)"]
+    table = lcoe.portfolio_cost_table(designs = designs, regions = ["United States"])
+    units = np.stack(np.meshgrid(*[np.arange(7)] * 3, indexing = "ij"), axis = -1).reshape(-1, 3)
+    totals = lcoe.evaluate_portfolios(units, table)
+    possible = (totals["capacity"] >= 5000) & (totals["capacity"] <= 6000)
+    for objective, budget in (("LCOE", None), ("capital", None), ("LCOE", 14000)):
+        result = lcoe.optimize_portfolio({"United States": 5000}, objective = objective, budget = budget, limits = {"United States": 6000}, cost_table = table)
+        within = possible & (totals["capital"] <= (budget or np.inf))
+        best = totals[objective][within].min()
+        assert result.capacity <= 6000 and result.capital <= (budget or np.inf)
+        if(result.status == "optimal"):
+            assert getattr(result, objective) == pytest.approx(best, rel = 1e-12), objective
+        else:
+            assert getattr(result, objective) >= best
+
+## streaming aggregation:
+
+def test_merged_summaries_agree_with_numpy():
+    values = np.random.default_rng(21).lognormal(4, 0.4, 200000)
+    # the stream is split in 4 parts (e.g. 4 processes), every part is consumed in chunks and the summaries are merged
+    parts = [(lcoe.Quantile_Sketch(seed = seed), lcoe.Histogram(20, 150, bins = 40), lcoe.Running_Moments()) for seed in range(4)]
+    for summaries, part in zip(parts, np.array_split(values, 4)):
+        for chunk in np.array_split(part, 7):
+            for summary in summaries:
+                summary.update(chunk)
+    for summaries in parts[1:]:
+        for merged, summary in zip(parts[0], summaries):
+            merged.merge(summary)
+    sketch, histogram, moment = parts[0]
+    q = np.array([1, 10, 25, 50, 75, 90, 99])
+    # rank error of the sketch: about 1.7 / size of the values
+    ranks = np.searchsorted(np.sort(values), sketch.percentiles(q)) / len(values) * 100
+    assert len(sketch) == len(values) and np.abs(ranks - q).max() < 0.5
+    counts, edges = np.histogram(values, bins = 40, range = (20, 150))
+    assert np.array_equal(histogram.counts, counts) and np.allclose(histogram.edges, edges)
+    assert (histogram.underflow, histogram.overflow) == (int(np.sum(values < 20)), int(np.sum(values > 150)))
+    assert len(moment) == len(values) and moment.mean == pytest.approx(values.mean(), rel = 1e-12) and moment.variance == pytest.approx(values.var(ddof = 1), rel = 1e-10)
+    assert (moment.min, moment.max) == (values.min(), values.max())
+    # until the first compaction the percentiles are exact
+    small = lcoe.Quantile_Sketch().update(values[:300]).merge(lcoe.Quantile_Sketch().update(values[300:600]))
+    assert np.array_equal(small.percentiles(q), np.percentile(values[:600], q))
+
+## result cache:
+
+def test_cache_ignores_entries_of_other_parameters():
+    parameters = random_parameters(2000, seed = 7)
+    reference = lcoe.LCOE_batch_calculator(**parameters)
+    with lcoe.Result_Cache(":memory:", max_entries = 1500) as cache:
+        cache.LCOE(parameters)
+        assert len(cache) == 1500
+        # same keys with other parameters, like a collision of the hash
+        cache.connection.execute("UPDATE results SET parameters = zeroblob(80), LCOE = -1")
+        result = cache.LCOE(parameters)
+        assert len(cache) == 1500 == cache.connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    for component in lcoe.LCOE_COMPONENTS:
+        assert np.array_equal(result[component], reference[component]), component
+
+## instrumentation:
+
+def test_instrumentation_leaves_no_wrapper_after_disable():
+    parameters = random_parameters(100, seed = 8)
+    lcoe.__dict__.pop("LCOE_batch_calculator", None)
+    metrics = lcoe.enable_instrumentation()
+    try:
+        timed = lcoe.LCOE_batch_calculator(**parameters) # first use: the package caches the wrapper
+    finally:
+        lcoe.disable_instrumentation()
+    assert metrics.snapshot()["stages"]["LCOE_batch_calculator"]["rows"] == 100
+    assert lcoe.LCOE_batch_calculator is lcoe.batch.LCOE_batch_calculator
+    assert np.array_equal(lcoe.LCOE_batch_calculator(**parameters)["LCOE"], timed["LCOE"])
+
+## batch command line:
+
+# @return output rows of batch_main() for the input file @input name with @input content
+def run_batch(tmp_path, name, content, output_format):
+    (tmp_path / name).write_text(content)
+    output = tmp_path / f"output.{output_format}"
+    assert lcoe.batch_main([str(tmp_path / name), "-o", str(output), "--output-format", output_format, "--chunk-size", "3"]) == 0
+    with open(output, newline = "") as file:
+        return list(lcoe.read_records(file, output_format))
+
+# @return LCOE of compute_LCOE() with the Reactor() defaults and the parameters @input changes
+def default_LCOE(**changes):
+    return lcoe.compute_LCOE(**dict(lcoe.Reactor().parameter_values(), **changes)).LCOE
+
+def test_batch_writes_an_error_row_for_every_bad_record(tmp_path):
+    lines = ['{"lifetime": 60}', '{"lifetime": ', '{"lifetime": [1, 2]}', '[1, 2]', '{"lifetime": 0}', '{"overnight_costs": -1}',
+             '{"utilization_hours": "x"}', '{"design": ["a"]}', '{"construction_time": 7, "VOM_costs": 13.3}']
+    rows = run_batch(tmp_path, "input.jsonl", "\n".join(lines) + "\n", "jsonl")
+    assert len(rows) == len(lines)
+    assert [bool(row["error"]) for row in rows] == [False] + [True] * 7 + [False]
+    assert all(row["LCOE"] is None for row in rows[1:-1])
+    assert rows[0]["LCOE"] == default_LCOE(lifetime = 60)
+    assert rows[-1]["LCOE"] == default_LCOE(construction_time = 7, VOM_costs = 13.3)
+
+def test_batch_csv_output_keeps_the_columns_of_every_record(tmp_path):
+    lines = ['{"lifetime": 60, "name": "a"}', '{"name": "b", "VOM_costs": 13.3}', '{"VOM_costs": 5}', '{"construction_time": 7}']
+    rows = run_batch(tmp_path, "input.jsonl", "\n".join(lines) + "\n", "csv")
+    assert list(rows[0]) == ["lifetime", "name", "VOM_costs"] + list(lcoe.BATCH_OUTPUT_COLUMNS)
+    assert [(row["lifetime"], row["name"], row["VOM_costs"]) for row in rows] == [("60", "a", ""), ("", "b", "13.3"), ("", "", "5"), ("", "", "")]
+    assert float(rows[1]["LCOE"]) == default_LCOE(VOM_costs = 13.3)
+
+def test_batch_rejects_a_chunk_size_below_1(tmp_path, capsys):
+    (tmp_path / "input.jsonl").write_text('{"lifetime": 60}\n')
+    with pytest.raises(SystemExit) as exit:
+        lcoe.batch_main([str(tmp_path / "input.jsonl"), "-o", str(tmp_path / "output.jsonl"), "--chunk-size", "0"])
+    assert exit.value.code == 2 and "--chunk-size" in capsys.readouterr().err
+
+## HTTP service:
+
+# run the coroutine function @input client(service, port) against a LCOE_Service started on a free port
+def run_service(client):
+    async def main():
+        service = lcoe.LCOE_Service(port = 0, batch_interval = 0.001)
+        await service.start()
+        try:
+            return await client(service, service.port)
+        finally:
+            await service.stop()
+    return asyncio.run(main())
+
+# @return list of (status, json body) of the @input requests (method, path, body) sent on one connection
+def send(port, requests):
+    client = lcoe.LCOE_Client(port = port)
+    try:
+        return [client.request(*request) for request in requests]
+    finally:
+        client.close()
+
+def test_service_refuses_bad_records_and_keeps_the_connection():
+    async def client(service, port):
+        return await asyncio.to_thread(send, port, [("POST", "/lcoe", {"lifetime": [1, 2]}), ("POST", "/lcoe", [{"lifetime": 60}, {"utilization_hours": "x"}]),
+                                                    ("POST", "/lcoe", [{"lifetime": 60}, {"lifetime": 0}]), ("GET", "/health")])
+    (bad, _), (other, _), (status, rows), (health, _) = run_service(client)
+    assert (bad, other, status, health) == (400, 400, 200, 200)
+    assert rows[0]["LCOE"] == default_LCOE(lifetime = 60) and rows[0]["error"] == ""
+    assert rows[1]["LCOE"] is None and "lifetime" in rows[1]["error"]
+
+def test_service_failures_stay_in_their_row(monkeypatch):
+    evaluate_records = lcoe.service.evaluate_records
+    def failing_evaluate_records(records, cache = None):
+        if(any(record.get("name") == "fail" for record in records)):
+            raise RuntimeError("boom")
+        return evaluate_records(records, cache)
+    monkeypatch.setattr(lcoe.service, "evaluate_records", failing_evaluate_records)
+    async def client(service, port):
+        return await asyncio.gather(asyncio.to_thread(send, port, [("POST", "/lcoe", {"name": "fail"})]),
+                                    asyncio.to_thread(send, port, [("POST", "/lcoe", {"lifetime": 60})]))
+    [(failed, failed_row)], [(status, row)] = run_service(client)
+    assert failed == status == 200
+    assert "boom" in failed_row["error"] and row["LCOE"] == default_LCOE(lifetime = 60)
+
+def test_service_answers_unexpected_errors_with_500(monkeypatch):
+    async def route(self, method, path, body):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(lcoe.LCOE_Service, "route", route)
+    async def client(service, port):
+        return await asyncio.to_thread(send, port, [("GET", "/health")])
+    [(status, body)] = run_service(client)
+    assert status == 500 and "boom" in body["error"]